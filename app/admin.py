@@ -1,5 +1,20 @@
 from django.contrib import admin
 from .models import Team, Player
+from .versions import next_version
 # Register your models here.
-admin.site.register(Team)
-admin.site.register(Player)
+
+
+class VersionedAdmin(admin.ModelAdmin):
+    """
+    Admin that stamps a new change version on every saved object, so
+    edits made in the admin site show up in /api/changes.
+    """
+
+    def save_model(self, request, obj, form, change):
+        # Admin saves run inside a transaction, as next_version() requires
+        obj.version = next_version()
+        super().save_model(request, obj, form, change)
+
+
+admin.site.register(Team, VersionedAdmin)
+admin.site.register(Player, VersionedAdmin)
@@ -0,0 +1,153 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import Team, Player
+from .payroll import payroll_contribution, payroll_deltas, apply_payroll_deltas
+from .cache import invalidate_teams
+from .versions import next_version
+from .events import publish_on_commit
+
+# Operation modes accepted by apply_operations()
+ATOMIC = 'atomic'
+BEST_EFFORT = 'best_effort'
+
+
+def check_operations(operations, players, team_ids, taken_names):
+    """
+    Check every validated operation against the loaded rows.
+
+    Works purely on already loaded data, so it issues no queries.
+
+    Args:
+        operations: List of validated operation dicts, or None for items
+            that already failed validation
+        players: dict of player id to locked Player
+        team_ids: Set of existing team ids
+        taken_names: Set of player names already in use
+
+    Returns:
+        List with an error message, or None, for every operation
+    """
+    errors = []
+    seen_players = set()
+    new_names = set()
+    for operation in operations:
+        if operation is None:
+            errors.append(None)
+            continue
+
+        error = None
+        if operation['op'] in ('cut', 'sign'):
+            player_id = operation['player']
+            if player_id not in players:
+                error = f"Player {player_id} does not exist."
+            elif player_id in seen_players:
+                error = f"Player {player_id} appears in more than one operation."
+            seen_players.add(player_id)
+        if error is None and operation['op'] in ('sign', 'create') \
+                and operation['team'] not in team_ids:
+            error = f"Team {operation['team']} does not exist."
+        if error is None and operation['op'] == 'create':
+            name = operation['name']
+            if name in taken_names or name in new_names:
+                error = f"A player named {name} already exists."
+            new_names.add(name)
+        errors.append(error)
+    return errors
+
+
+def apply_operations(operations, mode=ATOMIC):
+    """
+    Apply a batch of cut, sign and create operations in one transaction.
+
+    All rows are loaded with three queries (locked players, teams, taken
+    names), every operation is checked in memory, then a change version
+    is reserved and the changes are written with one bulk_update, one
+    bulk_create and a single payroll update covering every affected team.
+
+    In atomic mode any failing operation cancels the whole batch. In
+    best-effort mode failing operations are reported and the others are
+    applied.
+
+    Args:
+        operations: List of validated operation dicts (see
+            BulkOperationSerializer), with None for items that failed
+            validation and are only reported
+        mode: ATOMIC or BEST_EFFORT
+
+    Returns:
+        (applied, results) where applied tells whether anything was
+        written and results holds, in request order, the error message
+        or the resulting Player for every operation
+    """
+    player_ids = [operation['player'] for operation in operations
+                  if operation and operation['op'] in ('cut', 'sign')]
+
+    with transaction.atomic():
+        players = Player.objects.select_for_update().in_bulk(player_ids)
+        team_ids = set(Team.objects.filter(id__in={
+            operation['team'] for operation in operations
+            if operation and operation['op'] in ('sign', 'create')
+        }).values_list('id', flat=True))
+        taken_names = set(Player.objects.filter(name__in=[
+            operation['name'] for operation in operations
+            if operation and operation['op'] == 'create'
+        ]).values_list('name', flat=True))
+
+        errors = check_operations(operations, players, team_ids, taken_names)
+        if mode == ATOMIC and any(
+                error or operation is None
+                for operation, error in zip(operations, errors)):
+            return False, errors
+
+        # Every player and team written by the batch shares one version
+        version = next_version()
+        results = []
+        updated = []
+        created = []
+        deltas = defaultdict(int)
+        touched_teams = set()
+        for operation, error in zip(operations, errors):
+            if operation is None or error:
+                results.append(error)
+                continue
+
+            if operation['op'] == 'create':
+                player = Player(name=operation['name'],
+                                team_id=operation['team'],
+                                salary=operation['salary'], free_agent=False,
+                                version=version)
+                created.append(player)
+            else:
+                player = players[operation['player']]
+                before = payroll_contribution(player)
+                touched_teams.add(player.team_id)
+                if operation['op'] == 'cut':
+                    player.free_agent = True
+                else:
+                    player.team_id = operation['team']
+                    player.salary = operation['salary']
+                    player.free_agent = False
+                player.version = version
+                payroll_deltas(before, None, deltas)
+                updated.append(player)
+            payroll_deltas(None, payroll_contribution(player), deltas)
+            touched_teams.add(player.team_id)
+            results.append(player)
+
+        if updated:
+            Player.objects.bulk_update(
+                updated, ['team', 'salary', 'free_agent', 'version'])
+        if created:
+            Player.objects.bulk_create(created)
+        apply_payroll_deltas(deltas, version)
+
+        # Rosters can change without moving a payroll, e.g. cutting a
+        # player on a minimum contract who is re-signed in the same batch
+        if touched_teams:
+            invalidate_teams(touched_teams)
+        if updated or created:
+            publish_on_commit('bulk', version, updated + created, deltas)
+
+    return bool(updated or created), results
@@ -0,0 +1,276 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Team
+
+# Every key written by this module starts with this prefix
+KEY_PREFIX = 'roster'
+
+# Sentinel distinguishing a cache miss from a cached falsy value
+_MISSING = object()
+
+# Process-wide hit and miss counters, exposed at /api/cache/stats
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_cache():
+    """
+    Return the cache backend used for roster payloads.
+
+    The alias is configurable with settings.ROSTER_CACHE_ALIAS so a shared
+    backend such as Redis or Memcached can replace the default locmem one.
+    """
+    return caches[getattr(settings, 'ROSTER_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    """
+    Seconds a cached payload may live even without an invalidation.
+    """
+    return getattr(settings, 'ROSTER_CACHE_TIMEOUT', 300)
+
+
+def _generation(cache):
+    """
+    Current cache generation, bumped by invalidate_all().
+
+    Generations are nanosecond timestamps, so a missing (e.g. evicted)
+    generation restarting from the current time never collides with keys
+    written under an earlier one.
+    """
+    key = f'{KEY_PREFIX}:generation'
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    if generation is None:
+        # Backends that store nothing (DummyCache): every call is new
+        generation = time.time_ns()
+    return generation
+
+
+def _next_stamp(previous):
+    """
+    A nanosecond timestamp strictly greater than `previous`.
+    """
+    return max(time.time_ns(), (previous or 0) + 1)
+
+
+def _key(cache, *parts):
+    """
+    Build a cache key inside the current generation.
+    """
+    return ':'.join([KEY_PREFIX, str(_generation(cache))]
+                    + [str(part) for part in parts])
+
+
+def _record(outcome):
+    """
+    Increment the hit or miss counter.
+    """
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def get_or_build(parts, build):
+    """
+    Read-through lookup of a cached payload.
+
+    Args:
+        parts: Tuple identifying the payload, e.g. ('team', 3, 'api')
+        build: Callable producing the payload on a miss
+
+    Returns:
+        The cached or freshly built payload
+    """
+    cache = get_cache()
+    key = _key(cache, *parts)
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _record('hits')
+        return value
+
+    _record('misses')
+    value = build()
+    cache.set(key, value, get_timeout())
+    return value
+
+
+def resolve_team(code):
+    """
+    Find a team's primary key from its code, using the cache when possible.
+
+    Args:
+        code: Team code from the URL
+
+    Returns:
+        (team_id, team) where team is the loaded Team instance, or None
+        when the id came from the cache and nothing was queried
+
+    Raises:
+        Team.DoesNotExist: If no team has this code
+    """
+    cache = get_cache()
+    key = _key(cache, 'code', code)
+    team_id = cache.get(key)
+    if team_id is not None:
+        return team_id, None
+
+    team = Team.objects.get(code=code)
+    cache.set(key, team.id, get_timeout())
+    return team.id, team
+
+
+def _delete_team_keys(team_ids):
+    """
+    Delete the list keys and the per-team keys of the given teams.
+    """
+    cache = get_cache()
+    keys = [_key(cache, kind, fmt)
+            for kind in ('teams', 'free-agents') for fmt in ('api', 'html')]
+    keys += [_key(cache, 'team', team_id, fmt)
+             for team_id in team_ids for fmt in ('api', 'html')]
+    cache.delete_many(keys)
+
+    # Move the validators used for conditional GETs forward as well
+    _bump_versions(
+        ['teams', 'free-agents'] + [f'team:{team_id}' for team_id in team_ids])
+
+
+def invalidate_teams(team_ids):
+    """
+    Drop the cached payloads affected by a roster change.
+
+    That is exactly the roster of each given team, plus the team list
+    (payrolls change) and the free agent list. Keys are deleted right away
+    and again once the surrounding transaction commits, so a concurrent
+    reader cannot re-cache data from before the commit.
+
+    Args:
+        team_ids: Iterable of team primary keys
+    """
+    team_ids = set(team_ids)
+    _delete_team_keys(team_ids)
+    transaction.on_commit(lambda: _delete_team_keys(team_ids))
+
+
+def invalidate_all():
+    """
+    Invalidate every roster payload by moving to a new cache generation.
+
+    Used after bulk imports and team edits, where listing the affected
+    keys is not worth it.
+    """
+    cache = get_cache()
+    key = f'{KEY_PREFIX}:generation'
+
+    def bump():
+        cache.set(key, _next_stamp(cache.get(key)), timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def _version_key(scope):
+    """
+    Cache key of the version stamp of a scope such as 'teams' or 'team:3'.
+    """
+    return f'{KEY_PREFIX}:version:{scope}'
+
+
+def _bump_versions(scopes):
+    """
+    Move the version stamps of the given scopes to the current time.
+    """
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    current = cache.get_many(keys)
+    cache.set_many({key: _next_stamp(current.get(key)) for key in keys},
+                   timeout=None)
+
+
+def get_versions(scopes):
+    """
+    Read the version stamps used as conditional GET validators.
+
+    Stamps are nanosecond timestamps that change whenever the cached
+    payloads of a scope are invalidated. The current generation is
+    included under the 'generation' key since invalidate_all() changes
+    every scope at once.
+
+    Stamps live in the roster cache without a timeout, so with several
+    server processes that cache must be shared (see settings.CACHES):
+    a process-local stamp would never move for writes made elsewhere.
+
+    Args:
+        scopes: List of scopes, e.g. ['free-agents', 'team:3']
+
+    Returns:
+        dict of scope to stamp, plus 'generation'
+    """
+    cache = get_cache()
+    keys = {_version_key(scope): scope for scope in scopes}
+    stamps = cache.get_many(list(keys))
+    for key in keys:
+        if key not in stamps:
+            # Unknown or evicted: start now, which is never earlier than
+            # any response built from the old stamp
+            cache.add(key, time.time_ns(), timeout=None)
+            stamps[key] = cache.get(key) or time.time_ns()
+
+    versions = {keys[key]: stamp for key, stamp in stamps.items()}
+    versions['generation'] = _generation(cache)
+    return versions
+
+
+def fragment_context(teams):
+    """
+    Template context for the {% cache %} fragments of team pages.
+
+    Every team gets a `fragment_version` attribute combining the cache
+    generation with the team's version stamp, so a fragment keyed on it
+    is re-rendered exactly when that team's roster or payroll changes.
+    The version stamps of all teams are read with a single get_many().
+
+    Args:
+        teams: Team instances rendered by the template
+
+    Returns:
+        dict with fragment_cache (cache alias) and fragment_timeout
+    """
+    versions = get_versions([f'team:{team.id}' for team in teams])
+    for team in teams:
+        team.fragment_version = (
+            f"{versions['generation']}.{versions[f'team:{team.id}']}")
+    return {
+        'fragment_cache': getattr(settings, 'ROSTER_CACHE_ALIAS', 'default'),
+        'fragment_timeout': getattr(settings, 'ROSTER_FRAGMENT_TIMEOUT', 3600),
+    }
+
+
+def cache_stats():
+    """
+    Snapshot of the hit and miss counters.
+
+    Returns:
+        dict with hits, misses and hit_rate
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / total if total else 0.0
+    return stats
+
+
+def reset_cache_stats():
+    """
+    Reset the hit and miss counters to zero.
+    """
+    with _stats_lock:
+        _stats['hits'] = 0
+        _stats['misses'] = 0
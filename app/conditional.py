@@ -0,0 +1,70 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .cache import get_versions
+
+
+def compute_etag(request, scopes):
+    """
+    Build an ETag from cached version stamps.
+
+    Nothing is read from the database and no payload is serialized: the
+    ETag hashes the version stamps of the scopes together with the full
+    path (query parameters change the body) and the Accept header (the
+    renderer changes the body).
+
+    No Last-Modified is derived from the stamps: HTTP dates only have
+    whole seconds, so a write in the same second as a response would
+    leave it unchanged and If-Modified-Since would answer 304 with stale
+    data. The nanosecond stamps go into the ETag instead.
+
+    Args:
+        request: Incoming HTTP request
+        scopes: List of cache scopes the response depends on
+
+    Returns:
+        Quoted ETag string
+    """
+    versions = get_versions(scopes)
+    fingerprint = ':'.join(
+        [request.get_full_path(), request.META.get('HTTP_ACCEPT', '')]
+        + [f'{scope}={versions[scope]}' for scope in sorted(versions)])
+    return quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag handling to a read-only API view.
+
+    Views implement get_version_scopes() to name the cache scopes their
+    response depends on ('teams', 'free-agents', 'team:<id>'). A GET whose
+    If-None-Match still matches is answered with 304 Not Modified before
+    the view runs, so no payload is built.
+    """
+
+    def get_version_scopes(self, request, *args, **kwargs):
+        """
+        Return the list of cache scopes for this request, or None to skip
+        conditional handling.
+        """
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        etag = None
+        if request.method in ('GET', 'HEAD'):
+            scopes = self.get_version_scopes(request, *args, **kwargs)
+            if scopes:
+                etag = compute_etag(request, scopes)
+                not_modified = get_conditional_response(request, etag=etag)
+                if not_modified is not None:
+                    not_modified.headers['ETag'] = etag
+                    return not_modified
+
+        response = super().dispatch(request, *args, **kwargs)
+
+        # Only successful responses carry the ETag
+        if etag and 200 <= response.status_code < 300:
+            response.headers['ETag'] = etag
+        return response
@@ -0,0 +1,204 @@
+import asyncio
+import collections
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+from .fast import PLAYER_FIELDS
+
+
+class Event:
+    """
+    One roster or payroll change, encoded once for every subscriber.
+
+    The event id is the change version of the write (see app.versions),
+    so a client that reconnects with Last-Event-ID resumes exactly where
+    it stopped. `sequence` is the position of the event in publish order,
+    set by EventBroker.publish().
+    """
+    __slots__ = ('id', 'type', 'data', 'encoded', 'sequence')
+
+    def __init__(self, event_id, event_type, data):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+        self.sequence = 0
+        self.encoded = (f"id: {event_id}\nevent: {event_type}\n"
+                        f"data: {json.dumps(data)}\n\n").encode()
+
+
+class Subscriber:
+    """
+    A connected stream: a bounded queue filled by EventBroker.publish().
+
+    A None item means the subscriber fell too far behind and has to
+    reconnect (and replay from its last event id).
+    """
+
+    def __init__(self, loop, queue_size):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, event):
+        """
+        Queue an event; runs on the subscriber's event loop.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog and ask the stream to close
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe fan-out of change events.
+
+    Writers publish from any thread; every event is encoded once and
+    handed to each subscriber's queue on its event loop, so any number of
+    streaming clients share the single producer. The last `buffer_size`
+    events are kept in a ring buffer for Last-Event-ID replay.
+
+    Writes commit in version order, but their on-commit callbacks run on
+    their own threads, so events can be published out of version order
+    (6 before 5). Subscribers therefore receive events in publish order,
+    and a reconnecting client is replayed everything published after the
+    event it last received, not only the higher ids.
+
+    Events only reach clients connected to the same process. Run a single
+    ASGI process for the stream, or put a shared broker (e.g. Redis
+    pub/sub) behind publish() when scaling out.
+    """
+
+    def __init__(self, buffer_size=None, queue_size=None):
+        self.buffer = collections.deque(
+            maxlen=buffer_size or settings.EVENT_STREAM_BUFFER)
+        self.queue_size = queue_size or settings.EVENT_STREAM_QUEUE_SIZE
+        self.subscribers = set()
+        # Largest event id pushed out of the ring buffer
+        self.evicted_id = 0
+        # Number of events published so far
+        self.sequence = 0
+        self.lock = threading.Lock()
+
+    def publish(self, event_id, event_type, data):
+        """
+        Record an event and fan it out to every subscriber.
+
+        Args:
+            event_id: Change version of the write
+            event_type: Event name, e.g. 'cut'
+            data: JSON-serializable payload
+
+        Returns:
+            The published Event
+        """
+        event = Event(event_id, event_type, data)
+        closed = []
+        with self.lock:
+            self.sequence += 1
+            event.sequence = self.sequence
+            if len(self.buffer) == self.buffer.maxlen:
+                self.evicted_id = max(self.evicted_id, self.buffer[0].id)
+            self.buffer.append(event)
+
+            # Scheduled under the lock so every queue gets events in the
+            # order of the buffer
+            for subscriber in self.subscribers:
+                try:
+                    subscriber.loop.call_soon_threadsafe(
+                        subscriber.deliver, event)
+                except RuntimeError:
+                    # The subscriber's loop has shut down
+                    closed.append(subscriber)
+            self.subscribers.difference_update(closed)
+        return event
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a subscriber on the running event loop.
+
+        The subscriber is registered before the ring buffer is read, so no
+        event can fall between the replay and the live stream.
+
+        Args:
+            last_event_id: Id of the last event the client received, if any
+
+        Returns:
+            (subscriber, replay) where replay is the list of buffered
+            events the client has not seen, in publish order: those with
+            a higher id and those published after the event with
+            last_event_id, which can have a lower id. replay is None when
+            some of them were already evicted and the client has to
+            resync from /api/changes?since=<last_event_id>
+        """
+        subscriber = Subscriber(asyncio.get_running_loop(), self.queue_size)
+        with self.lock:
+            self.subscribers.add(subscriber)
+            if last_event_id is None:
+                return subscriber, []
+            if last_event_id < self.evicted_id:
+                return subscriber, None
+            seen = next((event.sequence for event in self.buffer
+                         if event.id == last_event_id), self.sequence)
+            return subscriber, [event for event in self.buffer
+                                if event.id > last_event_id
+                                or event.sequence > seen]
+
+    def unsubscribe(self, subscriber):
+        """
+        Remove a subscriber; safe to call more than once.
+        """
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+
+_broker = None
+
+
+def get_broker():
+    """
+    Return the process-wide EventBroker, created on first use.
+    """
+    global _broker
+    if _broker is None:
+        _broker = EventBroker()
+    return _broker
+
+
+def player_data(player):
+    """
+    Shape a Player instance like PlayerSerializer output, plus its version.
+    """
+    row = {field: player.team_id if field == 'team' else getattr(player, field)
+           for field in PLAYER_FIELDS}
+    row['version'] = player.version
+    return row
+
+
+def publish_on_commit(event_type, version, players=(), deltas=None):
+    """
+    Publish a change event once the current transaction commits.
+
+    The payload is built right away from the written rows, so publishing
+    costs no query; rolled back transactions publish nothing.
+
+    Args:
+        event_type: Event name: 'cut', 'sign', 'create', 'bulk' or 'trade'
+        version: Change version stamped by the write
+        players: Player instances written by the transaction
+        deltas: dict of team id to payroll change
+    """
+    data = {
+        'version': version,
+        'players': [player_data(player) for player in players],
+        'payroll_changes': {str(team_id): delta
+                            for team_id, delta in (deltas or {}).items()
+                            if delta},
+    }
+    transaction.on_commit(
+        lambda: get_broker().publish(version, event_type, data))
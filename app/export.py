@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+
+from .models import Team, Player
+from .fast import TEAM_FIELDS, PLAYER_FIELDS
+from .importer import chunked
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Rows fetched per database round trip and encoded per output chunk
+DEFAULT_CHUNK_SIZE = 2000
+
+# Exported tables
+TABLES = {'teams': Team, 'players': Player}
+
+# CSV columns as (header, queryset field), in the csv/ import layout so
+# an export can be fed back to import_roster. Players carry an extra
+# free_agent column, which the importer ignores.
+CSV_COLUMNS = {
+    'teams': (('Team', 'name'), ('Code', 'code'), ('Payroll', 'payroll')),
+    'players': (('Player', 'name'), ('Team', 'team__code'),
+                ('salary', 'salary'), ('unique-code', 'code'),
+                ('free_agent', 'free_agent')),
+}
+
+# NDJSON and columnar fields: the API output plus the change version, as
+# in /api/changes, so a client can keep an export current from there
+RECORD_FIELDS = {
+    'teams': TEAM_FIELDS + ('version',),
+    'players': PLAYER_FIELDS + ('version',),
+}
+
+
+def chunk_size_setting():
+    """
+    Rows per chunk, from settings.EXPORT_CHUNK_SIZE.
+    """
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def dumps(value):
+    """
+    Encode a value as compact JSON bytes, with orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def table_rows(table, fields, chunk_size):
+    """
+    Stream the rows of a table as tuples, in primary key order.
+
+    The rows come from one SELECT read with a server-side cursor, so
+    memory is bounded by chunk_size and the export is a consistent
+    snapshot of the table.
+
+    Args:
+        table: Key of TABLES
+        fields: Fields passed to values_list()
+        chunk_size: Rows fetched per database round trip
+
+    Returns:
+        Iterator of tuples
+    """
+    return (TABLES[table].objects.order_by('id').values_list(*fields)
+            .iterator(chunk_size=chunk_size))
+
+
+def export_csv(table, chunk_size):
+    """
+    Encode a table as CSV in the csv/ import layout.
+
+    Yields:
+        UTF-8 bytes, the header and then one chunk of rows at a time
+    """
+    headers, fields = zip(*CSV_COLUMNS[table])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(headers)
+    yield buffer.getvalue().encode()
+
+    for chunk in chunked(table_rows(table, fields, chunk_size), chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+
+
+def export_ndjson(table, chunk_size):
+    """
+    Encode a table as newline delimited JSON, one object per row.
+
+    Yields:
+        UTF-8 bytes, one chunk of rows at a time
+    """
+    fields = RECORD_FIELDS[table]
+    for chunk in chunked(table_rows(table, fields, chunk_size), chunk_size):
+        yield b''.join(dumps(dict(zip(fields, row))) + b'\n' for row in chunk)
+
+
+def export_columnar(table, chunk_size):
+    """
+    Encode a table column by column, in row groups like Parquet.
+
+    The first line is {"table": ..., "fields": [...]}; every following
+    line is a row group {"rows": n, "columns": [[...], ...]} holding one
+    array per field, in field order. Field names are written once and
+    each column holds values of one type, which keeps the output about
+    half the size of NDJSON and cheap to load into dataframes.
+
+    Yields:
+        UTF-8 bytes, the header and then one row group at a time
+    """
+    fields = RECORD_FIELDS[table]
+    yield dumps({'table': table, 'fields': fields}) + b'\n'
+    for chunk in chunked(table_rows(table, fields, chunk_size), chunk_size):
+        yield dumps({'rows': len(chunk), 'columns': list(zip(*chunk))}) + b'\n'
+
+
+# Encoders and content types of the export formats
+FORMATS = {
+    'csv': (export_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (export_ndjson, 'application/x-ndjson'),
+    'columnar': (export_columnar, 'application/x-ndjson'),
+}
+
+
+def export(table, export_format, chunk_size=None):
+    """
+    Stream a whole table in one of the export formats.
+
+    Nothing is read until the iterator is consumed, and memory use does
+    not grow with the size of the table.
+
+    Args:
+        table: 'teams' or 'players'
+        export_format: 'csv', 'ndjson' or 'columnar'
+        chunk_size: Rows per chunk (default: settings.EXPORT_CHUNK_SIZE)
+
+    Returns:
+        Iterator of bytes
+
+    Raises:
+        KeyError: If the table or the format is unknown
+    """
+    if table not in TABLES:
+        raise KeyError(table)
+    encoder, _ = FORMATS[export_format]
+    return encoder(table, chunk_size or chunk_size_setting())
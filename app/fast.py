@@ -0,0 +1,100 @@
+from django.conf import settings
+from rest_framework.response import Response
+
+from .serializers import TeamSerializer, PlayerSerializer
+from .metrics import span
+
+# Output fields, kept in sync with the ModelSerializers so both paths
+# produce the same keys in the same order
+TEAM_FIELDS = tuple(TeamSerializer.Meta.fields)
+PLAYER_FIELDS = tuple(PlayerSerializer.Meta.fields)
+
+# Columns fetched for a nested team, prefixed through the team relation
+NESTED_TEAM_FIELDS = tuple(f'team__{field}' for field in TEAM_FIELDS)
+
+
+def fast_serialization_enabled():
+    """
+    Whether list endpoints use the .values() path instead of serializers.
+
+    Controlled by settings.FAST_SERIALIZATION, on by default.
+    """
+    return getattr(settings, 'FAST_SERIALIZATION', True)
+
+
+def team_values(queryset):
+    """
+    Turn a Team queryset into a .values() queryset of the output fields.
+    """
+    return queryset.values(*TEAM_FIELDS)
+
+
+def player_values(queryset, expand=False):
+    """
+    Turn a Player queryset into a .values() queryset of the output fields.
+
+    'team' comes back as the team id, exactly what PlayerSerializer
+    outputs. With expand the team columns are fetched in the same query
+    and nested later by player_rows().
+    """
+    if expand:
+        return queryset.values(*PLAYER_FIELDS, *NESTED_TEAM_FIELDS)
+    return queryset.values(*PLAYER_FIELDS)
+
+
+def player_rows(rows, expand=False):
+    """
+    Shape rows from player_values() like PlayerSerializer or
+    ExpandedPlayerSerializer output.
+
+    Args:
+        rows: Iterable of dicts from player_values()
+        expand: Whether the rows carry nested team columns
+
+    Returns:
+        List of dicts ready to be rendered
+    """
+    if not expand:
+        return list(rows)
+    return [
+        {field: ({name: row[f'team__{name}'] for name in TEAM_FIELDS}
+                 if field == 'team' else row[field])
+         for field in PLAYER_FIELDS}
+        for row in rows
+    ]
+
+
+class FastListMixin:
+    """
+    ListAPIView mixin serving list responses from .values() rows.
+
+    Views implement to_values() to turn their filtered queryset into a
+    .values() queryset and, when the rows need reshaping, to_data(). The
+    rows skip DRF field-by-field serialization but produce the same
+    output. With settings.FAST_SERIALIZATION off the serializer is used.
+    """
+
+    def to_values(self, queryset):
+        """
+        Turn the filtered queryset into a .values() queryset.
+        """
+        raise NotImplementedError
+
+    def to_data(self, rows):
+        """
+        Shape the fetched rows for rendering.
+        """
+        return list(rows)
+
+    def list(self, request, *args, **kwargs):
+        if not fast_serialization_enabled():
+            with span('serialize'):
+                return super().list(request, *args, **kwargs)
+
+        queryset = self.to_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        with span('serialize'):
+            data = self.to_data(queryset if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -0,0 +1,105 @@
+import sys
+
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from .pagination import PLAYER_ORDERINGS, ordering_fields
+
+# Upper bounds that keep filter values from producing pathological queries
+MAX_NAME_PREFIX_LENGTH = 64
+MAX_TEAM_CODES = 30
+
+
+class PlayerFilterSerializer(serializers.Serializer):
+    """
+    Validates the query parameters accepted by the player list endpoints.
+
+    - min_salary / max_salary: inclusive salary band
+    - name: case-sensitive name prefix
+    - team: comma separated team codes, e.g. GSW,LAL
+    - ordering: salary, name or id, prefixed with '-' for descending
+    """
+    min_salary = serializers.IntegerField(min_value=0, required=False)
+    max_salary = serializers.IntegerField(min_value=0, required=False)
+    name = serializers.CharField(
+        min_length=1, max_length=MAX_NAME_PREFIX_LENGTH, required=False)
+    team = serializers.CharField(required=False)
+    ordering = serializers.ChoiceField(
+        choices=[prefix + name for name in PLAYER_ORDERINGS
+                 for prefix in ('', '-')],
+        required=False)
+
+    def validate_team(self, value):
+        """
+        Split the team list and check every code looks like a team code.
+        """
+        codes = [code.strip() for code in value.split(',') if code.strip()]
+        if not codes or len(codes) > MAX_TEAM_CODES:
+            raise serializers.ValidationError(
+                f"Provide between 1 and {MAX_TEAM_CODES} team codes.")
+        if any(len(code) > 3 for code in codes):
+            raise serializers.ValidationError(
+                "Team codes are at most 3 characters.")
+        return codes
+
+    def validate(self, data):
+        """
+        Reject inverted salary bands.
+        """
+        if data.get('min_salary', 0) > data.get('max_salary', float('inf')):
+            raise serializers.ValidationError(
+                "min_salary cannot be greater than max_salary.")
+        return data
+
+
+def prefix_upper_bound(prefix):
+    """
+    Smallest string greater than every string starting with `prefix`.
+
+    Turning a prefix match into name >= prefix AND name < bound lets the
+    database use the unique index on Player.name instead of a LIKE scan.
+
+    Returns:
+        The bound, or None when no string is greater (the prefix is only
+        U+10FFFF characters) and name >= prefix is enough
+    """
+    # The last code point has no successor, so increment the one before
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    successor = ord(prefix[-1]) + 1
+    if 0xD800 <= successor <= 0xDFFF:
+        # Surrogates cannot be encoded; the next character is U+E000
+        successor = 0xE000
+    return prefix[:-1] + chr(successor)
+
+
+class PlayerFilterBackend(BaseFilterBackend):
+    """
+    Filter backend applying validated salary, name, team and ordering
+    parameters to a Player queryset as plain indexed SQL conditions.
+
+    Views that already scope players to one team set
+    `allow_team_filter = False` so ?team= is ignored there.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = PlayerFilterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        if 'min_salary' in filters:
+            queryset = queryset.filter(salary__gte=filters['min_salary'])
+        if 'max_salary' in filters:
+            queryset = queryset.filter(salary__lte=filters['max_salary'])
+        if 'name' in filters:
+            queryset = queryset.filter(name__gte=filters['name'])
+            bound = prefix_upper_bound(filters['name'])
+            if bound is not None:
+                queryset = queryset.filter(name__lt=bound)
+        if 'team' in filters and getattr(view, 'allow_team_filter', True):
+            queryset = queryset.filter(team__code__in=filters['team'])
+        if 'ordering' in filters:
+            queryset = queryset.order_by(
+                *ordering_fields(PLAYER_ORDERINGS, filters['ordering']))
+        return queryset
@@ -0,0 +1,628 @@
+import csv
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.db import transaction
+
+from .models import Team, Player
+from .cache import invalidate_all
+from .versions import next_version
+
+# Number of rows written per bulk_create/bulk_update statement
+DEFAULT_BATCH_SIZE = 500
+
+# Largest byte range a parallel import worker parses at once
+DEFAULT_RANGE_SIZE = 8 * 1024 * 1024
+
+
+def new_stats():
+    """
+    Build an empty counter dictionary for an import run.
+
+    Returns:
+        dict with created, updated, unchanged and skipped counts set to zero
+    """
+    return {'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+
+
+def parse_team_row(row):
+    """
+    Validate and coerce one csv/teams.csv row.
+
+    Args:
+        row: dict produced by csv.DictReader
+
+    Returns:
+        dict with name, code and payroll keys
+
+    Raises:
+        ValueError: If a column is missing, empty or not an integer
+    """
+    try:
+        team = {
+            'name': row['Team'].strip(),
+            'code': row['Code'].strip(),
+            'payroll': int(row['Payroll'].strip()),
+        }
+    except (KeyError, AttributeError):
+        raise ValueError(f"Malformed team row: {row}")
+    if not team['name'] or not team['code']:
+        raise ValueError(f"Team row is missing a name or code: {row}")
+    return team
+
+
+def parse_player_row(row):
+    """
+    Validate and coerce one csv/players.csv row.
+
+    Args:
+        row: dict produced by csv.DictReader
+
+    Returns:
+        dict with name, code, team (the team code) and salary keys; code
+        is None when the file has no unique-code column or it is empty
+
+    Raises:
+        ValueError: If a column is missing, empty or salary is not an integer
+    """
+    try:
+        player = {
+            'name': row['Player'].strip(),
+            'code': (row.get('unique-code') or '').strip() or None,
+            'team': row['Team'].strip(),
+            'salary': int(row['salary'].strip()),
+        }
+    except (KeyError, AttributeError):
+        raise ValueError(f"Malformed player row: {row}")
+    if not player['name'] or not player['team'] or player['salary'] < 0:
+        raise ValueError(f"Invalid player row: {row}")
+    return player
+
+
+def read_team_rows(csv_file_path):
+    """
+    Read csv/teams.csv style rows into plain dictionaries.
+
+    Args:
+        csv_file_path: Path to a CSV file with Team, Code and Payroll columns
+
+    Returns:
+        List of dicts with name, code and payroll keys
+    """
+    with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
+        return [parse_team_row(row) for row in csv.DictReader(csvfile)]
+
+
+def read_player_rows(csv_file_path):
+    """
+    Read csv/players.csv style rows into plain dictionaries.
+
+    Args:
+        csv_file_path: Path to a CSV file with Player, Team and salary columns
+
+    Returns:
+        List of dicts with name, code, team (the team code) and salary keys
+    """
+    with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
+        return [parse_player_row(row) for row in csv.DictReader(csvfile)]
+
+
+def bulk_import_teams(rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Create or update teams keyed on Team.code using bulk queries.
+
+    Existing teams are loaded once, incoming rows are diffed against them
+    and only rows whose name or payroll changed are written back.
+
+    Args:
+        rows: Iterable of dicts with name, code and payroll keys
+        batch_size: Number of rows per bulk statement
+
+    Returns:
+        dict of created, updated, unchanged and skipped counts
+    """
+    stats = new_stats()
+
+    # Later rows win when a code appears more than once, as with
+    # update_or_create; the rows they replace are never written
+    incoming = {}
+    for row in rows:
+        if row['code'] in incoming:
+            stats['skipped'] += 1
+        incoming[row['code']] = row
+
+    with transaction.atomic():
+        existing = {team.code: team
+                    for team in Team.objects.filter(code__in=list(incoming))}
+
+        to_create = []
+        to_update = []
+        for code, row in incoming.items():
+            team = existing.get(code)
+            if team is None:
+                to_create.append(
+                    Team(name=row['name'], code=code, payroll=row['payroll']))
+            elif team.name != row['name'] or team.payroll != row['payroll']:
+                team.name = row['name']
+                team.payroll = row['payroll']
+                to_update.append(team)
+            else:
+                stats['unchanged'] += 1
+
+        # Stamp the written teams with one change version
+        if to_create or to_update:
+            version = next_version()
+            for team in to_create + to_update:
+                team.version = version
+
+        Team.objects.bulk_create(to_create, batch_size=batch_size)
+        Team.objects.bulk_update(
+            to_update, ['name', 'payroll', 'version'], batch_size=batch_size)
+
+        # Bulk writes send no signals, so drop cached rosters explicitly
+        if to_create or to_update:
+            invalidate_all()
+
+    stats['created'] += len(to_create)
+    stats['updated'] += len(to_update)
+    return stats
+
+
+def resolve_team_ids():
+    """
+    Map every team code to its primary key with a single query.
+
+    Returns:
+        dict of team code to team id
+    """
+    return dict(Team.objects.values_list('code', 'id'))
+
+
+def player_key(row):
+    """
+    Identity of a player row: its unique code, or its name for files
+    without a unique-code column.
+    """
+    return row.get('code') or row['name']
+
+
+def _write_player_batch(batch, team_ids, stats, batch_size):
+    """
+    Diff one batch of player rows against the database and write it.
+
+    Rows are matched on Player.code with one indexed lookup. Names are
+    only looked up for the rows that need them: new or renamed players,
+    whose name must still be free, rows without a code, and players
+    imported before codes were stored, who adopt the code of their row.
+
+    Args:
+        batch: dict of player_key() to row, already de-duplicated
+        team_ids: dict of team code to team id
+        stats: Counter dictionary updated in place
+        batch_size: Number of rows per bulk statement
+    """
+    by_code = Player.objects.in_bulk(
+        [row.get('code') for row in batch.values() if row.get('code')],
+        field_name='code')
+    by_name = Player.objects.in_bulk(
+        [row['name'] for row in batch.values()
+         if row.get('code') not in by_code
+         or by_code[row.get('code')].name != row['name']],
+        field_name='name')
+
+    to_create = []
+    to_update = []
+    # Names given to a player by this batch, which must stay unique
+    claimed = set()
+    for row in batch.values():
+        team_id = team_ids.get(row['team'])
+        if team_id is None:
+            # The team code is unknown, so the player cannot be attached
+            stats['skipped'] += 1
+            continue
+
+        player = by_code.get(row.get('code'))
+        owner = by_name.get(row['name'])
+        if player is None and owner is not None and (
+                row.get('code') is None or owner.code is None):
+            player = owner
+        if owner not in (None, player) or row['name'] in claimed:
+            # The name belongs to a player with another code
+            stats['skipped'] += 1
+            continue
+        claimed.add(row['name'])
+
+        code = row.get('code') or (player.code if player else None)
+        if player is None:
+            to_create.append(Player(name=row['name'], code=code,
+                                    team_id=team_id, salary=row['salary']))
+        elif (player.name, player.code, player.team_id, player.salary) != (
+                row['name'], code, team_id, row['salary']):
+            player.name = row['name']
+            player.code = code
+            player.team_id = team_id
+            player.salary = row['salary']
+            to_update.append(player)
+        else:
+            stats['unchanged'] += 1
+
+    # Stamp the written players with one change version
+    if to_create or to_update:
+        version = next_version()
+        for player in to_create + to_update:
+            player.version = version
+
+    Player.objects.bulk_create(to_create, batch_size=batch_size)
+    Player.objects.bulk_update(
+        to_update, ['name', 'code', 'team', 'salary', 'version'],
+        batch_size=batch_size)
+
+    # Bulk writes send no signals, so drop cached rosters explicitly
+    if to_create or to_update:
+        invalidate_all()
+
+    stats['created'] += len(to_create)
+    stats['updated'] += len(to_update)
+
+
+def bulk_import_players(rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Create or update players keyed on Player.code using bulk queries.
+
+    Team codes are resolved once into an in-memory dict, and rows are
+    diffed against existing players one batch at a time so each batch
+    costs one SELECT plus at most one INSERT and one UPDATE statement.
+    Everything runs inside a single transaction.
+
+    Args:
+        rows: Iterable of dicts with name, code, team (code) and salary keys
+        batch_size: Number of rows per bulk statement
+
+    Returns:
+        dict of created, updated, unchanged and skipped counts
+    """
+    stats = new_stats()
+
+    with transaction.atomic():
+        team_ids = resolve_team_ids()
+
+        batch = {}
+        for row in rows:
+            if player_key(row) in batch:
+                # Duplicate player inside a batch, the later row wins and
+                # the earlier one is never written
+                stats['skipped'] += 1
+            elif len(batch) >= batch_size:
+                _write_player_batch(batch, team_ids, stats, batch_size)
+                batch = {}
+            batch[player_key(row)] = row
+
+        if batch:
+            _write_player_batch(batch, team_ids, stats, batch_size)
+
+    return stats
+
+
+# Row parsers for each file layout the streaming importer understands
+ROW_PARSERS = {'teams': parse_team_row, 'players': parse_player_row}
+
+
+def iter_csv_rows(csv_file_path, start_row=0):
+    """
+    Lazily yield rows from a CSV file together with their row offset.
+
+    The offset is the 1-based number of data rows consumed so far, which
+    is what gets checkpointed. Rows up to start_row are skipped so an
+    interrupted import can resume without re-writing committed chunks.
+
+    Args:
+        csv_file_path: Path to the CSV file
+        start_row: Number of data rows to skip
+
+    Yields:
+        (offset, row) tuples where row is a csv.DictReader dict
+    """
+    with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
+        for offset, row in enumerate(csv.DictReader(csvfile), start=1):
+            if offset > start_row:
+                yield offset, row
+
+
+def validate_rows(rows, parser, stats):
+    """
+    Coerce rows with the given parser, counting and dropping invalid ones.
+
+    Args:
+        rows: Iterable of (offset, row) tuples
+        parser: parse_team_row or parse_player_row
+        stats: Counter dictionary, skipped is incremented for bad rows
+
+    Yields:
+        (offset, parsed row) tuples
+    """
+    for offset, row in rows:
+        try:
+            yield offset, parser(row)
+        except ValueError:
+            stats['skipped'] += 1
+
+
+def chunked(rows, chunk_size):
+    """
+    Group an iterable into lists of at most chunk_size items.
+
+    Args:
+        rows: Any iterable
+        chunk_size: Maximum length of each chunk
+
+    Yields:
+        Lists of consecutive items
+    """
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_checkpoint(checkpoint_path):
+    """
+    Read the committed row offset from a checkpoint file.
+
+    Args:
+        checkpoint_path: Path to the checkpoint file
+
+    Returns:
+        The stored offset, or 0 when no checkpoint exists
+    """
+    try:
+        with open(checkpoint_path, encoding='utf-8') as checkpoint:
+            return int(json.load(checkpoint)['offset'])
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(checkpoint_path, offset):
+    """
+    Atomically store the committed row offset in a checkpoint file.
+
+    Args:
+        checkpoint_path: Path to the checkpoint file
+        offset: Number of data rows that are safely committed
+    """
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as checkpoint:
+        json.dump({'offset': offset}, checkpoint)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def write_chunk(kind, rows, team_ids, stats, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Write one chunk of parsed rows in its own transaction.
+
+    Args:
+        kind: 'teams' or 'players'
+        rows: List of parsed row dicts
+        team_ids: dict of team code to team id, only used for players
+        stats: Counter dictionary updated in place
+        batch_size: Number of rows per bulk statement
+    """
+    with transaction.atomic():
+        if kind == 'teams':
+            for key, value in bulk_import_teams(rows, batch_size).items():
+                stats[key] += value
+            return
+
+        batch = {}
+        for row in rows:
+            if player_key(row) in batch:
+                stats['skipped'] += 1
+            batch[player_key(row)] = row
+        _write_player_batch(batch, team_ids, stats, batch_size)
+
+
+def stream_import(csv_file_path, kind='players', chunk_size=DEFAULT_BATCH_SIZE,
+                  checkpoint_path=None, start_row=0, on_chunk=None):
+    """
+    Import a roster file of any size with bounded memory.
+
+    Rows flow through a generator pipeline (read, validate and coerce,
+    chunk) and each chunk is written with bulk queries in its own
+    transaction, so only one chunk is ever held in memory. After every
+    committed chunk the row offset is written to checkpoint_path, and the
+    checkpoint is removed once the whole file has been imported.
+
+    Args:
+        csv_file_path: Path to a teams or players CSV file
+        kind: 'teams' or 'players'
+        chunk_size: Number of rows per chunk and transaction
+        checkpoint_path: Optional path used to record progress
+        start_row: Number of data rows to skip, e.g. from read_checkpoint
+        on_chunk: Optional callback called with (offset, stats) per chunk
+
+    Returns:
+        dict of created, updated, unchanged and skipped counts
+    """
+    stats = new_stats()
+    rows = validate_rows(
+        iter_csv_rows(csv_file_path, start_row), ROW_PARSERS[kind], stats)
+
+    # Teams are few, so their ids are resolved once for the whole file
+    team_ids = resolve_team_ids() if kind == 'players' else None
+
+    for chunk in chunked(rows, chunk_size):
+        write_chunk(kind, [row for _, row in chunk], team_ids, stats)
+
+        offset = chunk[-1][0]
+        if checkpoint_path:
+            write_checkpoint(checkpoint_path, offset)
+        if on_chunk:
+            on_chunk(offset, stats)
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return stats
+
+
+def split_byte_ranges(csv_file_path, range_size=DEFAULT_RANGE_SIZE):
+    """
+    Split a CSV file into newline-aligned byte ranges after its header.
+
+    Quoted fields spanning several lines are not supported, which matches
+    the layout of the files in csv/.
+
+    Args:
+        csv_file_path: Path to the CSV file
+        range_size: Approximate size in bytes of each range
+
+    Returns:
+        (header, ranges) where header is the list of column names and
+        ranges is a list of (start, end) byte offsets
+    """
+    with open(csv_file_path, 'rb') as csvfile:
+        header_line = csvfile.readline()
+        header = next(csv.reader([header_line.decode('utf-8-sig')]))
+        size = os.fstat(csvfile.fileno()).st_size
+
+        ranges = []
+        start = csvfile.tell()
+        while start < size:
+            # Move the boundary forward to the end of the current line
+            csvfile.seek(min(start + range_size, size))
+            csvfile.readline()
+            end = min(csvfile.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def parse_byte_range(task):
+    """
+    Parse and validate one byte range of a CSV file in a worker process.
+
+    Args:
+        task: (csv_file_path, kind, header, start, end) tuple
+
+    Returns:
+        (rows, skipped) where rows is the list of parsed row dicts and
+        skipped is the number of rows that failed validation
+    """
+    csv_file_path, kind, header, start, end = task
+    with open(csv_file_path, 'rb') as csvfile:
+        csvfile.seek(start)
+        text = csvfile.read(end - start).decode('utf-8')
+
+    parser = ROW_PARSERS[kind]
+    rows = []
+    skipped = 0
+    for row in csv.DictReader(io.StringIO(text, newline=''), fieldnames=header):
+        try:
+            rows.append(parser(row))
+        except ValueError:
+            skipped += 1
+    return rows, skipped
+
+
+def _init_worker():
+    """
+    Make sure Django is configured in worker processes started with spawn.
+    """
+    django.setup()
+
+
+def parallel_import(csv_file_paths, kind='players', workers=None,
+                    chunk_size=DEFAULT_BATCH_SIZE,
+                    range_size=DEFAULT_RANGE_SIZE, on_chunk=None):
+    """
+    Import many CSV files, or one large file, using a process pool.
+
+    Every file is cut into byte ranges that worker processes parse and
+    validate in parallel. The calling process is the only writer, since
+    SQLite allows a single writer at a time: it applies the parsed rows in
+    file order with bulk queries, one transaction per chunk. At most two
+    ranges per worker are in flight so memory stays bounded.
+
+    Args:
+        csv_file_paths: List of CSV files sharing the same layout
+        kind: 'teams' or 'players'
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Number of rows per write transaction
+        range_size: Approximate bytes parsed by a worker per task
+        on_chunk: Optional callback called with (rows written, stats)
+
+    Returns:
+        dict of created, updated, unchanged and skipped counts
+    """
+    stats = new_stats()
+    team_ids = resolve_team_ids() if kind == 'players' else None
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    written = 0
+
+    tasks = (
+        (path, kind, header, start, end)
+        for path in csv_file_paths
+        for header, ranges in [split_byte_ranges(path, range_size)]
+        for start, end in ranges
+    )
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker) as executor:
+        pending = deque()
+
+        for task in tasks:
+            pending.append(executor.submit(parse_byte_range, task))
+            if len(pending) < max_in_flight:
+                continue
+            written = _apply_parsed_range(
+                pending.popleft().result(), kind, team_ids, stats,
+                chunk_size, written, on_chunk)
+
+        while pending:
+            written = _apply_parsed_range(
+                pending.popleft().result(), kind, team_ids, stats,
+                chunk_size, written, on_chunk)
+
+    return stats
+
+
+def _apply_parsed_range(result, kind, team_ids, stats, chunk_size, written,
+                        on_chunk):
+    """
+    Write the rows parsed from one byte range in chunk_size transactions.
+
+    Returns:
+        Updated total of rows written so far
+    """
+    rows, skipped = result
+    stats['skipped'] += skipped
+    for chunk in chunked(rows, chunk_size):
+        write_chunk(kind, chunk, team_ids, stats)
+        written += len(chunk)
+        if on_chunk:
+            on_chunk(written, stats)
+    return written
+
+
+def format_stats(label, stats):
+    """
+    Format an import summary line.
+
+    Args:
+        label: Name of the imported entity, e.g. "Team"
+        stats: Counter dictionary returned by an import function
+
+    Returns:
+        Human readable summary string
+    """
+    return (
+        f"{label}: {stats['created']} created, {stats['updated']} updated, "
+        f"{stats['unchanged']} unchanged, {stats['skipped']} skipped"
+    )
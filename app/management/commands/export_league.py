@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import export
+
+
+class Command(BaseCommand):
+    """
+    Stream every team or player to a file or stdout.
+
+    Uses the same encoders as /api/export: 'csv' in the csv/ import
+    layout, 'ndjson' or 'columnar' row groups. Rows are read with a
+    server-side cursor and written a chunk at a time, so memory use does
+    not grow with the league.
+
+    Examples:
+        python manage.py export_league players --output players.csv
+        python manage.py export_league players --format columnar > players.columnar
+    """
+    help = "Export teams or players as CSV, NDJSON or columnar row groups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=sorted(export.TABLES),
+                            help="Table to export")
+        parser.add_argument(
+            '--format', dest='export_format', choices=sorted(export.FORMATS),
+            default='csv', help="Output format (default: csv)")
+        parser.add_argument(
+            '--output', help="File written (default: stdout)")
+        parser.add_argument(
+            '--chunk-size', type=int, default=export.chunk_size_setting(),
+            help="Rows read and written per chunk")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be a positive integer")
+
+        chunks = export.export(options['table'], options['export_format'],
+                               options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending='')
+            return
+
+        written = 0
+        try:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    written += output.write(chunk)
+        except OSError as e:
+            raise CommandError(f"Cannot write {options['output']}: {e}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {options['table']} to {options['output']} "
+            f"({written} bytes)"))
@@ -0,0 +1,78 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import synthetic
+
+
+class Command(BaseCommand):
+    """
+    Generate a deterministic synthetic league for scale testing.
+
+    Players get unique names and codes, skewed realistic salaries and a
+    share of free agents. The same --seed always produces the same league.
+    The league is bulk inserted into the (empty) database, or with --csv
+    streamed to players.csv and teams.csv files in the csv/ layout, ready
+    for import_roster.
+
+    Examples:
+        python manage.py generate_league 1000000 --teams 30 --seed 7
+        python manage.py generate_league 10000000 --csv /tmp/league
+    """
+    help = "Generate a synthetic league into the database or CSV files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('players', type=int, help="Number of players")
+        parser.add_argument(
+            '--teams', type=int, default=30,
+            help="Number of teams; the first 30 are the real ones (default: 30)")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed")
+        parser.add_argument(
+            '--free-agent-ratio', type=float,
+            default=synthetic.DEFAULT_FREE_AGENT_RATIO,
+            help="Share of free agents (database output only)")
+        parser.add_argument(
+            '--batch-size', type=int, default=synthetic.DEFAULT_BATCH_SIZE,
+            help="Players inserted per transaction")
+        parser.add_argument(
+            '--csv', metavar='DIRECTORY',
+            help="Write players.csv and teams.csv here instead of the database")
+
+    def handle(self, *args, **options):
+        if not 0 <= options['players'] <= synthetic.MAX_PLAYERS:
+            raise CommandError(
+                f"players must be between 0 and {synthetic.MAX_PLAYERS}")
+        if not 1 <= options['teams'] <= 26 ** 3:
+            raise CommandError(f"--teams must be between 1 and {26 ** 3}")
+        if not 0 <= options['free_agent_ratio'] <= 1:
+            raise CommandError("--free-agent-ratio must be between 0 and 1")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        if options['csv']:
+            os.makedirs(options['csv'], exist_ok=True)
+            players_path = os.path.join(options['csv'], 'players.csv')
+            teams_path = os.path.join(options['csv'], 'teams.csv')
+            stats = synthetic.write_csv(
+                players_path, teams_path, options['players'],
+                teams=options['teams'], seed=options['seed'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Wrote {stats['players']} players to {players_path} and "
+                f"{stats['teams']} teams to {teams_path}"))
+            return
+
+        def report(written):
+            # Progress line per committed batch, verbosity 2 and above
+            if options['verbosity'] > 1:
+                self.stdout.write(f"Inserted {written} players")
+
+        try:
+            stats = synthetic.write_database(
+                options['players'], teams=options['teams'], seed=options['seed'],
+                free_agent_ratio=options['free_agent_ratio'],
+                batch_size=options['batch_size'], progress=report)
+        except ValueError as error:
+            raise CommandError(str(error))
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {stats['teams']} teams and {stats['players']} players "
+            f"({stats['free_agents']} free agents)"))
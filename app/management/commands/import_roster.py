@@ -0,0 +1,101 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import importer
+
+
+class Command(BaseCommand):
+    """
+    Stream teams or players CSV files into the database in fixed-size chunks.
+
+    Memory use is bounded by the chunk size regardless of the file size,
+    and an interrupted single-file run can be resumed from its
+    checkpointed row offset. With --workers, files are cut into byte
+    ranges that a process pool parses and validates while this process
+    remains the only database writer.
+
+    Examples:
+        python manage.py import_roster csv/players.csv --chunk-size 5000 --resume
+        python manage.py import_roster archive/*.csv --workers 4
+    """
+    help = "Stream roster CSV files into the database in bulk chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="CSV files to import")
+        parser.add_argument(
+            '--kind', choices=sorted(importer.ROW_PARSERS), default='players',
+            help="Layout of the files (default: players)")
+        parser.add_argument(
+            '--chunk-size', type=int, default=importer.DEFAULT_BATCH_SIZE,
+            help="Rows written per transaction")
+        parser.add_argument(
+            '--checkpoint',
+            help="Checkpoint file (default: <path>.checkpoint)")
+        parser.add_argument(
+            '--resume', action='store_true',
+            help="Skip rows already committed according to the checkpoint")
+        parser.add_argument(
+            '--workers', type=int, default=0,
+            help="Parse files in this many processes (default: sequential)")
+        parser.add_argument(
+            '--range-size', type=int, default=importer.DEFAULT_RANGE_SIZE,
+            help="Bytes of a file parsed per worker task")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be a positive integer")
+
+        def report(offset, stats):
+            # Progress line per committed chunk, verbosity 2 and above
+            if options['verbosity'] > 1:
+                self.stdout.write(f"Committed through row {offset}")
+
+        try:
+            if options['workers'] > 0 or len(options['paths']) > 1:
+                stats = self.parallel_import(options, report)
+            else:
+                stats = self.stream_import(options, report)
+        except FileNotFoundError as e:
+            raise CommandError(f"File not found: {e.filename}")
+
+        self.stdout.write(self.style.SUCCESS(
+            importer.format_stats(options['kind'].capitalize(), stats)))
+
+    def stream_import(self, options, report):
+        """
+        Import a single file sequentially with checkpointing.
+        """
+        path = options['paths'][0]
+        checkpoint_path = options['checkpoint'] or f"{path}.checkpoint"
+        start_row = 0
+        if options['resume']:
+            start_row = importer.read_checkpoint(checkpoint_path)
+            if start_row:
+                self.stdout.write(f"Resuming after row {start_row}")
+
+        return importer.stream_import(
+            path,
+            kind=options['kind'],
+            chunk_size=options['chunk_size'],
+            checkpoint_path=checkpoint_path,
+            start_row=start_row,
+            on_chunk=report,
+        )
+
+    def parallel_import(self, options, report):
+        """
+        Import one or more files with a worker pool for parsing.
+        """
+        if options['resume']:
+            raise CommandError(
+                "--resume is only supported for a single sequential import")
+        if options['range_size'] < 1:
+            raise CommandError("--range-size must be a positive integer")
+
+        return importer.parallel_import(
+            options['paths'],
+            kind=options['kind'],
+            workers=options['workers'] or None,
+            chunk_size=options['chunk_size'],
+            range_size=options['range_size'],
+            on_chunk=report,
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from ...payroll import reconcile_payroll
+
+
+class Command(BaseCommand):
+    """
+    Recompute every team payroll from its roster and report any drift.
+
+    Runs in a constant number of queries, so it is cheap enough to
+    schedule every few minutes.
+
+    Example:
+        python manage.py reconcile_payroll --fix
+    """
+    help = "Report (and optionally fix) drift between Team.payroll and player salaries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help="Rewrite drifted payrolls with the recomputed totals")
+
+    def handle(self, *args, **options):
+        report = reconcile_payroll(fix=options['fix'])
+
+        for team in report['teams']:
+            self.stdout.write(
+                f"{team['code']}: stored {team['payroll']}, "
+                f"actual {team['actual_payroll']}, drift {team['drift']:+d}")
+
+        summary = f"{report['drifted']} of {report['checked']} teams drifted"
+        if options['fix']:
+            summary += f", {report['fixed']} fixed"
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,65 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...simulator import load_snapshot, simulate, top_scenarios, describe
+
+
+class Command(BaseCommand):
+    """
+    Sweep every 2-for-1 trade that keeps both teams under the payroll cap.
+
+    The league is read once; scenarios are evaluated in memory and written
+    as newline delimited JSON as each source team finishes.
+
+    Example:
+        python manage.py simulate_trades --team GSW,LAL --workers 4 --top 50
+    """
+    help = "Enumerate and rank 2-for-1 trades in memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--team', default='',
+            help="Comma separated codes of the teams sending two players "
+                 "(default: every team)")
+        parser.add_argument(
+            '--cap', type=int, default=None,
+            help="Payroll cap (default: settings.TRADE_SALARY_CAP)")
+        parser.add_argument(
+            '--limit', type=int, default=20,
+            help="Scenarios kept per source team")
+        parser.add_argument(
+            '--top', type=int, default=0,
+            help="Only print the N best scenarios across the whole league")
+        parser.add_argument(
+            '--workers', type=int, default=0,
+            help="Worker processes (0 runs in this process)")
+
+    def handle(self, *args, **options):
+        # Same bounds as the limit of /api/simulations/two-for-one
+        if options['limit'] < 1:
+            raise CommandError("--limit must be a positive integer")
+        if options['top'] < 0:
+            raise CommandError("--top cannot be negative")
+
+        snapshot = load_snapshot()
+        codes = [code for code in options['team'].split(',') if code]
+        try:
+            sources = [snapshot.index_of(code) for code in codes] or None
+        except KeyError as error:
+            raise CommandError(f"Cannot find team {error.args[0]}")
+
+        limit = max(options['limit'], options['top'])
+        results = simulate(snapshot, sources=sources, cap=options['cap'],
+                           limit=limit, workers=options['workers'])
+        if options['top']:
+            results = [top_scenarios(results, options['top'])]
+
+        evaluated = 0
+        for team_evaluated, scenarios in results:
+            evaluated += team_evaluated
+            for scenario in scenarios:
+                self.stdout.write(json.dumps(describe(snapshot, scenario)))
+
+        self.stderr.write(self.style.SUCCESS(
+            f"{evaluated} trades evaluated under the cap"))
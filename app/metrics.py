@@ -0,0 +1,253 @@
+import bisect
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+# Histogram bucket upper bounds for durations, in seconds
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                    0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Histogram bucket upper bounds for the number of queries per request
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+# Quantiles estimated from the buckets
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Prefix of every exported metric name
+METRIC_PREFIX = 'trademachine'
+
+# Metrics of the request being handled, or None when it is not sampled
+current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Counters collected while one sampled request is handled.
+
+    Times are in seconds. Serialize and render times exclude any SQL
+    queries run inside them, which count toward db only.
+    """
+    __slots__ = ('queries', 'db', 'serialize', 'render')
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus style.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One count per bucket plus the +Inf bucket, not cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """
+        Yield (upper bound, cumulative count) pairs, ending with +Inf.
+        """
+        total = 0
+        for bound, count in zip((*self.buckets, float('inf')), self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside its bucket,
+        like Prometheus' histogram_quantile().
+
+        Returns:
+            The estimate, or None when nothing was observed
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower, below = 0, 0
+        for bound, total in self.cumulative():
+            if total >= rank:
+                if bound == float('inf'):
+                    # Beyond the last bucket: report its upper bound
+                    return self.buckets[-1]
+                in_bucket = total - below
+                return lower + (bound - lower) * (rank - below) / in_bucket
+            lower, below = bound, total
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    In-process histograms of request metrics, per view.
+
+    Histograms are per server process; scrape every process, or add them
+    up with sum() in PromQL.
+    """
+
+    # (metric, help text, buckets) for every histogram family
+    FAMILIES = (
+        ('request_duration_seconds', "Time spent handling a request.",
+         DURATION_BUCKETS),
+        ('db_duration_seconds', "Time spent in SQL queries per request.",
+         DURATION_BUCKETS),
+        ('db_queries', "SQL queries run per request.", QUERY_BUCKETS),
+        ('serialize_duration_seconds',
+         "Time spent serializing rows per request, excluding SQL.",
+         DURATION_BUCKETS),
+        ('render_duration_seconds',
+         "Time spent rendering JSON or templates per request, excluding SQL.",
+         DURATION_BUCKETS),
+    )
+
+    def __init__(self):
+        self.histograms = {name: {} for name, _, _ in self.FAMILIES}
+        self.buckets = {name: buckets for name, _, buckets in self.FAMILIES}
+        self.lock = threading.Lock()
+
+    def observe(self, view, total, metrics):
+        """
+        Record one sampled request.
+
+        Args:
+            view: Name of the view that handled it
+            total: Seconds spent handling the request
+            metrics: RequestMetrics collected during the request
+        """
+        values = {
+            'request_duration_seconds': total,
+            'db_duration_seconds': metrics.db,
+            'db_queries': metrics.queries,
+            'serialize_duration_seconds': metrics.serialize,
+            'render_duration_seconds': metrics.render,
+        }
+        with self.lock:
+            for name, value in values.items():
+                histogram = self.histograms[name].get(view)
+                if histogram is None:
+                    histogram = self.histograms[name][view] = Histogram(
+                        self.buckets[name])
+                histogram.observe(value)
+
+    def quantiles(self, name, view):
+        """
+        Return {quantile: estimate} of one histogram, e.g. {0.99: 0.12}.
+        """
+        with self.lock:
+            histogram = self.histograms[name].get(view)
+            return {q: histogram.quantile(q) if histogram else None
+                    for q in QUANTILES}
+
+    def render_prometheus(self):
+        """
+        Render every histogram, and its p50/p95/p99 estimates as gauges,
+        in the Prometheus text exposition format.
+        """
+        lines = []
+        with self.lock:
+            for name, help_text, _ in self.FAMILIES:
+                metric = f'{METRIC_PREFIX}_{name}'
+                lines += [f'# HELP {metric} {help_text}',
+                          f'# TYPE {metric} histogram']
+                for view, histogram in sorted(self.histograms[name].items()):
+                    for bound, total in histogram.cumulative():
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(
+                            f'{metric}_bucket{{view="{view}",le="{le}"}} {total}')
+                    lines.append(f'{metric}_sum{{view="{view}"}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{view="{view}"}} {histogram.count}')
+
+            for name, help_text, _ in self.FAMILIES:
+                metric = f'{METRIC_PREFIX}_{name}_quantile'
+                lines += [f'# HELP {metric} Estimated quantiles of {METRIC_PREFIX}_{name}.',
+                          f'# TYPE {metric} gauge']
+                for view, histogram in sorted(self.histograms[name].items()):
+                    for q in QUANTILES:
+                        lines.append(f'{metric}{{view="{view}",quantile="{q}"}} '
+                                     f'{histogram.quantile(q)}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry filled by InstrumentationMiddleware
+registry = MetricsRegistry()
+
+
+def should_sample():
+    """
+    Decide whether to instrument the next request, following
+    settings.METRICS_SAMPLE_RATE (0 turns instrumentation off).
+    """
+    rate = settings.METRICS_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing queries of sampled requests.
+
+    Installed on every connection by install_query_recorder(); outside a
+    sampled request it costs one context variable lookup per query.
+    """
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    connection_created handler adding record_query() to a connection.
+
+    Connections are per thread, so this also covers the worker threads
+    that run the async views' ORM calls.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def span(phase):
+    """
+    Add the time spent in the block to a phase ('serialize' or 'render')
+    of the current request, minus the SQL run inside it.
+    """
+    metrics = current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    db = metrics.db
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start - (metrics.db - db)
+        setattr(metrics, phase, getattr(metrics, phase) + elapsed)
+
+
+def server_timing(total, metrics):
+    """
+    Build a Server-Timing header value, durations in milliseconds.
+    """
+    return ', '.join([
+        f'total;dur={total * 1000:.2f}',
+        f'db;dur={metrics.db * 1000:.2f};desc="{metrics.queries} queries"',
+        f'serialize;dur={metrics.serialize * 1000:.2f}',
+        f'render;dur={metrics.render * 1000:.2f}',
+    ])
@@ -0,0 +1,75 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import metrics
+
+
+def view_name(request):
+    """
+    Name metrics are grouped by: the view class or function that handled
+    the request, or 'unresolved' when no URL matched.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return getattr(match.func, 'view_class', match.func).__name__
+
+
+class InstrumentationMiddleware:
+    """
+    Record query count, DB, serialization and render time per request.
+
+    A sampled request (see settings.METRICS_SAMPLE_RATE) gets a
+    Server-Timing header, readable in the browser's network panel, and is
+    added to the per-view histograms served at /metrics. Requests that are
+    not sampled go straight to the view. Works for both the sync and the
+    async views; for streaming responses only the time until the response
+    starts is measured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not metrics.should_sample():
+            return self.get_response(request)
+
+        collected = metrics.RequestMetrics()
+        token = metrics.current.set(collected)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current.reset(token)
+        return self.finish(request, response, collected, start)
+
+    async def __acall__(self, request):
+        if not metrics.should_sample():
+            return await self.get_response(request)
+
+        # The context, and so the collected metrics, follows the ORM calls
+        # into the sync_to_async worker thread
+        collected = metrics.RequestMetrics()
+        token = metrics.current.set(collected)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current.reset(token)
+        return self.finish(request, response, collected, start)
+
+    def finish(self, request, response, collected, start):
+        """
+        Add the Server-Timing header and record the request.
+        """
+        total = time.perf_counter() - start
+        response['Server-Timing'] = metrics.server_timing(total, collected)
+        metrics.registry.observe(view_name(request), total, collected)
+        return response
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_alter_player_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='team',
+            name='code',
+            field=models.CharField(max_length=3, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['team', 'free_agent'], name='player_team_free_agent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(('free_agent', True)), fields=['salary', 'id'], name='player_free_agent_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+def create_counter(apps, schema_editor):
+    # The single counter row every write increments
+    ChangeCounter = apps.get_model('app', 'ChangeCounter')
+    ChangeCounter.objects.get_or_create(id=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_player_indexes_unique_team_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='version',
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='version',
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(create_counter, migrations.RunPython.noop),
+    ]
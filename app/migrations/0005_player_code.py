@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_change_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='code',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+    ]
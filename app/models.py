@@ -15,13 +15,18 @@ class Team(models.Model):
     name = models.CharField(max_length=255)
 
     # Short team code (typically 3 letters)
-    # Used for quick identification and referencing
-    code = models.CharField(max_length=3)
+    # Used for quick identification and referencing; unique so that
+    # lookups by code on every roster request use an index
+    code = models.CharField(max_length=3, unique=True)
 
     # Total team payroll stored as an integer
     # Represents the team's total player salary expenditure
     payroll = models.IntegerField()
 
+    # Change version of the last write to this team (see app.versions),
+    # indexed so /api/changes can read only the rows changed since a version
+    version = models.BigIntegerField(default=0, db_index=True)
+
     def __str__(self):
         """
         String representation of the Team model.
@@ -42,6 +47,12 @@ class Player(models.Model):
     # Player's full name with a maximum length of 255 characters
     name = models.CharField(max_length=255, unique=True)
 
+    # External identifier from the unique-code column of csv/players.csv
+    # (e.g. 'curryst01'). Imports upsert on it and the API looks players
+    # up by it through its unique index; players created through the API
+    # have none
+    code = models.CharField(max_length=32, unique=True, null=True, blank=True)
+
     # Foreign key relationship to the Team model
     # on_delete=models.CASCADE ensures that if a team is deleted,
     # all associated players are also deleted
@@ -55,6 +66,22 @@ class Player(models.Model):
     # Defaults to False when not explicitly set
     free_agent = models.BooleanField(default=False)
 
+    # Change version of the last write to this player (see app.versions),
+    # indexed so /api/changes can read only the rows changed since a version
+    version = models.BigIntegerField(default=0, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Team roster query: filter(team=..., free_agent=False)
+            models.Index(fields=['team', 'free_agent'],
+                         name='player_team_free_agent_idx'),
+            # Free agent list: filter(free_agent=True), only indexes the
+            # (usually small) free agent pool
+            models.Index(fields=['salary', 'id'],
+                         condition=models.Q(free_agent=True),
+                         name='player_free_agent_idx'),
+        ]
+
     def __str__(self):
         """
         String representation of the Player model.
@@ -63,3 +90,21 @@ class Player(models.Model):
         Useful for admin interfaces and debugging.
         """
         return self.name
+
+
+class ChangeCounter(models.Model):
+    """
+    Single-row table holding the last change version handed out.
+
+    Every write transaction reserves the next version from this row and
+    stamps it on the teams and players it modifies. The row lock taken by
+    the increment makes versions follow commit order.
+    """
+    # Last version handed out
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        """
+        String representation of the ChangeCounter model.
+        """
+        return str(self.value)
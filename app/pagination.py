@@ -0,0 +1,212 @@
+import base64
+import binascii
+import json
+
+from django.db.models import CharField, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# Keyset orderings exposed by the player and team list endpoints. Every
+# ordering ends with the primary key so that it is unique.
+PLAYER_ORDERINGS = {
+    'salary': ('salary', 'id'),
+    'name': ('name', 'id'),
+    'id': ('id',),
+}
+TEAM_ORDERINGS = {
+    'name': ('name', 'id'),
+    'payroll': ('payroll', 'id'),
+    'id': ('id',),
+}
+
+
+def ordering_fields(orderings, name):
+    """
+    Expand an ?ordering= value into the fields to order by.
+
+    Args:
+        orderings: dict such as PLAYER_ORDERINGS
+        name: Key of that dict, optionally prefixed with '-' for descending
+
+    Returns:
+        Tuple of order_by() arguments, e.g. ('-salary', '-id')
+    """
+    fields = orderings[name.lstrip('-')]
+    if name.startswith('-'):
+        fields = tuple(f"-{field}" for field in fields)
+    return fields
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination over a unique ordering such as (salary, id).
+
+    Instead of OFFSET, each page filters on the last row of the previous
+    page, e.g. WHERE (salary, id) > (last_salary, last_id), so page 1000
+    costs the same index seek as page one.
+
+    Pagination is opt-in to keep existing clients working: a request is
+    only paginated when it passes ?page_size= or ?cursor= (unless
+    `opt_in` is turned off by a subclass). Views declare
+    the orderings they allow with a `keyset_orderings` dict mapping the
+    ?ordering= value to a tuple of fields ending in the primary key, and
+    the default with `default_keyset_ordering`.
+    """
+    # Query parameter names
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_query_param = 'ordering'
+
+    # Page size used when only a cursor is given, and the largest allowed
+    page_size = 50
+    max_page_size = 500
+
+    # Orderings used when the view does not declare its own
+    default_orderings = {'id': ('id',)}
+
+    # Only paginate requests that ask for it
+    opt_in = True
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of results, or None when pagination was not requested.
+        """
+        params = request.query_params
+        if (self.opt_in and self.cursor_query_param not in params
+                and self.page_size_query_param not in params):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering_name, self.ordering = self.get_ordering(request, view)
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = self.decode_cursor(request, queryset.model)
+        if cursor is not None:
+            queryset = queryset.filter(self.keyset_filter(cursor))
+
+        # Fetch one extra row to know whether another page exists
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        """
+        Read and validate ?page_size=.
+        """
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            page_size = int(raw)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: "Must be an integer."})
+        if not 1 <= page_size <= self.max_page_size:
+            raise ValidationError({self.page_size_query_param:
+                                   f"Must be between 1 and {self.max_page_size}."})
+        return page_size
+
+    def get_ordering(self, request, view):
+        """
+        Resolve ?ordering= against the orderings the view allows.
+
+        Returns:
+            (name, fields) where fields is a tuple such as ('-salary', '-id')
+        """
+        orderings = getattr(view, 'keyset_orderings', self.default_orderings)
+        default = getattr(view, 'default_keyset_ordering', next(iter(orderings)))
+        name = request.query_params.get(self.ordering_query_param, default)
+
+        if name.lstrip('-') not in orderings:
+            raise ValidationError({self.ordering_query_param:
+                                   f"Must be one of: {', '.join(sorted(orderings))}."})
+        return name, ordering_fields(orderings, name)
+
+    def keyset_filter(self, values):
+        """
+        Build a filter selecting rows strictly after `values` in the ordering.
+
+        For fields (a, b, id) this is a > x OR (a = x AND b > y) OR
+        (a = x AND b = y AND id > z), with < for descending fields.
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, row):
+        """
+        Encode the ordering values of the last row on the page.
+        """
+        # Rows are model instances, or dicts on the .values() fast path
+        values = [row[field.lstrip('-')] if isinstance(row, dict)
+                  else getattr(row, field.lstrip('-')) for field in self.ordering]
+        payload = json.dumps({'o': self.ordering_name, 'v': values})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request, model):
+        """
+        Decode ?cursor=, or return None when there is none.
+
+        Cursors come back from clients, so every value is checked against
+        the type of its field before it reaches the query: a string for
+        text fields, an integer otherwise.
+        """
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(raw.encode()))
+            ordering, values = payload['o'], payload['v']
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+        if (ordering != self.ordering_name or not isinstance(values, list)
+                or len(values) != len(self.ordering)):
+            raise ValidationError({self.cursor_query_param:
+                                   "Cursor does not match the requested ordering."})
+        for field, value in zip(self.ordering, values):
+            model_field = model._meta.get_field(field.lstrip('-'))
+            expected = str if isinstance(model_field, CharField) else int
+            if not isinstance(value, expected) or isinstance(value, bool):
+                raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+        return values
+
+    def get_next_link(self):
+        """
+        Absolute URL of the next page, or None on the last page.
+        """
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(
+            url, self.page_size_query_param, self.page_size)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+class ChangeFeedPagination(KeysetPagination):
+    """
+    Keyset pagination of the change feed, ordered by (version, id).
+
+    Always applied, since a full sync can cover every player in the
+    league. Resuming from the cursor of the last page reads only the rows
+    written after it.
+    """
+    opt_in = False
+    page_size = 500
+    max_page_size = 5000
+    default_orderings = {'version': ('version', 'id')}
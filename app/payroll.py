@@ -0,0 +1,161 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import (Case, F, IntegerField, OuterRef, Q, Subquery,
+                              Sum, Value, When)
+from django.db.models.functions import Coalesce
+
+from .models import Team, Player
+from .cache import invalidate_teams
+from .versions import next_version
+
+
+def payroll_contribution(player):
+    """
+    Describe how much a player counts toward a team payroll.
+
+    Args:
+        player: Player instance
+
+    Returns:
+        (team_id, salary) tuple, or None when the player is a free agent
+    """
+    if player.free_agent:
+        return None
+    return (player.team_id, player.salary)
+
+
+def payroll_deltas(before, after, deltas=None):
+    """
+    Accumulate the payroll changes caused by moving a contribution.
+
+    Args:
+        before: Contribution before the change, from payroll_contribution
+        after: Contribution after the change, from payroll_contribution
+        deltas: Optional dict of team id to delta to accumulate into
+
+    Returns:
+        dict of team id to payroll delta
+    """
+    if deltas is None:
+        deltas = defaultdict(int)
+    if before:
+        deltas[before[0]] -= before[1]
+    if after:
+        deltas[after[0]] += after[1]
+    return deltas
+
+
+def apply_payroll_deltas(deltas, version=None):
+    """
+    Apply payroll changes with atomic F() expressions.
+
+    The database adds each delta to the stored payroll itself, so
+    concurrent writers never overwrite each other's changes. Any number
+    of teams is updated with a single UPDATE statement, which also stamps
+    the change version on them, and the cached rosters of those teams
+    are invalidated.
+
+    Args:
+        deltas: dict of team id to payroll delta
+        version: Change version of the surrounding write transaction,
+            reserved with next_version() when not given
+
+    Returns:
+        Number of team rows updated
+    """
+    deltas = {team_id: delta for team_id, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+
+    if version is None:
+        version = next_version()
+
+    invalidate_teams(deltas)
+    if len(deltas) == 1:
+        [(team_id, delta)] = deltas.items()
+        return Team.objects.filter(id=team_id).update(
+            payroll=F('payroll') + delta, version=version)
+
+    return Team.objects.filter(id__in=list(deltas)).update(
+        payroll=F('payroll') + Case(
+            *[When(id=team_id, then=Value(delta))
+              for team_id, delta in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        version=version,
+    )
+
+
+def payroll_drift():
+    """
+    Compare every stored Team.payroll with the salaries actually on its roster.
+
+    The true payroll of all teams is computed with one GROUP BY aggregate
+    over non-free-agent players, so this costs a single query regardless
+    of league size.
+
+    Returns:
+        List of dicts with id, code, name, payroll, actual_payroll and
+        drift (stored minus actual) for every team, ordered by id
+    """
+    teams = Team.objects.annotate(
+        actual_payroll=Coalesce(
+            Sum('player__salary', filter=Q(player__free_agent=False)),
+            0,
+        )
+    ).order_by('id').values('id', 'code', 'name', 'payroll', 'actual_payroll')
+
+    return [
+        dict(team, drift=team['payroll'] - team['actual_payroll'])
+        for team in teams
+    ]
+
+
+def actual_payroll_subquery():
+    """
+    Correlated subquery summing a team's non-free-agent salaries.
+    """
+    return Coalesce(
+        Subquery(
+            Player.objects.filter(team=OuterRef('pk'), free_agent=False)
+            .values('team')
+            .annotate(total=Sum('salary'))
+            .values('total')
+        ),
+        0,
+    )
+
+
+def reconcile_payroll(fix=False):
+    """
+    Report payroll drift per team and optionally correct it.
+
+    The fix is a single UPDATE that recomputes payroll from the roster
+    inside the statement itself, so a cut or sign racing with the
+    reconciliation cannot be overwritten with a stale total.
+
+    Args:
+        fix: Whether to rewrite the payroll of teams that drifted
+
+    Returns:
+        dict with checked, drifted and fixed counts and the drifted teams
+    """
+    report = payroll_drift()
+    drifted = [team for team in report if team['drift']]
+
+    fixed = 0
+    if fix and drifted:
+        with transaction.atomic():
+            fixed = Team.objects.filter(
+                id__in=[team['id'] for team in drifted]
+            ).update(payroll=actual_payroll_subquery(), version=next_version())
+            invalidate_teams(team['id'] for team in drifted)
+
+    return {
+        'checked': len(report),
+        'drifted': len(drifted),
+        'fixed': fixed,
+        'teams': drifted,
+    }
@@ -0,0 +1,55 @@
+from rest_framework.renderers import JSONRenderer
+
+from .metrics import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def contains_float(data):
+    """
+    Whether a float appears anywhere inside lists, tuples and dicts.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with orjson when it is installed.
+
+    orjson writes the same compact, UTF-8 output as DRF's JSONRenderer
+    for strings, integers, booleans and None, so responses stay
+    byte-identical. Two differences are handled here: U+2028 and U+2029
+    are escaped as DRF does, and data holding floats, which orjson
+    formats differently (1e-7 instead of 1e-07), goes to the standard
+    renderer. So does anything orjson cannot encode, and indented output
+    requested through the Accept header.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with span('render'):
+            return self.encode(data, accepted_media_type, renderer_context)
+
+    def encode(self, data, accepted_media_type, renderer_context):
+        if orjson is None or data is None or self.get_indent(
+                accepted_media_type, renderer_context or {}) is not None \
+                or contains_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            encoded = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep the output a strict JavaScript subset, like JSONRenderer
+        return (encoded.replace('\u2028'.encode(), b'\\u2028')
+                .replace('\u2029'.encode(), b'\\u2029'))
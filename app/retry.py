@@ -0,0 +1,53 @@
+import functools
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+# SQLite error messages meaning another connection holds the lock
+BUSY_MESSAGES = ('database is locked', 'database table is locked')
+
+
+def is_busy_error(error):
+    """
+    Whether an exception is SQLite's SQLITE_BUSY / SQLITE_LOCKED.
+    """
+    return (isinstance(error, OperationalError)
+            and any(message in str(error) for message in BUSY_MESSAGES))
+
+
+def retry_on_busy(function):
+    """
+    Retry a write view when SQLite reports the database as locked.
+
+    SQLite already waits up to the connection timeout for the write lock;
+    past that the whole transaction is run again, up to
+    settings.SQLITE_BUSY_RETRIES times, sleeping SQLITE_BUSY_BACKOFF
+    seconds doubled on every attempt, with jitter so that the retrying
+    writers do not collide again. The wrapped function must do all its
+    writes in its own transaction.atomic() block, so a failed attempt
+    leaves nothing behind.
+
+    Errors raised inside an outer transaction are not retried: only the
+    owner of that transaction can run it again.
+
+    Args:
+        function: View method or function to wrap
+
+    Returns:
+        The wrapped function
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        retries = settings.SQLITE_BUSY_RETRIES
+        for attempt in range(retries + 1):
+            try:
+                return function(*args, **kwargs)
+            except OperationalError as error:
+                if (attempt == retries or not is_busy_error(error)
+                        or transaction.get_connection().in_atomic_block):
+                    raise
+            time.sleep(settings.SQLITE_BUSY_BACKOFF * 2 ** attempt
+                       * random.uniform(0.5, 1.5))
+    return wrapper
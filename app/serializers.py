@@ -31,4 +31,165 @@ class PlayerSerializer(serializers.ModelSerializer):
 
         # Define the fields that will be included in the serialized representation
         # This allows controlled exposure of model data through the API
-        fields = ['id', 'name', 'team', 'salary', 'free_agent']
+        fields = ['id', 'name', 'code', 'team', 'salary', 'free_agent']
+
+        # The external code comes from roster imports and is never edited
+        # through the API
+        read_only_fields = ['code']
+
+
+class ExpandedPlayerSerializer(PlayerSerializer):
+    """
+    Player serializer that nests the full team instead of its primary key.
+
+    Used when a client asks for ?expand=team, so it does not have to call
+    /api/teams to resolve team names. Querysets passed to this serializer
+    should use select_related('team') to avoid one query per player.
+    """
+    # Nested, read-only team representation
+    team = TeamSerializer(read_only=True)
+
+    class Meta(PlayerSerializer.Meta):
+        pass
+
+
+def wants_expanded_team(request):
+    """
+    Check whether the request asked for nested team objects.
+
+    Args:
+        request: DRF or Django request with an optional ?expand=team
+            query parameter
+
+    Returns:
+        True when 'team' is one of the comma separated expand values
+    """
+    params = getattr(request, 'query_params', request.GET)
+    expand = params.get('expand', '')
+    return 'team' in expand.split(',')
+
+
+# Largest value of a 64-bit integer column; bigger ids cannot be sent to
+# the database, so they are rejected while validating
+MAX_ID = 2 ** 63 - 1
+
+# Largest trade accepted in one request, keeping the IN (...) lists of the
+# trade queries well inside database parameter limits
+MAX_TRADE_MOVES = 500
+
+
+class TradeMoveSerializer(serializers.Serializer):
+    """
+    One player reassignment inside a trade proposal.
+    """
+    # Player being moved
+    player = serializers.IntegerField(min_value=1, max_value=MAX_ID)
+
+    # Code of the team receiving the player
+    team = serializers.CharField(max_length=3)
+
+
+class TradeProposalSerializer(serializers.Serializer):
+    """
+    Validates the shape of a trade proposal before it is evaluated.
+
+    Salary rules and existence checks need the database and are left to
+    app.trades.execute_trade().
+    """
+    # Every player reassignment of the trade, across any number of teams
+    moves = TradeMoveSerializer(many=True, allow_empty=False,
+                                max_length=MAX_TRADE_MOVES)
+
+    # Evaluate the trade without applying it
+    dry_run = serializers.BooleanField(default=False)
+
+
+class ChangesParamsSerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the change feed.
+
+    - since: version returned by the previous sync; omit it for a full sync
+    """
+    since = serializers.IntegerField(min_value=0, max_value=MAX_ID,
+                                     required=False)
+
+
+class SimulationParamsSerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the trade simulator.
+
+    - team: comma separated codes of the teams sending two players
+      (default: every team)
+    - cap: payroll neither team may exceed (default: TRADE_SALARY_CAP)
+    - limit: scenarios returned per source team, or overall when ranked
+    - ranked: merge every team's results into one league-wide ranking
+      instead of streaming each team as soon as it is done
+    """
+    team = serializers.CharField(required=False)
+    cap = serializers.IntegerField(min_value=0, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=20)
+    ranked = serializers.BooleanField(default=False)
+
+    def validate_team(self, value):
+        """
+        Split the team list into codes.
+        """
+        return [code.strip() for code in value.split(',') if code.strip()]
+
+
+# Largest number of operations accepted by /api/players/bulk
+MAX_BULK_OPERATIONS = 500
+
+
+class BulkOperationSerializer(serializers.Serializer):
+    """
+    Validates one operation of a bulk roster request.
+
+    - cut: {"op": "cut", "player": id}
+    - sign: {"op": "sign", "player": id, "team": id, "salary": amount}
+    - create: {"op": "create", "name": name, "team": id, "salary": amount}
+
+    Teams and players are plain ids here and are looked up for the whole
+    batch at once by app.bulk_ops.apply_operations().
+    """
+    # Fields each operation requires on top of "op"
+    REQUIRED_FIELDS = {
+        'cut': ['player'],
+        'sign': ['player', 'team', 'salary'],
+        'create': ['name', 'team', 'salary'],
+    }
+
+    op = serializers.ChoiceField(choices=list(REQUIRED_FIELDS))
+    player = serializers.IntegerField(min_value=1, max_value=MAX_ID,
+                                      required=False)
+    team = serializers.IntegerField(min_value=1, max_value=MAX_ID,
+                                    required=False)
+    name = serializers.CharField(max_length=255, required=False)
+
+    # Same bounds as the sign and create forms
+    salary = serializers.IntegerField(
+        min_value=2300000, max_value=60000000, required=False)
+
+    def validate(self, data):
+        """
+        Check that the fields needed by the operation are present.
+        """
+        missing = [field for field in self.REQUIRED_FIELDS[data['op']]
+                   if field not in data]
+        if missing:
+            raise serializers.ValidationError(
+                {field: "This field is required." for field in missing})
+        return data
+
+
+class BulkRosterSerializer(serializers.Serializer):
+    """
+    Validates the envelope of a bulk roster request. The operations are
+    validated separately with BulkOperationSerializer(many=True) so that
+    best-effort mode can report errors item by item.
+    """
+    operations = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False,
+        max_length=MAX_BULK_OPERATIONS)
+    mode = serializers.ChoiceField(choices=['atomic', 'best_effort'],
+                                   default='atomic')
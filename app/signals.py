@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Team, Player
+from .cache import invalidate_teams, invalidate_all
+
+
+@receiver(post_save, sender=Player)
+@receiver(post_delete, sender=Player)
+def invalidate_player_team(sender, instance, **kwargs):
+    """
+    Drop the cached roster of the team a saved or deleted player belongs to.
+
+    Queryset.update() and bulk operations do not send signals, so those
+    write paths invalidate explicitly.
+    """
+    invalidate_teams([instance.team_id])
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def invalidate_team(sender, instance, **kwargs):
+    """
+    Team edits can change codes and names everywhere, so start afresh.
+    """
+    invalidate_all()
@@ -0,0 +1,270 @@
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+
+from .models import Team, Player
+from .trades import salary_rules
+
+# Best scenarios kept per source team when no limit is given
+DEFAULT_SCENARIO_LIMIT = 20
+
+# Snapshot shared with worker processes by _init_worker()
+_worker_snapshot = None
+
+
+class LeagueSnapshot:
+    """
+    Compact, read-only copy of every team payroll and signed player salary.
+
+    Players are stored grouped by team, like a CSR matrix: the players of
+    team index t are positions offsets[t] to offsets[t + 1] of player_ids
+    and salaries. Everything lives in typed arrays, so a full league is a
+    few hundred kilobytes and cheap to pickle to worker processes.
+    """
+
+    def __init__(self, team_ids, team_codes, payrolls, offsets, player_ids,
+                 salaries):
+        self.team_ids = team_ids
+        self.team_codes = team_codes
+        self.payrolls = payrolls
+        self.offsets = offsets
+        self.player_ids = player_ids
+        self.salaries = salaries
+
+    def __len__(self):
+        return len(self.team_ids)
+
+    def roster(self, team):
+        """
+        Return the (start, end) positions of a team index's players.
+        """
+        return self.offsets[team], self.offsets[team + 1]
+
+    def index_of(self, code):
+        """
+        Return the team index of a team code.
+
+        Raises:
+            KeyError: If no team has this code
+        """
+        try:
+            return self.team_codes.index(code)
+        except ValueError:
+            raise KeyError(code) from None
+
+
+def load_snapshot():
+    """
+    Load the league into a LeagueSnapshot with two queries.
+
+    Returns:
+        LeagueSnapshot of every team and its non-free-agent players
+    """
+    team_ids = array('q')
+    team_codes = []
+    payrolls = array('q')
+    for team_id, code, payroll in Team.objects.order_by('id').values_list(
+            'id', 'code', 'payroll'):
+        team_ids.append(team_id)
+        team_codes.append(code)
+        payrolls.append(payroll)
+
+    positions = {team_id: index for index, team_id in enumerate(team_ids)}
+    counts = [0] * len(team_ids)
+    player_ids = array('q')
+    salaries = array('q')
+    for team_id, player_id, salary in Player.objects.filter(
+            free_agent=False).order_by('team_id', 'id').values_list(
+            'team_id', 'id', 'salary'):
+        counts[positions[team_id]] += 1
+        player_ids.append(player_id)
+        salaries.append(salary)
+
+    offsets = array('q', [0])
+    for count in counts:
+        offsets.append(offsets[-1] + count)
+
+    return LeagueSnapshot(team_ids, team_codes, payrolls, offsets,
+                          player_ids, salaries)
+
+
+def pair_sums(snapshot, team):
+    """
+    Every pair of players of a team, sorted by combined salary.
+
+    Returns:
+        (sums, firsts, seconds) arrays, where sums[n] is the combined
+        salary of the players at positions firsts[n] and seconds[n]
+    """
+    start, end = snapshot.roster(team)
+    salaries = snapshot.salaries
+    pairs = sorted(
+        (salaries[i] + salaries[j], i, j)
+        for i in range(start, end) for j in range(i + 1, end))
+    return (array('q', (pair[0] for pair in pairs)),
+            array('q', (pair[1] for pair in pairs)),
+            array('q', (pair[2] for pair in pairs)))
+
+
+def two_for_one(snapshot, source, cap, limit=DEFAULT_SCENARIO_LIMIT):
+    """
+    Rank every trade where a team sends two players for one player.
+
+    Trades are kept only when both teams end at or under the cap, and are
+    ranked by salary balance, the absolute difference between the salary
+    sent and the salary received. Instead of scoring every combination,
+    the pair sums are sorted once: for each incoming player the cap turns
+    into a window of allowed pair sums found by bisection, and the search
+    walks outward from the most balanced pair until it cannot beat the
+    current top `limit`.
+
+    Args:
+        snapshot: LeagueSnapshot to read from
+        source: Index of the team sending two players
+        cap: Payroll neither team may exceed after the trade
+        limit: Number of scenarios to keep
+
+    Returns:
+        (evaluated, scenarios) where evaluated is the number of trades
+        that satisfied the cap and scenarios is the ranked list of
+        (balance, source, target, first, second, incoming) tuples, the
+        last three being player positions in the snapshot
+    """
+    sums, firsts, seconds = pair_sums(snapshot, source)
+    source_payroll = snapshot.payrolls[source]
+    salaries = snapshot.salaries
+    evaluated = 0
+
+    # Max-heap on balance, through negation, of the best scenarios so far
+    best = []
+
+    for target in range(len(snapshot)):
+        if target == source:
+            continue
+        target_payroll = snapshot.payrolls[target]
+        start, end = snapshot.roster(target)
+        for incoming in range(start, end):
+            salary = salaries[incoming]
+            # source: payroll - pair + salary <= cap
+            # target: payroll + pair - salary <= cap
+            low = bisect_left(sums, source_payroll + salary - cap)
+            high = bisect_right(sums, cap - target_payroll + salary)
+            if low >= high:
+                continue
+            evaluated += high - low
+
+            # Walk outward from the pair closest to the incoming salary
+            right = min(max(bisect_left(sums, salary), low), high)
+            left = right - 1
+            while left >= low or right < high:
+                if right >= high or (left >= low and
+                                     salary - sums[left] <= sums[right] - salary):
+                    position, left = left, left - 1
+                else:
+                    position, right = right, right + 1
+                balance = abs(sums[position] - salary)
+                # Nothing closer can make it into a full top `limit`
+                # (with a limit of 0 nothing is ever kept)
+                if len(best) >= limit and (not best
+                                           or balance >= -best[0][0]):
+                    break
+                scenario = (-balance, -position, target, incoming)
+                if len(best) < limit:
+                    heapq.heappush(best, scenario)
+                else:
+                    heapq.heappushpop(best, scenario)
+
+    scenarios = sorted(
+        (-balance, source, target, firsts[-position], seconds[-position],
+         incoming)
+        for balance, position, target, incoming in best)
+    return evaluated, scenarios
+
+
+def describe(snapshot, scenario):
+    """
+    Turn a scenario tuple into a JSON friendly dict.
+    """
+    balance, source, target, first, second, incoming = scenario
+    sent = snapshot.salaries[first] + snapshot.salaries[second]
+    received = snapshot.salaries[incoming]
+    return {
+        'teams': [snapshot.team_codes[source], snapshot.team_codes[target]],
+        'outgoing': [snapshot.player_ids[first], snapshot.player_ids[second]],
+        'incoming': [snapshot.player_ids[incoming]],
+        'balance': balance,
+        'payroll_after': [snapshot.payrolls[source] - sent + received,
+                          snapshot.payrolls[target] + sent - received],
+    }
+
+
+def _init_worker(snapshot):
+    """
+    Configure Django and keep the snapshot in each worker process, so it
+    is sent once per worker instead of once per task.
+    """
+    global _worker_snapshot
+    django.setup()
+    _worker_snapshot = snapshot
+
+
+def _run_source(task):
+    """
+    Worker entry point: rank the trades of one source team.
+    """
+    source, cap, limit = task
+    return two_for_one(_worker_snapshot, source, cap, limit)
+
+
+def simulate(snapshot, sources=None, cap=None, limit=DEFAULT_SCENARIO_LIMIT,
+             workers=0):
+    """
+    Sweep 2-for-1 trades for many source teams without touching the database.
+
+    Results are yielded per source team as soon as that team is done, so
+    callers can stream them. With workers > 0 source teams are spread over
+    a process pool and arrive in completion order.
+
+    Args:
+        snapshot: LeagueSnapshot from load_snapshot()
+        sources: Team indexes sending two players (default: every team)
+        cap: Payroll cap (default: settings.TRADE_SALARY_CAP)
+        limit: Scenarios kept per source team
+        workers: Number of worker processes, 0 to run in this process
+
+    Yields:
+        (evaluated, scenarios) as returned by two_for_one()
+    """
+    cap = salary_rules()['cap'] if cap is None else cap
+    sources = range(len(snapshot)) if sources is None else sources
+
+    if not workers:
+        for source in sources:
+            yield two_for_one(snapshot, source, cap, limit)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(snapshot,)) as executor:
+        futures = [executor.submit(_run_source, (source, cap, limit))
+                   for source in sources]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def top_scenarios(results, limit):
+    """
+    Merge per-team results from simulate() into one league-wide ranking.
+
+    Returns:
+        (evaluated, scenarios) with the `limit` best scenarios overall
+    """
+    evaluated = 0
+    scenarios = []
+    for team_evaluated, team_scenarios in results:
+        evaluated += team_evaluated
+        scenarios = heapq.nsmallest(
+            limit, heapq.merge(scenarios, team_scenarios))
+    return evaluated, scenarios
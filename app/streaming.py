@@ -0,0 +1,56 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+# Sentinel returned by next() once a chunk iterator is exhausted
+_DONE = object()
+
+
+async def iterate_in_thread(chunks):
+    """
+    Consume a synchronous chunk iterator from async code, one chunk at a
+    time.
+
+    Each next() runs in the thread-sensitive executor, the thread that
+    ran the sync view and holds its database connection, so server-side
+    cursors keep working between chunks.
+
+    Args:
+        chunks: Iterable of bytes or str
+
+    Yields:
+        The chunks of the iterator, in order
+    """
+    chunks = iter(chunks)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, _DONE)
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        # Let a generator release its cursor when the client disconnects
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def streaming_content(request, chunks):
+    """
+    Content for a StreamingHttpResponse of a sync view.
+
+    Under ASGI Django reads a synchronous iterator with
+    sync_to_async(list), which holds the whole body in memory before the
+    first byte is sent. The chunks are handed over as an async iterator
+    there instead, so the response streams as it does under WSGI.
+
+    Args:
+        request: Django or DRF request being answered
+        chunks: Iterable of bytes or str
+
+    Returns:
+        `chunks` under WSGI, an async iterator over them under ASGI
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        return iterate_in_thread(chunks)
+    return chunks
@@ -0,0 +1,369 @@
+import csv
+import math
+import random
+import string
+import unicodedata
+from collections import defaultdict
+from itertools import product
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Team, Player
+from .payroll import apply_payroll_deltas
+from .cache import invalidate_all
+from .versions import next_version
+
+# Salaries follow a log-normal distribution with a heavier upper tail,
+# roughly matching csv/players.csv (median about 6M, 10% above 25M),
+# truncated to the league minimum and maximum contracts
+SALARY_MEDIAN = 6000000
+SALARY_SIGMA_BELOW = 0.95
+SALARY_SIGMA_ABOVE = 1.5
+SALARY_MIN = 1100000
+SALARY_MAX = 55761216
+
+# Share of players generated as free agents
+DEFAULT_FREE_AGENT_RATIO = 0.1
+
+# Rows per bulk_create statement, and per transaction, in database mode
+DEFAULT_BATCH_SIZE = 5000
+
+# Largest number of players the generator is meant for
+MAX_PLAYERS = 10000000
+
+FIRST_NAMES = (
+    "Aaron", "Adrian", "Alec", "Alex", "Andre", "Andrew", "Anthony", "Austin",
+    "Ben", "Bobby", "Brandon", "Bruce", "Cade", "Caleb", "Cam", "Chris",
+    "Cole", "Collin", "Cooper", "Dalen", "Damian", "Daniel", "Darius",
+    "David", "Dean", "Dennis", "Derrick", "Devin", "Dillon", "Donovan",
+    "Dwight", "Dyson", "Elijah", "Eric", "Evan", "Franz", "Fred", "Gabe",
+    "Gary", "Gordon", "Grant", "Harrison", "Immanuel", "Isaac", "Isaiah",
+    "Ivica", "Jabari", "Jake", "Jalen", "Jamal", "James", "Jaren", "Jarrett",
+    "Jaylen", "Jeremy", "Jerami", "John", "Jonas", "Jordan", "Jose", "Josh",
+    "Jrue", "Julius", "Karl", "Keegan", "Kelly", "Kevin", "Khris", "Kyle",
+    "Lauri", "Luka", "Malik", "Marcus", "Mark", "Max", "Michael", "Mikal",
+    "Miles", "Myles", "Naz", "Nic", "Nick", "Nikola", "Norman", "Obi",
+    "Onyeka", "Pascal", "Patrick", "Paul", "Precious", "Quentin", "RJ",
+    "Reggie", "Robert", "Rudy", "Russell", "Scottie", "Shai", "Spencer",
+    "Stephen", "Terry", "Thomas", "Tim", "Trae", "Tre", "Tyler", "Tyrese",
+    "Victor", "Walker", "Wendell", "Xavier", "Zach", "Zion",
+)
+
+LAST_NAMES = (
+    "Adams", "Allen", "Anderson", "Bailey", "Baker", "Ball", "Banks",
+    "Barnes", "Bell", "Bennett", "Booker", "Bridges", "Brooks", "Brown",
+    "Brunson", "Butler", "Caldwell", "Campbell", "Carter", "Clark", "Collins",
+    "Conley", "Cook", "Cooper", "Daniels", "Davis", "Dawson", "Dixon",
+    "Dunn", "Edwards", "Ellis", "Evans", "Fields", "Fisher", "Fleming",
+    "Ford", "Fox", "Garland", "Gibson", "Gordon", "Graham", "Grant", "Green",
+    "Griffin", "Hall", "Harden", "Harris", "Hart", "Hayes", "Henderson",
+    "Hill", "Holiday", "Holmes", "Howard", "Hughes", "Hunter", "Jackson",
+    "James", "Jenkins", "Johnson", "Jones", "Jordan", "Kelly", "Kennedy",
+    "King", "Knight", "Lewis", "Lillard", "Lopez", "Lowry", "Marshall",
+    "Martin", "Mason", "Matthews", "Miller", "Mitchell", "Moore", "Morgan",
+    "Morris", "Murray", "Nelson", "Owens", "Parker", "Patterson", "Paul",
+    "Payton", "Perry", "Phillips", "Porter", "Powell", "Price", "Randle",
+    "Reed", "Reid", "Richardson", "Roberts", "Robinson", "Rose", "Ross",
+    "Russell", "Sanders", "Scott", "Simmons", "Smith", "Stewart", "Sullivan",
+    "Taylor", "Thomas", "Thompson", "Tucker", "Turner", "Walker", "Wallace",
+    "Warren", "Washington", "Watson", "White", "Wiggins", "Williams",
+    "Wilson", "Wright", "Young",
+)
+
+CITIES = (
+    "Albany", "Anchorage", "Austin", "Baltimore", "Birmingham", "Boise",
+    "Buffalo", "Cincinnati", "Columbus", "El Paso", "Fresno", "Hartford",
+    "Honolulu", "Jacksonville", "Kansas City", "Las Vegas", "Louisville",
+    "Madison", "Mexico City", "Montreal", "Nashville", "Omaha", "Pittsburgh",
+    "Raleigh", "Richmond", "St. Louis", "San Diego", "Seattle", "Tucson",
+    "Vancouver",
+)
+
+MASCOTS = (
+    "Aces", "Bison", "Comets", "Condors", "Cyclones", "Foxes", "Giants",
+    "Hawks", "Herons", "Jets", "Knights", "Lynx", "Mustangs", "Owls",
+    "Pilots", "Rangers", "Ravens", "Riders", "Sharks", "Stars", "Storm",
+    "Titans", "Vipers", "Wolves",
+)
+
+
+def roman(number):
+    """
+    Write a positive integer in Roman numerals, e.g. 4 -> 'IV'.
+    """
+    numerals = ((1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'),
+                (100, 'C'), (90, 'XC'), (50, 'L'), (40, 'XL'), (10, 'X'),
+                (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I'))
+    result = ''
+    for value, numeral in numerals:
+        count, number = divmod(number, value)
+        result += numeral * count
+    return result
+
+
+def ascii_letters(text):
+    """
+    Lowercase ASCII letters of a name, e.g. 'Jokić' -> 'jokic'.
+    """
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    return ''.join(char for char in text.lower() if char in string.ascii_lowercase)
+
+
+def player_name(index, stride, offset):
+    """
+    Build the index-th unique player name.
+
+    Every first and last name pair is used once, in an order shuffled by
+    the seed (stride and offset), before the pairs come back with a
+    middle initial, then with a generational suffix ("II", "III"...).
+
+    Args:
+        index: Position of the player in the generated stream
+        stride: Multiplier coprime with the number of pairs
+        offset: Start of the shuffled order
+
+    Returns:
+        (first name, last name, full name)
+    """
+    pairs = len(FIRST_NAMES) * len(LAST_NAMES)
+    generation, position = divmod(index, pairs)
+    first, last = divmod((position * stride + offset) % pairs, len(LAST_NAMES))
+    first, last = FIRST_NAMES[first], LAST_NAMES[last]
+    if generation == 0:
+        return first, last, f"{first} {last}"
+
+    # 26 middle initials per suffix level
+    level, initial = divmod(generation - 1, 26)
+    name = f"{first} {string.ascii_uppercase[initial]}. {last}"
+    if level:
+        name += f" {roman(level + 1)}"
+    return first, last, name
+
+
+def player_code(first, last, counters):
+    """
+    Build a unique code in the csv/players.csv style: five letters of the
+    last name, two of the first name and a counter, e.g. 'curryst01'.
+
+    Args:
+        first: First name
+        last: Last name
+        counters: dict of prefix to the last number used, updated in place
+    """
+    prefix = ascii_letters(last)[:5] + ascii_letters(first)[:2]
+    counters[prefix] += 1
+    return f"{prefix}{counters[prefix]:02d}"
+
+
+def salary(rng):
+    """
+    Draw one salary from the truncated, skewed log-normal distribution.
+    """
+    while True:
+        z = rng.gauss(0, 1)
+        sigma = SALARY_SIGMA_BELOW if z < 0 else SALARY_SIGMA_ABOVE
+        value = round(SALARY_MEDIAN * math.exp(z * sigma))
+        if SALARY_MIN <= value <= SALARY_MAX:
+            return value
+
+
+def read_csv_teams():
+    """
+    Read the real teams shipped in csv/teams.csv.
+
+    Returns:
+        List of dicts with name and code keys
+    """
+    path = settings.BASE_DIR / 'csv' / 'teams.csv'
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        return [{'name': row['Team'].strip(), 'code': row['Code'].strip()}
+                for row in csv.DictReader(csvfile)]
+
+
+def generate_teams(count):
+    """
+    Build `count` teams: the real teams of csv/teams.csv first, then
+    invented "City Mascot" teams with unused three letter codes.
+
+    Args:
+        count: Number of teams, at most 26 ** 3
+
+    Returns:
+        List of dicts with name and code keys
+    """
+    teams = read_csv_teams()[:count]
+    taken = {team['code'] for team in teams}
+    codes = (''.join(letters) for letters
+             in product(string.ascii_uppercase, repeat=3)
+             if ''.join(letters) not in taken)
+    names = (f"{city} {mascot}" for mascot, city in product(MASCOTS, CITIES))
+    for index in range(len(teams), count):
+        name = next(names, None) or f"Expansion Team {index}"
+        teams.append({'name': name, 'code': next(codes)})
+    return teams
+
+
+def generate_players(count, team_codes, seed=0,
+                     free_agent_ratio=DEFAULT_FREE_AGENT_RATIO):
+    """
+    Lazily generate a deterministic league of unique players.
+
+    The same arguments always produce the same players, and memory use
+    does not grow with `count`, so any size up to MAX_PLAYERS can be
+    streamed.
+
+    Args:
+        count: Number of players
+        team_codes: Codes of the teams players are spread over
+        seed: Random seed
+        free_agent_ratio: Share of players who are free agents
+
+    Yields:
+        dicts with name, code, team (the team code), salary and
+        free_agent keys
+    """
+    if not 0 <= count <= MAX_PLAYERS:
+        raise ValueError(f"count must be between 0 and {MAX_PLAYERS}.")
+    if not team_codes:
+        raise ValueError("At least one team is required.")
+
+    rng = random.Random(seed)
+    pairs = len(FIRST_NAMES) * len(LAST_NAMES)
+    # Any stride coprime with the number of pairs visits every pair once
+    stride = rng.randrange(1, pairs)
+    while math.gcd(stride, pairs) != 1:
+        stride += 1
+    offset = rng.randrange(pairs)
+    counters = defaultdict(int)
+
+    for index in range(count):
+        first, last, name = player_name(index, stride, offset)
+        yield {
+            'name': name,
+            'code': player_code(first, last, counters),
+            'team': team_codes[rng.randrange(len(team_codes))],
+            'salary': salary(rng),
+            'free_agent': rng.random() < free_agent_ratio,
+        }
+
+
+def write_csv(players_path, teams_path, count, teams=30, seed=0):
+    """
+    Stream a generated league to CSV files in the csv/ layout.
+
+    Players are written as they are generated, then the teams with their
+    payroll. The players.csv layout has no free agent column (the
+    importer signs every player), so every player is signed here and
+    counts toward payroll.
+
+    Args:
+        players_path: Output path for Player,Team,salary,unique-code rows
+        teams_path: Output path for Team,Code,Payroll rows
+        count: Number of players
+        teams: Number of teams
+        seed: Random seed
+
+    Returns:
+        dict of teams and players counts
+    """
+    team_rows = generate_teams(teams)
+    payrolls = defaultdict(int)
+    with open(players_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Player', 'Team', 'salary', 'unique-code'])
+        for player in generate_players(
+                count, [team['code'] for team in team_rows], seed,
+                free_agent_ratio=0):
+            writer.writerow([player['name'], player['team'],
+                             player['salary'], player['code']])
+            payrolls[player['team']] += player['salary']
+
+    with open(teams_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Team', 'Code', 'Payroll'])
+        for team in team_rows:
+            writer.writerow([team['name'], team['code'], payrolls[team['code']]])
+    return {'teams': len(team_rows), 'players': count}
+
+
+def write_database(count, teams=30, seed=0,
+                   free_agent_ratio=DEFAULT_FREE_AGENT_RATIO,
+                   batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Bulk insert a generated league into the database.
+
+    Teams are created (or reused by code), players are inserted with
+    bulk_create in transactions of `batch_size` rows, and the team
+    payrolls are then raised by the salaries of their signed players in
+    one statement. The new teams, the players and the payroll updates
+    all share one change version.
+
+    Args:
+        count: Number of players
+        teams: Number of teams to generate, or a list of dicts with name
+            and code keys
+        seed: Random seed
+        free_agent_ratio: Share of players who are free agents
+        batch_size: Rows per bulk insert and transaction
+        progress: Optional callable receiving the number of players
+            written after every batch
+
+    Returns:
+        dict of teams, players and free_agents counts
+
+    Raises:
+        ValueError: If the database already holds players, whose names
+            could clash with the generated ones
+    """
+    if Player.objects.exists():
+        raise ValueError("Players already exist; generate into an empty "
+                         "database or write CSV files and import them.")
+    team_rows = generate_teams(teams) if isinstance(teams, int) else teams
+
+    with transaction.atomic():
+        existing = set(Team.objects.filter(
+            code__in=[team['code'] for team in team_rows]
+        ).values_list('code', flat=True))
+        version = next_version()
+        Team.objects.bulk_create(
+            [Team(name=team['name'], code=team['code'], payroll=0,
+                  version=version)
+             for team in team_rows if team['code'] not in existing],
+            batch_size=batch_size)
+        team_ids = dict(Team.objects.filter(
+            code__in=[team['code'] for team in team_rows]
+        ).values_list('code', 'id'))
+
+    deltas = defaultdict(int)
+    stats = {'teams': len(team_rows), 'players': 0, 'free_agents': 0}
+
+    def flush(batch):
+        with transaction.atomic():
+            Player.objects.bulk_create(batch)
+        stats['players'] += len(batch)
+        if progress:
+            progress(stats['players'])
+
+    batch = []
+    for player in generate_players(count, list(team_ids), seed,
+                                   free_agent_ratio):
+        team_id = team_ids[player['team']]
+        batch.append(Player(name=player['name'], code=player['code'],
+                            team_id=team_id, salary=player['salary'],
+                            free_agent=player['free_agent'], version=version))
+        if player['free_agent']:
+            stats['free_agents'] += 1
+        else:
+            deltas[team_id] += player['salary']
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    with transaction.atomic():
+        apply_payroll_deltas(deltas, version)
+    # Bulk inserts send no signals, and free agent lists changed too
+    invalidate_all()
+    return stats
@@ -0,0 +1,68 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from ..models import Team, Player
+
+
+class AsyncViewTests(TestCase):
+    """
+    Unit tests for the async versions of the read endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams with signed players and free agents.
+        """
+        self.gsw = Team.objects.create(name="Warriors", code="GSW", payroll=55000000)
+        self.lal = Team.objects.create(name="Lakers", code="LAL", payroll=48000000)
+        Player.objects.create(name="Stephen Curry", team=self.gsw,
+                              salary=55000000, free_agent=False)
+        Player.objects.create(name="LeBron James", team=self.lal,
+                              salary=48000000, free_agent=False)
+        Player.objects.create(name="Free Agent", team=self.lal,
+                              salary=2300000, free_agent=True)
+        self.client = APIClient()
+
+    async def assertSameResponse(self, sync_url, async_url, params=None):
+        """
+        Assert that the async endpoint answers exactly like the sync one.
+        """
+        sync_response = await self.async_client.get(sync_url, params or {})
+        async_response = await self.async_client.get(async_url, params or {})
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response['Content-Type'], 'application/json')
+        self.assertEqual(async_response.content, sync_response.content)
+
+    async def test_team_list(self):
+        """
+        Test the async team list.
+        """
+        await self.assertSameResponse(reverse('teams'), reverse('async-teams'))
+
+    async def test_free_agents(self):
+        """
+        Test the async free agent list, with and without nested teams.
+        """
+        for params in ({}, {'expand': 'team'}):
+            with self.subTest(params=params):
+                await self.assertSameResponse(
+                    reverse('all-free-agents'), reverse('async-free-agents'),
+                    params)
+
+    async def test_single_team(self):
+        """
+        Test the async team roster, with and without nested teams.
+        """
+        for params in ({}, {'expand': 'team'}):
+            with self.subTest(params=params):
+                await self.assertSameResponse(
+                    reverse('team-players', args=['GSW']),
+                    reverse('async-team-players', args=['GSW']), params)
+
+    async def test_single_team_not_found(self):
+        """
+        Test that an unknown team code returns 404.
+        """
+        await self.assertSameResponse(
+            reverse('team-players', args=['XYZ']),
+            reverse('async-team-players', args=['XYZ']))
@@ -0,0 +1,156 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Team, Player
+
+
+class BulkRosterTests(TestCase):
+    """
+    Unit tests for the bulk cut / sign / create endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams, a signed player and a free agent.
+        """
+        self.gsw = Team.objects.create(name="Warriors", code="GSW", payroll=50000000)
+        self.lal = Team.objects.create(name="Lakers", code="LAL", payroll=0)
+        self.curry = Player.objects.create(name="Stephen Curry", team=self.gsw,
+                                           salary=50000000, free_agent=False)
+        self.free = Player.objects.create(name="Free Agent", team=self.gsw,
+                                          salary=3000000, free_agent=True)
+        self.client = APIClient()
+
+    def bulk(self, operations, mode='atomic'):
+        """
+        Post a batch of operations.
+        """
+        return self.client.post(reverse('bulk-players'), {
+            'mode': mode, 'operations': operations}, format='json')
+
+    def payrolls(self):
+        """
+        Current payroll of every team by code.
+        """
+        return dict(Team.objects.values_list('code', 'payroll'))
+
+    def test_mixed_batch(self):
+        """
+        Test a batch cutting, signing and creating players at once.
+        """
+        response = self.bulk([
+            {'op': 'cut', 'player': self.curry.id},
+            {'op': 'sign', 'player': self.free.id, 'team': self.lal.id,
+             'salary': 4000000},
+            {'op': 'create', 'name': "Rookie", 'team': self.gsw.id,
+             'salary': 2300000},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['applied'])
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         ["ok", "ok", "ok"])
+        self.assertTrue(response.data['results'][2]['player']['id'])
+
+        self.curry.refresh_from_db()
+        self.free.refresh_from_db()
+        self.assertTrue(self.curry.free_agent)
+        self.assertEqual((self.free.team, self.free.salary, self.free.free_agent),
+                         (self.lal, 4000000, False))
+        self.assertTrue(Player.objects.filter(name="Rookie").exists())
+        self.assertEqual(self.payrolls(), {'GSW': 2300000, 'LAL': 4000000})
+
+    def test_atomic_failure_changes_nothing(self):
+        """
+        Test that one failing operation cancels an atomic batch.
+        """
+        response = self.bulk([
+            {'op': 'cut', 'player': self.curry.id},
+            {'op': 'create', 'name': "Stephen Curry", 'team': self.gsw.id,
+             'salary': 2300000},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data['applied'])
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         ["skipped", "error"])
+
+        self.curry.refresh_from_db()
+        self.assertFalse(self.curry.free_agent)
+        self.assertEqual(self.payrolls()['GSW'], 50000000)
+
+    def test_best_effort_applies_valid_operations(self):
+        """
+        Test that best-effort mode reports failures and applies the rest.
+        """
+        response = self.bulk([
+            {'op': 'cut', 'player': self.curry.id},
+            {'op': 'sign', 'player': self.free.id, 'team': 999,
+             'salary': 4000000},
+            {'op': 'create', 'name': "Cheap", 'team': self.lal.id,
+             'salary': 1},
+            {'op': 'trade'},
+        ], mode='best_effort')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['applied'])
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         ["ok", "error", "error", "error"])
+        self.assertIn('salary', response.data['results'][2]['errors'])
+        self.assertEqual(self.payrolls(), {'GSW': 0, 'LAL': 0})
+
+    def test_duplicate_players_and_names(self):
+        """
+        Test that a player or a new name can only appear once per batch.
+        """
+        response = self.bulk([
+            {'op': 'cut', 'player': self.curry.id},
+            {'op': 'sign', 'player': self.curry.id, 'team': self.lal.id,
+             'salary': 4000000},
+            {'op': 'create', 'name': "Twin", 'team': self.lal.id,
+             'salary': 2300000},
+            {'op': 'create', 'name': "Twin", 'team': self.lal.id,
+             'salary': 2300000},
+        ], mode='best_effort')
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         ["ok", "error", "ok", "error"])
+        self.assertEqual(self.payrolls(), {'GSW': 0, 'LAL': 2300000})
+
+    def test_missing_fields(self):
+        """
+        Test that each operation requires its own fields.
+        """
+        response = self.bulk([{'op': 'sign', 'player': self.free.id}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['results'][0]['errors']
+        self.assertEqual(set(errors), {'team', 'salary'})
+
+        response = self.bulk([])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ids_out_of_range(self):
+        """
+        Test that ids too large for the database are rejected, not sent
+        to it.
+        """
+        for operation in ({'op': 'cut', 'player': 10 ** 30},
+                          {'op': 'sign', 'player': self.free.id,
+                           'team': 10 ** 30, 'salary': 3000000}):
+            with self.subTest(operation=operation):
+                response = self.bulk([operation])
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.payrolls()['GSW'], 50000000)
+
+    def test_bulk_invalidates_rosters(self):
+        """
+        Test that cached rosters and free agents reflect the batch.
+        """
+        roster_url = reverse('team-players', args=[self.gsw.code])
+        self.client.get(roster_url)
+        self.client.get(reverse('all-free-agents'))
+
+        self.bulk([{'op': 'cut', 'player': self.curry.id}])
+
+        response = self.client.get(roster_url)
+        self.assertEqual(response.data['players'], [])
+        response = self.client.get(reverse('all-free-agents'))
+        self.assertEqual(len(response.data), 2)
@@ -0,0 +1,104 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Team, Player
+from ..cache import get_cache, cache_stats, reset_cache_stats
+from rest_framework import status
+
+
+class RosterCacheTests(TestCase):
+    """
+    Unit tests for the read-through roster cache and its invalidation.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams, a signed player and a free agent.
+        """
+        get_cache().clear()
+        reset_cache_stats()
+
+        self.team = Team.objects.create(
+            name="Team A", code="TMA", payroll=50000)
+        self.other_team = Team.objects.create(
+            name="Team B", code="TMB", payroll=0)
+        self.player = Player.objects.create(
+            name="Player One", team=self.team, salary=50000)
+        self.free_agent = Player.objects.create(
+            name="Free Agent", team=self.other_team, salary=40000,
+            free_agent=True)
+        self.client = APIClient()
+
+    def test_repeat_requests_hit_cache(self):
+        """
+        Test that a second identical request is served without queries.
+        """
+        for url in (reverse('teams'), reverse('teams-html'),
+                    reverse('all-free-agents'), '/free-agents',
+                    reverse('team-players', args=['TMA']),
+                    reverse('teams-html-players', args=['TMA'])):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    def test_cut_invalidates_affected_keys(self):
+        """
+        Test that cutting a player refreshes the roster, team list and
+        free agent list, but not another team's roster.
+        """
+        roster_url = reverse('team-players', args=['TMA'])
+        other_url = reverse('team-players', args=['TMB'])
+        for url in (roster_url, other_url, reverse('teams'),
+                    reverse('all-free-agents')):
+            self.client.get(url)
+
+        self.client.patch(reverse('players', args=[self.player.id]),
+                          {'free_agent': "True"}, format='json')
+
+        self.assertEqual(self.client.get(roster_url).data['players'], [])
+        self.assertEqual(
+            len(self.client.get(reverse('all-free-agents')).data), 2)
+        payrolls = {team['code']: team['payroll']
+                    for team in self.client.get(reverse('teams')).data}
+        self.assertEqual(payrolls['TMA'], 0)
+
+        # The untouched team is still served from the cache
+        with self.assertNumQueries(0):
+            self.client.get(other_url)
+
+    def test_sign_invalidates_new_team(self):
+        """
+        Test that signing a free agent refreshes the signing team's roster.
+        """
+        url = reverse('team-players', args=['TMA'])
+        self.assertEqual(len(self.client.get(url).data['players']), 1)
+
+        self.client.post(reverse('sign-player', args=[self.free_agent.id]),
+                         {'team': self.team.id, 'salary': 2300000})
+        self.assertEqual(len(self.client.get(url).data['players']), 2)
+
+    def test_parameterised_requests_bypass_cache(self):
+        """
+        Test that filtered requests are not answered from the cache.
+        """
+        url = reverse('all-free-agents')
+        self.client.get(url)
+        response = self.client.get(url, {'min_salary': 45000})
+        self.assertEqual(response.data, [])
+
+    def test_stats_endpoint(self):
+        """
+        Test that hits and misses are counted and exposed.
+        """
+        url = reverse('teams')
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(url)
+
+        response = self.client.get(reverse('cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['misses'], 1)
+        self.assertEqual(response.data['hits'], 2)
+        self.assertAlmostEqual(cache_stats()['hit_rate'], 2 / 3)
@@ -0,0 +1,165 @@
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Team, Player
+from ..versions import next_version, current_version
+
+
+class ChangesTests(TestCase):
+    """
+    Unit tests for change versions and the /api/changes feed.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams with one signed player each and a free agent.
+        """
+        self.gsw = Team.objects.create(name="Warriors", code="GSW", payroll=50000000)
+        self.lal = Team.objects.create(name="Lakers", code="LAL", payroll=45000000)
+        self.curry = Player.objects.create(name="Stephen Curry", team=self.gsw,
+                                           salary=50000000, free_agent=False)
+        self.james = Player.objects.create(name="LeBron James", team=self.lal,
+                                           salary=45000000, free_agent=False)
+        self.free = Player.objects.create(name="Free Agent", team=self.lal,
+                                          salary=1000000, free_agent=True)
+        self.client = APIClient()
+
+    def changes(self, **params):
+        """
+        Fetch the change feed and return the decoded response.
+        """
+        response = self.client.get(reverse('changes'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_full_sync(self):
+        """
+        Without ?since= every team and player is returned.
+        """
+        data = self.changes()
+        self.assertEqual(data['version'], current_version())
+        self.assertEqual({team['code'] for team in data['teams']}, {'GSW', 'LAL'})
+        self.assertEqual(len(data['players']), 3)
+        self.assertIsNone(data['next'])
+
+    def test_cut_stamps_player_and_team(self):
+        """
+        Cutting a player stamps a new version on the player and its team,
+        and only those rows are returned for the previous version.
+        """
+        since = self.changes()['version']
+        self.client.patch(reverse('players', args=[self.curry.id]),
+                          {'free_agent': "True"}, format='json')
+
+        data = self.changes(since=since)
+        self.assertEqual(data['version'], since + 1)
+        self.assertEqual([player['id'] for player in data['players']], [self.curry.id])
+        self.assertEqual(data['players'][0]['version'], since + 1)
+        self.assertEqual([team['code'] for team in data['teams']], ['GSW'])
+
+        # Nothing changed after the new version
+        data = self.changes(since=data['version'])
+        self.assertEqual((data['teams'], data['players']), ([], []))
+
+    def test_sign_and_create(self):
+        """
+        Signing and creating players get one version each.
+        """
+        since = current_version()
+        self.client.post(reverse('sign-player', args=[self.free.id]),
+                         {'team': self.gsw.id, 'salary': 2300000})
+        self.client.post(reverse('create-player'), {
+            'name': "New Player", 'team': self.lal.id, 'salary': 2300000})
+
+        data = self.changes(since=since)
+        self.assertEqual([(player['name'], player['version']) for player in data['players']],
+                         [("Free Agent", since + 1), ("New Player", since + 2)])
+        self.assertEqual([(team['code'], team['version']) for team in data['teams']],
+                         [('GSW', since + 1), ('LAL', since + 2)])
+
+    def test_trade_and_bulk_share_a_version(self):
+        """
+        Every row written by one trade or bulk request carries the same
+        version.
+        """
+        since = current_version()
+        self.client.post(reverse('trades'), {'moves': [
+            {'player': self.curry.id, 'team': 'LAL'},
+            {'player': self.james.id, 'team': 'GSW'},
+        ]}, format='json')
+        data = self.changes(since=since)
+        self.assertEqual({player['version'] for player in data['players']}, {since + 1})
+        self.assertEqual({team['version'] for team in data['teams']}, {since + 1})
+        self.assertEqual(len(data['players']), 2)
+
+        self.client.post(reverse('bulk-players'), {'operations': [
+            {'op': 'cut', 'player': self.curry.id},
+            {'op': 'create', 'name': "Bulk Player", 'team': self.gsw.id,
+             'salary': 2300000},
+        ]}, format='json')
+        data = self.changes(since=since + 1)
+        self.assertEqual({player['name'] for player in data['players']},
+                         {"Stephen Curry", "Bulk Player"})
+        self.assertEqual({player['version'] for player in data['players']}, {since + 2})
+
+    def test_pagination(self):
+        """
+        Players are paginated by (version, id) and teams only come with the
+        last page.
+        """
+        first = self.changes(page_size=2)
+        self.assertEqual(len(first['players']), 2)
+        self.assertEqual(first['teams'], [])
+        self.assertIsNotNone(first['next'])
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['teams']), 2)
+        self.assertEqual(len(second['players']), 1)
+        self.assertIsNone(second['next'])
+        self.assertEqual(
+            {player['id'] for player in first['players'] + second['players']},
+            {self.curry.id, self.james.id, self.free.id})
+
+    def test_team_changed_while_paging(self):
+        """
+        A team changed between the first and the last page is sent with
+        the last page, so the next sync does not miss it.
+        """
+        first = self.changes(page_size=2)
+        self.client.patch(reverse('players', args=[self.james.id]),
+                          {'free_agent': "True"}, format='json')
+
+        page = self.client.get(first['next']).json()
+        while page['next']:
+            page = self.client.get(page['next']).json()
+        self.assertEqual(page['version'], current_version())
+        lal = next(team for team in page['teams'] if team['code'] == 'LAL')
+        self.assertEqual(lal['version'], page['version'])
+
+    def test_invalid_since(self):
+        """
+        A negative, non-numeric or out of range ?since= is rejected.
+        """
+        for since in (-1, 'abc', 10 ** 30):
+            response = self.client.get(reverse('changes'), {'since': since})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class NextVersionTests(TransactionTestCase):
+    """
+    Unit tests for reserving change versions outside a test transaction.
+    """
+
+    def test_next_version_requires_transaction(self):
+        """
+        Versions can only be reserved inside a transaction, and increase
+        by one every time.
+        """
+        with self.assertRaises(transaction.TransactionManagementError):
+            next_version()
+        with transaction.atomic():
+            first = next_version()
+            self.assertEqual(next_version(), first + 1)
+        self.assertEqual(current_version(), first + 1)
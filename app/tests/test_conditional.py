@@ -0,0 +1,118 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils.http import http_date
+from ..models import Team, Player
+from ..cache import get_cache
+from rest_framework import status
+
+
+class ConditionalGetTests(TestCase):
+    """
+    Unit tests for ETag handling on the read endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams with one player each.
+        """
+        get_cache().clear()
+        self.team = Team.objects.create(
+            name="Team A", code="TMA", payroll=50000)
+        self.other_team = Team.objects.create(
+            name="Team B", code="TMB", payroll=30000)
+        self.player = Player.objects.create(
+            name="Player One", team=self.team, salary=50000)
+        Player.objects.create(name="Player Two", team=self.other_team,
+                              salary=30000)
+        self.client = APIClient()
+
+    def test_not_modified_without_queries(self):
+        """
+        Test that a matching If-None-Match returns 304 with no queries.
+        """
+        for url in (reverse('teams'), reverse('all-free-agents'),
+                    reverse('team-players', args=['TMA'])):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn('ETag', response.headers)
+
+                with self.assertNumQueries(0):
+                    response = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=response.headers['ETag'])
+                self.assertEqual(response.status_code,
+                                 status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response.content, b'')
+
+    def test_write_in_same_second(self):
+        """
+        Test that a write right after a response is never hidden by a 304,
+        even when a client also sends If-Modified-Since for that second.
+        """
+        url = reverse('teams')
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response.headers)
+        etag = response.headers['ETag']
+
+        self.client.patch(reverse('players', args=[self.player.id]),
+                          {'free_agent': "True"}, format='json')
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.data[0]['payroll'], 0)
+
+    def test_write_changes_etag(self):
+        """
+        Test that a cut changes the validators of the affected views only.
+        """
+        roster_url = reverse('team-players', args=['TMA'])
+        other_url = reverse('team-players', args=['TMB'])
+        roster_etag = self.client.get(roster_url).headers['ETag']
+        other_etag = self.client.get(other_url).headers['ETag']
+        teams_etag = self.client.get(reverse('teams')).headers['ETag']
+
+        self.client.patch(reverse('players', args=[self.player.id]),
+                          {'free_agent': "True"}, format='json')
+
+        response = self.client.get(roster_url, HTTP_IF_NONE_MATCH=roster_etag)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['players'], [])
+
+        response = self.client.get(reverse('teams'),
+                                   HTTP_IF_NONE_MATCH=teams_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(other_url, HTTP_IF_NONE_MATCH=other_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_query_parameters_change_etag(self):
+        """
+        Test that different query strings get different validators.
+        """
+        url = reverse('all-free-agents')
+        plain = self.client.get(url).headers['ETag']
+        filtered = self.client.get(url, {'min_salary': 1}).headers['ETag']
+        self.assertNotEqual(plain, filtered)
+
+    def test_unknown_team_has_no_validators(self):
+        """
+        Test that a 404 carries no ETag.
+        """
+        response = self.client.get(reverse('team-players', args=['XXX']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response.headers)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def test_cache_disabled(self):
+        """
+        Test that a backend storing nothing only disables 304 responses.
+        """
+        url = reverse('teams')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,223 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from .. import events
+from ..events import EventBroker
+from ..models import Team, Player
+
+
+async def read_chunks(response, count):
+    """
+    Read `count` chunks of a streaming response, then close it.
+    """
+    stream = aiter(response.streaming_content)
+    chunks = [await anext(stream) for _ in range(count)]
+    await stream.aclose()
+    return chunks
+
+
+class EventBrokerTests(TestCase):
+    """
+    Unit tests for the in-process event fan-out and replay buffer.
+    """
+
+    def test_fan_out(self):
+        """
+        One published event reaches every subscriber, encoded once.
+        """
+        broker = EventBroker(buffer_size=10, queue_size=10)
+
+        async def run():
+            first, _ = broker.subscribe()
+            second, _ = broker.subscribe()
+            broker.publish(1, 'cut', {'version': 1})
+            return await first.queue.get(), await second.queue.get()
+
+        first, second = async_to_sync(run)()
+        self.assertIs(first, second)
+        self.assertEqual(first.encoded,
+                         b'id: 1\nevent: cut\ndata: {"version": 1}\n\n')
+
+    def test_replay(self):
+        """
+        Subscribing with a last event id replays the buffered events after
+        it, or returns None once some of them were evicted.
+        """
+        broker = EventBroker(buffer_size=3, queue_size=10)
+        for event_id in range(1, 6):
+            broker.publish(event_id, 'sign', {})
+
+        async def run(last_id):
+            subscriber, replay = broker.subscribe(last_id)
+            broker.unsubscribe(subscriber)
+            return replay
+
+        self.assertEqual([event.id for event in async_to_sync(run)(3)], [4, 5])
+        self.assertEqual(async_to_sync(run)(5), [])
+        self.assertEqual(async_to_sync(run)(None), [])
+        self.assertIsNone(async_to_sync(run)(1))
+
+    def test_out_of_order_publish(self):
+        """
+        An event published after a higher id is replayed to a client that
+        saw the higher id, and reaches live subscribers in publish order.
+        """
+        broker = EventBroker(buffer_size=10, queue_size=10)
+
+        async def run():
+            live, _ = broker.subscribe()
+            for event_id in (4, 6, 5):
+                broker.publish(event_id, 'cut', {})
+            replays = {}
+            for last_id in (6, 4, 3):
+                subscriber, replay = broker.subscribe(last_id)
+                broker.unsubscribe(subscriber)
+                replays[last_id] = [event.id for event in replay]
+            received = [(await live.queue.get()).id for _ in range(3)]
+            return replays, received
+
+        replays, received = async_to_sync(run)()
+        self.assertEqual(replays, {6: [5], 4: [6, 5], 3: [4, 6, 5]})
+        self.assertEqual(received, [4, 6, 5])
+
+    def test_slow_subscriber_is_dropped(self):
+        """
+        A subscriber whose queue overflows gets a None item to disconnect.
+        """
+        broker = EventBroker(buffer_size=10, queue_size=2)
+
+        async def run():
+            subscriber, _ = broker.subscribe()
+            for event_id in range(1, 4):
+                broker.publish(event_id, 'cut', {})
+            # Let the loop run the deliveries
+            for _ in range(3):
+                await events.asyncio.sleep(0)
+            return [subscriber.queue.get_nowait()
+                    for _ in range(subscriber.queue.qsize())]
+
+        self.assertEqual(async_to_sync(run)(), [None])
+
+
+class EventStreamTests(TestCase):
+    """
+    Unit tests for /api/events and the events published by the writers.
+    """
+
+    def setUp(self):
+        """
+        Give every test a fresh broker, two teams and players.
+        """
+        patcher = mock.patch.object(events, '_broker', EventBroker(
+            buffer_size=10, queue_size=10))
+        self.broker = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.gsw = Team.objects.create(name="Warriors", code="GSW", payroll=50000000)
+        self.lal = Team.objects.create(name="Lakers", code="LAL", payroll=0)
+        self.curry = Player.objects.create(name="Stephen Curry", team=self.gsw,
+                                           salary=50000000, free_agent=False)
+        self.client = APIClient()
+
+    def test_replay_from_last_event_id(self):
+        """
+        The stream sends the retry delay, then the events after
+        Last-Event-ID.
+        """
+        for event_id in (1, 2, 3):
+            self.broker.publish(event_id, 'cut', {'version': event_id})
+
+        response = async_to_sync(AsyncClient().get)(
+            reverse('events'), headers={'Last-Event-ID': '1'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = async_to_sync(read_chunks)(response, 3)
+        self.assertTrue(chunks[0].startswith(b'retry: '))
+        self.assertTrue(chunks[1].startswith(b'id: 2\n'))
+        self.assertTrue(chunks[2].startswith(b'id: 3\n'))
+        # The closed stream unsubscribed
+        self.assertEqual(self.broker.subscribers, set())
+
+    def test_late_event_after_reconnect(self):
+        """
+        A client reconnecting after a higher id still gets an event with
+        a lower id published after it, from the replay and live.
+        """
+        self.broker.publish(6, 'cut', {'version': 6})
+        self.broker.publish(5, 'cut', {'version': 5})
+
+        async def run():
+            response = await AsyncClient().get(
+                reverse('events'), headers={'Last-Event-ID': '6'})
+            stream = aiter(response.streaming_content)
+            chunks = [await anext(stream) for _ in range(2)]
+            self.broker.publish(4, 'cut', {'version': 4})
+            chunks.append(await anext(stream))
+            await stream.aclose()
+            return chunks
+
+        chunks = async_to_sync(run)()
+        self.assertTrue(chunks[1].startswith(b'id: 5\n'))
+        self.assertTrue(chunks[2].startswith(b'id: 4\n'))
+
+    def test_reset_when_too_far_behind(self):
+        """
+        A client behind the replay buffer is told to resync.
+        """
+        for event_id in range(1, 21):
+            self.broker.publish(event_id, 'cut', {})
+
+        response = async_to_sync(AsyncClient().get)(
+            reverse('events'), {'last_event_id': 2})
+        chunks = async_to_sync(read_chunks)(response, 2)
+        self.assertEqual(chunks[1], b'event: reset\ndata: {"since": 2}\n\n')
+
+    def test_cut_publishes_on_commit(self):
+        """
+        Cutting a player publishes one event, carrying the player and the
+        payroll change, after the transaction commits.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('players', args=[self.curry.id]),
+                              {'free_agent': "True"}, format='json')
+
+        [event] = self.broker.buffer
+        self.curry.refresh_from_db()
+        self.assertEqual((event.id, event.type), (self.curry.version, 'cut'))
+        self.assertEqual(event.data['players'], [{
+            'id': self.curry.id, 'name': "Stephen Curry", 'code': None,
+            'team': self.gsw.id, 'salary': 50000000, 'free_agent': True,
+            'version': self.curry.version,
+        }])
+        self.assertEqual(event.data['payroll_changes'], {str(self.gsw.id): -50000000})
+        self.assertEqual(json.loads(event.encoded.split(b'data: ')[1]), event.data)
+
+    def test_trade_and_bulk_publish(self):
+        """
+        Trades and bulk operations publish one event per request.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('trades'), {'moves': [
+                {'player': self.curry.id, 'team': 'LAL'}]}, format='json')
+            self.client.post(reverse('bulk-players'), {'operations': [
+                {'op': 'create', 'name': "Bulk Player", 'team': self.gsw.id,
+                 'salary': 2300000},
+            ]}, format='json')
+
+        self.assertEqual([event.type for event in self.broker.buffer],
+                         ['trade', 'bulk'])
+        self.assertEqual(self.broker.buffer[1].data['players'][0]['name'], "Bulk Player")
+
+    def test_rolled_back_write_publishes_nothing(self):
+        """
+        A rejected atomic batch publishes no event.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('bulk-players'), {'operations': [
+                {'op': 'cut', 'player': self.curry.id},
+                {'op': 'cut', 'player': 999999},
+            ]}, format='json')
+        self.assertEqual(len(self.broker.buffer), 0)
@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from ..models import Team, Player
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ExportTests(TestCase):
+    """
+    Unit tests for the streaming export endpoint and command.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams, three players and the test client. The chunk
+        size of 2 makes every export span several chunks.
+        """
+        self.gsw = Team.objects.create(name="Warriors", code="GSW",
+                                       payroll=55761216, version=1)
+        self.lal = Team.objects.create(name="Lakers", code="LAL", payroll=0)
+        self.curry = Player.objects.create(
+            name="Stephen Curry", code='curryst01', team=self.gsw,
+            salary=55761216, version=1)
+        Player.objects.create(name="Klay Thompson", code='thompkl01',
+                              team=self.gsw, salary=2300000, free_agent=True)
+        Player.objects.create(name="New Player", team=self.lal, salary=0)
+        self.client = APIClient()
+
+    def download(self, table, export_format):
+        """
+        GET an export and return the response and its decoded body.
+        """
+        response = self.client.get(reverse('export', args=[table, export_format]))
+        return response, b''.join(response.streaming_content).decode()
+
+    def records(self):
+        """
+        Expected NDJSON records of the players.
+        """
+        return [dict(row) for row in Player.objects.order_by('id').values(
+            'id', 'name', 'code', 'team', 'salary', 'free_agent', 'version')]
+
+    def test_csv_import_layout(self):
+        """
+        Test that the players CSV uses the import layout and imports back
+        into the same players.
+        """
+        response, body = self.download('players', 'csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'],
+                         'attachment; filename="players.csv"')
+        self.assertEqual(body.splitlines(), [
+            "Player,Team,salary,unique-code,free_agent",
+            "Stephen Curry,GSW,55761216,curryst01,False",
+            "Klay Thompson,GSW,2300000,thompkl01,True",
+            "New Player,LAL,0,,False",
+        ])
+
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'players.csv')
+        with open(path, 'w', encoding='utf-8') as csvfile:
+            csvfile.write(body)
+        out = StringIO()
+        call_command('import_roster', path, stdout=out)
+        self.assertIn("0 created, 0 updated, 3 unchanged", out.getvalue())
+
+    def test_ndjson(self):
+        """
+        Test that NDJSON has one API-shaped object per row, plus the version.
+        """
+        response, body = self.download('players', 'ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([json.loads(line) for line in body.splitlines()],
+                         self.records())
+
+    def test_columnar(self):
+        """
+        Test that columnar output has a header and row groups of column
+        arrays holding the same rows as NDJSON.
+        """
+        _, body = self.download('players', 'columnar')
+        header, *groups = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(header['table'], 'players')
+        self.assertEqual([group['rows'] for group in groups], [2, 1])
+
+        rows = [dict(zip(header['fields'], values)) for group in groups
+                for values in zip(*group['columns'])]
+        self.assertEqual(rows, self.records())
+
+    async def test_asgi_streams_chunks(self):
+        """
+        Test that under ASGI the export is an async iterator yielding one
+        chunk at a time, so Django does not read it into a list first.
+        """
+        response = await self.async_client.get(
+            reverse('export', args=['players', 'ndjson']))
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 2)
+
+        _, body = await sync_to_async(self.download)('players', 'ndjson')
+        self.assertEqual(b''.join(chunks).decode(), body)
+
+    def test_teams_and_version(self):
+        """
+        Test the teams CSV and that the change version is reported.
+        """
+        response, body = self.download('teams', 'csv')
+        self.assertEqual(body, "Team,Code,Payroll\n"
+                               "Warriors,GSW,55761216\nLakers,LAL,0\n")
+        self.assertEqual(response['X-Change-Version'], '0')
+
+    def test_unknown_export(self):
+        """
+        Test that unknown tables and formats are not found.
+        """
+        for table, export_format in (('coaches', 'csv'), ('players', 'xml')):
+            response = self.client.get(
+                reverse('export', args=[table, export_format]))
+            self.assertEqual(response.status_code, 404)
+
+    def test_export_league_command(self):
+        """
+        Test that the command writes the same bytes as the endpoint.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'players.ndjson')
+        out = StringIO()
+        call_command('export_league', 'players', '--format', 'ndjson',
+                     '--output', path, stdout=out)
+
+        with open(path, encoding='utf-8') as exported:
+            self.assertEqual(exported.read(), self.download('players', 'ndjson')[1])
+        self.assertIn("Exported players", out.getvalue())
+
+        out = StringIO()
+        call_command('export_league', 'teams', stdout=out)
+        self.assertTrue(out.getvalue().startswith("Team,Code,Payroll\n"))
@@ -0,0 +1,91 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from ..cache import get_cache
+from ..models import Team, Player
+from ..renderers import FastJSONRenderer
+
+
+class FastSerializationTests(TestCase):
+    """
+    Unit tests checking that the .values() path and the fast renderer
+    produce exactly the same responses as the ModelSerializers.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams with signed players and free agents, including
+        names outside ASCII.
+        """
+        gsw = Team.objects.create(name="Warriors", code="GSW", payroll=55000000)
+        den = Team.objects.create(name="Nuggets", code="DEN", payroll=51000000)
+        Player.objects.create(name="Stephen Curry", team=gsw,
+                              salary=55000000, free_agent=False)
+        Player.objects.create(name="Nikola Jokić", team=den,
+                              salary=51000000, free_agent=False)
+        Player.objects.create(name="Luka Dončić \"Wonder\"", team=den,
+                              salary=2300000, free_agent=True)
+        Player.objects.create(name="Free Agent", team=gsw,
+                              salary=3000000, free_agent=True)
+        self.client = APIClient()
+
+    def get_bytes(self, url, params, fast):
+        """
+        Fetch a response body with the fast path turned on or off.
+        """
+        get_cache().clear()
+        with override_settings(FAST_SERIALIZATION=fast):
+            return self.client.get(url, params).content
+
+    def test_byte_identical_responses(self):
+        """
+        Test every list endpoint with and without the fast path.
+        """
+        cases = [
+            (reverse('teams'), {}),
+            (reverse('teams'), {'page_size': 1}),
+            (reverse('all-free-agents'), {}),
+            (reverse('all-free-agents'), {'expand': 'team'}),
+            (reverse('all-free-agents'), {'page_size': 1, 'ordering': '-name'}),
+            (reverse('team-players', args=['DEN']), {}),
+            (reverse('team-players', args=['DEN']), {'expand': 'team'}),
+            (reverse('team-players', args=['GSW']), {'page_size': 1}),
+        ]
+        for url, params in cases:
+            with self.subTest(url=url, params=params):
+                self.assertEqual(self.get_bytes(url, params, fast=True),
+                                 self.get_bytes(url, params, fast=False))
+
+    def test_next_cursor_from_rows(self):
+        """
+        Test that pages built from .values() rows link to the right page.
+        """
+        url = reverse('all-free-agents')
+        response = self.client.get(url, {'page_size': 1})
+        self.assertEqual(response.data['results'][0]['name'],
+                         "Luka Dončić \"Wonder\"")
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['name'], "Free Agent")
+        self.assertIsNone(response.data['next'])
+
+    def test_renderer_matches_drf(self):
+        """
+        Test that FastJSONRenderer encodes like DRF's JSONRenderer.
+        """
+        data = [{'id': 1, 'name': "Nikola Jokić \"Joker\" \\ / \n\x01",
+                 'team': {'id': 2, 'code': None}, 'free_agent': True}]
+        self.assertEqual(FastJSONRenderer().render(data),
+                         JSONRenderer().render(data))
+
+    def test_renderer_matches_drf_separators_and_floats(self):
+        """
+        Test that line and paragraph separators are escaped and floats
+        are formatted exactly as DRF's JSONRenderer does.
+        """
+        for data in ([{'name': "A\u2028B\u2029C", 'y': 1e-7}],
+                     {'name': "A\u2028B"},
+                     {'hit_rate': 0.5, 'big': 1e16, 'nested': [[2.5e-5]]}):
+            with self.subTest(data=data):
+                self.assertEqual(FastJSONRenderer().render(data),
+                                 JSONRenderer().render(data))
@@ -0,0 +1,116 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Team, Player
+from rest_framework import status
+
+
+class PlayerFilterTests(TestCase):
+    """
+    Unit tests for server-side filtering and sorting of player lists.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams with free agents and signed players.
+        """
+        self.gsw = Team.objects.create(name="Warriors", code="GSW", payroll=0)
+        self.lal = Team.objects.create(name="Lakers", code="LAL", payroll=0)
+        Player.objects.create(name="Stephen Curry", team=self.gsw,
+                              salary=55000000, free_agent=False)
+        Player.objects.create(name="Steve Nash", team=self.gsw,
+                              salary=3000000, free_agent=True)
+        Player.objects.create(name="Stan Free", team=self.lal,
+                              salary=8000000, free_agent=True)
+        Player.objects.create(name="Bob Bench", team=self.lal,
+                              salary=2500000, free_agent=True)
+        self.client = APIClient()
+
+    def names(self, response):
+        """
+        Names of the players in a list response.
+        """
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [player['name'] for player in response.data]
+
+    def test_salary_band(self):
+        """
+        Test inclusive min_salary and max_salary bounds.
+        """
+        response = self.client.get(reverse('all-free-agents'), {
+            'min_salary': 2500000, 'max_salary': 3000000, 'ordering': 'salary'})
+        self.assertEqual(self.names(response), ["Bob Bench", "Steve Nash"])
+
+    def test_name_prefix(self):
+        """
+        Test that ?name= matches a case-sensitive prefix.
+        """
+        response = self.client.get(reverse('all-free-agents'),
+                                   {'name': 'Ste', 'ordering': 'name'})
+        self.assertEqual(self.names(response), ["Steve Nash"])
+
+    def test_name_prefix_edge_code_points(self):
+        """
+        Test prefixes ending in the last code point, or just before the
+        surrogate range, which have no simple successor.
+        """
+        Player.objects.create(name="Zed\U0010ffff\U0010ffffX", team=self.gsw,
+                              salary=2300000, free_agent=True)
+        Player.objects.create(name="Zed\ud7ff\ue000", team=self.gsw,
+                              salary=2300000, free_agent=True)
+        url = reverse('all-free-agents')
+        for prefix, expected in (("\U0010ffff", []),
+                                 ("Zed\U0010ffff", ["Zed\U0010ffff\U0010ffffX"]),
+                                 ("Zed\ud7ff", ["Zed\ud7ff\ue000"])):
+            with self.subTest(prefix=prefix):
+                response = self.client.get(url, {'name': prefix})
+                self.assertEqual(self.names(response), expected)
+
+    def test_team_codes_and_ordering(self):
+        """
+        Test filtering on a list of team codes with descending ordering.
+        """
+        response = self.client.get(reverse('all-free-agents'),
+                                   {'team': 'LAL,XYZ', 'ordering': '-salary'})
+        self.assertEqual(self.names(response), ["Stan Free", "Bob Bench"])
+
+    def test_roster_filters(self):
+        """
+        Test that the team roster endpoint supports the same filters.
+        """
+        url = reverse('team-players', args=[self.gsw.code])
+        response = self.client.get(url, {'min_salary': 1000000})
+        self.assertEqual([player['name'] for player in response.data['players']],
+                         ["Stephen Curry"])
+
+        response = self.client.get(url, {'max_salary': 1000000})
+        self.assertEqual(response.data['players'], [])
+
+    def test_filters_with_pagination(self):
+        """
+        Test that filters are preserved across keyset pages.
+        """
+        response = self.client.get(reverse('all-free-agents'),
+                                   {'min_salary': 2600000, 'page_size': 1})
+        self.assertEqual(response.data['results'][0]['name'], "Steve Nash")
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['name'], "Stan Free")
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_filters(self):
+        """
+        Test that malformed filter values are rejected with 400.
+        """
+        url = reverse('all-free-agents')
+        for params in ({'min_salary': 'cheap'},
+                       {'min_salary': -1},
+                       {'min_salary': 10, 'max_salary': 5},
+                       {'name': 'x' * 65},
+                       {'team': 'GOLDEN'},
+                       {'team': ','.join(['AAA'] * 31)},
+                       {'ordering': 'payroll'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,76 @@
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+from ..models import Team, Player
+from ..cache import get_cache
+from ..views.team_view import render_team_list, render_team_players
+
+
+class FragmentCacheTests(TestCase):
+    """
+    Unit tests for the cached template fragments of the team pages.
+    """
+
+    def setUp(self):
+        """
+        Set up two teams with one signed player each.
+        """
+        get_cache().clear()
+        self.team = Team.objects.create(
+            name="Team A", code="TMA", payroll=50000)
+        self.other_team = Team.objects.create(
+            name="Team B", code="TMB", payroll=30000)
+        self.player = Player.objects.create(
+            name="Player One", team=self.team, salary=50000)
+        Player.objects.create(name="Player Two", team=self.other_team,
+                              salary=30000)
+        self.request = RequestFactory().get('/')
+        self.client = APIClient()
+
+    def cut(self, player):
+        """
+        Cut a player through the API.
+        """
+        self.client.patch(reverse('players', args=[player.id]),
+                          {'free_agent': "True"}, format='json')
+
+    def test_roster_fragment_skips_player_query(self):
+        """
+        Test that re-rendering an unchanged roster page only reads the
+        fragment from the cache and does not query the players.
+        """
+        first = render_team_players(self.request, self.team)
+        with self.assertNumQueries(0):
+            second = render_team_players(self.request, self.team)
+        self.assertEqual(first, second)
+        self.assertIn(b"Player One", second)
+
+    def test_roster_fragment_follows_team_version(self):
+        """
+        Test that a cut re-renders the roster table of that team only.
+        """
+        render_team_players(self.request, self.team)
+        render_team_players(self.request, self.other_team)
+        self.cut(self.player)
+
+        with self.assertNumQueries(1):
+            page = render_team_players(self.request, self.team)
+        self.assertNotIn(b"Player One", page)
+        with self.assertNumQueries(0):
+            render_team_players(self.request, self.other_team)
+
+    def test_team_cards_follow_team_version(self):
+        """
+        Test that the team list shows a changed payroll while unchanged
+        cards keep their cached content.
+        """
+        self.assertIn(b"$50,000", render_team_list(self.request))
+
+        # A stale card for Team B proves it is served from the fragment
+        Team.objects.filter(id=self.other_team.id).update(name="Renamed")
+        self.cut(self.player)
+
+        page = render_team_list(self.request)
+        self.assertIn(b"Payroll: $0", page)
+        self.assertIn(b"Team B (TMB)", page)
+        self.assertNotIn(b"Renamed", page)
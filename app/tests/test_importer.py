@@ -0,0 +1,238 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from ..models import Team, Player
+from .. import importer
+
+
+class BulkImportTests(TestCase):
+    """
+    Unit tests for the bulk CSV ingestion path.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.team = Team.objects.create(
+            name="Team A", code="TMA", payroll=1000000)
+        self.player = Player.objects.create(
+            name="Player One", team=self.team, salary=50000)
+
+    def test_bulk_import_teams(self):
+        """
+        Test that teams are created, updated or left alone based on their code.
+        """
+        rows = [
+            {'name': 'Team A', 'code': 'TMA', 'payroll': 1000000},
+            {'name': 'Team B', 'code': 'TMB', 'payroll': 2000000},
+        ]
+        stats = importer.bulk_import_teams(rows)
+        self.assertEqual(stats, {'created': 1, 'updated': 0,
+                                 'unchanged': 1, 'skipped': 0})
+
+        # Changing the payroll turns the row into an update
+        rows[1]['payroll'] = 3000000
+        stats = importer.bulk_import_teams(rows)
+        self.assertEqual(stats['updated'], 1)
+        self.assertEqual(Team.objects.get(code='TMB').payroll, 3000000)
+
+    def test_bulk_import_players(self):
+        """
+        Test created, updated, unchanged and skipped counts for players.
+        """
+        team_b = Team.objects.create(name="Team B", code="TMB", payroll=0)
+        Player.objects.create(name="Player Two", team=team_b, salary=10)
+
+        rows = [
+            {'name': 'Player One', 'team': 'TMB', 'salary': 60000},
+            {'name': 'Player Two', 'team': 'TMB', 'salary': 10},
+            {'name': 'Player Three', 'team': 'TMA', 'salary': 70000},
+            {'name': 'Player Four', 'team': 'XXX', 'salary': 80000},
+        ]
+        stats = importer.bulk_import_players(rows, batch_size=2)
+        self.assertEqual(stats, {'created': 1, 'updated': 1,
+                                 'unchanged': 1, 'skipped': 1})
+
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.team_id, team_b.id)
+        self.assertEqual(self.player.salary, 60000)
+        self.assertFalse(Player.objects.filter(name='Player Four').exists())
+
+    def test_bulk_import_players_duplicate_rows(self):
+        """
+        Test that the last row wins when a player appears twice in a file.
+        """
+        team_b = Team.objects.create(name="Team B", code="TMB", payroll=0)
+        rows = [
+            {'name': 'Traded Player', 'team': 'TMA', 'salary': 100},
+            {'name': 'Traded Player', 'team': 'TMB', 'salary': 100},
+        ]
+        importer.bulk_import_players(rows)
+        self.assertEqual(
+            Player.objects.get(name='Traded Player').team_id, team_b.id)
+
+    def test_reload_with_duplicate_rows_updates_nothing(self):
+        """
+        Test that reloading files with repeated keys reports the replaced
+        rows as skipped, not updated, when nothing changed.
+        """
+        team_rows = [
+            {'name': 'Team B', 'code': 'TMB', 'payroll': 0},
+            {'name': 'Team B', 'code': 'TMB', 'payroll': 0},
+        ]
+        player_rows = [
+            {'name': 'Traded Player', 'team': 'TMA', 'salary': 100},
+            {'name': 'Traded Player', 'team': 'TMB', 'salary': 100},
+        ]
+        importer.bulk_import_teams(team_rows)
+        importer.bulk_import_players(player_rows)
+
+        self.assertEqual(importer.bulk_import_teams(team_rows),
+                         {'created': 0, 'updated': 0,
+                          'unchanged': 1, 'skipped': 1})
+        self.assertEqual(importer.bulk_import_players(player_rows),
+                         {'created': 0, 'updated': 0,
+                          'unchanged': 1, 'skipped': 1})
+
+        stats = importer.new_stats()
+        importer.write_chunk('players', player_rows,
+                             importer.resolve_team_ids(), stats)
+        self.assertEqual(stats['updated'], 0)
+        self.assertEqual(stats['skipped'], 1)
+
+    def test_bulk_import_players_by_code(self):
+        """
+        Test that rows match on their code, that players imported before
+        codes were stored adopt the code of their row, and that a name
+        held by another code is skipped.
+        """
+        Player.objects.create(name="Coded Player", code='codedpl01',
+                              team=self.team, salary=10)
+        rows = [
+            # Renamed, still the same player
+            {'name': 'Coded Player Jr.', 'code': 'codedpl01', 'team': 'TMA',
+             'salary': 10},
+            {'name': 'Player One', 'code': 'onepl01', 'team': 'TMA',
+             'salary': 50000},
+            {'name': 'Player One', 'code': 'onepl02', 'team': 'TMA',
+             'salary': 50000},
+        ]
+        stats = importer.bulk_import_players(rows)
+        self.assertEqual(stats, {'created': 0, 'updated': 2,
+                                 'unchanged': 0, 'skipped': 1})
+        self.assertEqual(Player.objects.get(code='codedpl01').name,
+                         'Coded Player Jr.')
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.code, 'onepl01')
+
+        # Once coded, a re-import costs one lookup on the code index
+        # besides the savepoint and the team codes
+        with self.assertNumQueries(4):
+            stats = importer.bulk_import_players(rows[:2])
+        self.assertEqual(stats['unchanged'], 2)
+
+    def test_bulk_import_players_query_count(self):
+        """
+        Test that a batch costs a constant number of queries.
+        """
+        rows = [{'name': f'Player {i}', 'team': 'TMA', 'salary': i}
+                for i in range(100)]
+        # Savepoint, team lookup, existing lookup, version increment and
+        # read, insert, release savepoint
+        with self.assertNumQueries(7):
+            importer.bulk_import_players(rows)
+        self.assertEqual(Player.objects.count(), 101)
+
+
+class StreamingImportTests(TestCase):
+    """
+    Unit tests for the chunked import_roster management command.
+    """
+
+    def setUp(self):
+        """
+        Set up a team and a temporary players CSV file.
+        """
+        Team.objects.create(name="Team A", code="TMA", payroll=0)
+
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.path = os.path.join(tmp_dir, 'players.csv')
+        self.checkpoint = f"{self.path}.checkpoint"
+        with open(self.path, 'w', encoding='utf-8') as csvfile:
+            csvfile.write("Player,Team,salary,unique-code\n")
+            for i in range(10):
+                csvfile.write(f"Player {i},TMA,{1000 + i},code{i}\n")
+            # Rows that fail validation are skipped, not fatal
+            csvfile.write("Bad Salary,TMA,lots,bad01\n")
+
+    def test_import_roster_command(self):
+        """
+        Test that the command imports every valid row in chunks.
+        """
+        out = StringIO()
+        call_command('import_roster', self.path, '--chunk-size', '3',
+                     stdout=out)
+
+        self.assertEqual(Player.objects.count(), 10)
+        self.assertIn("10 created", out.getvalue())
+        self.assertIn("1 skipped", out.getvalue())
+        # The checkpoint is removed after a complete import
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume_from_checkpoint(self):
+        """
+        Test that an interrupted import resumes after the last committed chunk.
+        """
+        def interrupt(offset, stats):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            importer.stream_import(self.path, chunk_size=4,
+                                   checkpoint_path=self.checkpoint,
+                                   on_chunk=interrupt)
+        self.assertEqual(importer.read_checkpoint(self.checkpoint), 4)
+        self.assertEqual(Player.objects.count(), 4)
+
+        out = StringIO()
+        call_command('import_roster', self.path, '--resume', stdout=out)
+        self.assertIn("Resuming after row 4", out.getvalue())
+        self.assertIn("6 created", out.getvalue())
+        self.assertEqual(Player.objects.count(), 10)
+
+    def test_split_byte_ranges(self):
+        """
+        Test that byte ranges are newline aligned and cover every row.
+        """
+        header, ranges = importer.split_byte_ranges(self.path, range_size=40)
+        self.assertEqual(header, ['Player', 'Team', 'salary', 'unique-code'])
+        self.assertGreater(len(ranges), 1)
+
+        parsed = [importer.parse_byte_range(
+            (self.path, 'players', header, start, end))
+            for start, end in ranges]
+        self.assertEqual(sum(len(rows) for rows, _ in parsed), 10)
+        self.assertEqual(sum(skipped for _, skipped in parsed), 1)
+
+    def test_parallel_import_command(self):
+        """
+        Test importing several files with a worker pool.
+        """
+        second_path = self.path.replace('players.csv', 'more_players.csv')
+        with open(second_path, 'w', encoding='utf-8') as csvfile:
+            csvfile.write("Player,Team,salary,unique-code\n")
+            csvfile.write("Player 0,TMA,5,code0\n")
+            csvfile.write("Player 10,TMA,10,code10\n")
+
+        out = StringIO()
+        call_command('import_roster', self.path, second_path,
+                     '--workers', '2', '--range-size', '40', stdout=out)
+
+        self.assertEqual(Player.objects.count(), 11)
+        # Files are applied in order, so the second file's row wins
+        self.assertEqual(Player.objects.get(name='Player 0').salary, 5)
+        self.assertIn("11 created, 1 updated", out.getvalue())
@@ -0,0 +1,118 @@
+import re
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, SimpleTestCase, AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+from .. import metrics
+from ..metrics import Histogram, MetricsRegistry
+from ..models import Team, Player
+
+
+class HistogramTests(SimpleTestCase):
+    """
+    Unit tests for the bucketed histogram and its quantile estimates.
+    """
+
+    def test_quantiles(self):
+        """
+        Quantiles are interpolated inside the bucket holding their rank.
+        """
+        histogram = Histogram((1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3):
+            histogram.observe(value)
+        self.assertEqual(list(histogram.cumulative()),
+                         [(1, 1), (2, 3), (4, 4), (float('inf'), 4)])
+        self.assertEqual(histogram.quantile(0.5), 1.5)
+        self.assertEqual(histogram.quantile(1), 4)
+        self.assertIsNone(Histogram((1,)).quantile(0.5))
+
+    def test_overflow(self):
+        """
+        Values past the last bucket report the last bound.
+        """
+        histogram = Histogram((1, 2))
+        histogram.observe(10)
+        self.assertEqual(histogram.quantile(0.99), 2)
+
+
+@override_settings(METRICS_SAMPLE_RATE=1)
+class InstrumentationTests(TestCase):
+    """
+    Unit tests for the instrumentation middleware and /metrics.
+    """
+
+    def setUp(self):
+        """
+        Give every test a fresh registry and a team with two players.
+        """
+        patcher = mock.patch.object(metrics, 'registry', MetricsRegistry())
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.team = Team.objects.create(name="Warriors", code="GSW", payroll=0)
+        for number in range(2):
+            Player.objects.create(name=f"Player {number}", team=self.team,
+                                  salary=2300000, free_agent=False)
+        self.client = APIClient()
+
+    def timing(self, response):
+        """
+        Parse the Server-Timing header into {name: (ms, description)}.
+        """
+        return {match[0]: (float(match[1]), match[2]) for match in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response['Server-Timing'])}
+
+    def test_server_timing(self):
+        """
+        A sampled request reports its queries and phases in Server-Timing
+        and is added to the histograms of its view.
+        """
+        url = reverse('team-players', args=[self.team.code])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'page_size': 10})
+
+        timing = self.timing(response)
+        self.assertEqual(set(timing), {'total', 'db', 'serialize', 'render'})
+        self.assertEqual(timing['db'][1], f"{len(queries)} queries")
+        self.assertGreaterEqual(timing['total'][0], timing['db'][0])
+
+        quantiles = self.registry.quantiles('db_queries', 'SingleTeamView')
+        self.assertIsNotNone(quantiles[0.5])
+        self.assertEqual(
+            self.registry.histograms['request_duration_seconds']['SingleTeamView'].count, 1)
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_sampling_disabled(self):
+        """
+        With sampling off nothing is measured or recorded.
+        """
+        response = self.client.get(reverse('teams'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(self.registry.histograms['request_duration_seconds'], {})
+
+    def test_async_view_queries(self):
+        """
+        Queries run by the async ORM in worker threads are counted.
+        """
+        url = reverse('async-team-players', args=[self.team.code])
+        response = async_to_sync(AsyncClient().get)(url)
+        self.assertEqual(self.timing(response)['db'][1], "2 queries")
+
+    def test_metrics_endpoint(self):
+        """
+        /metrics serves the histograms in the Prometheus text format.
+        """
+        self.client.get(reverse('teams'))
+        response = self.client.get(reverse('metrics'))
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('# TYPE trademachine_request_duration_seconds histogram', body)
+        self.assertIn('trademachine_db_queries_count{view="TeamView"} 1', body)
+        self.assertIn('trademachine_request_duration_seconds_bucket'
+                      '{view="TeamView",le="+Inf"} 1', body)
+        self.assertIn('trademachine_render_duration_seconds_quantile'
+                      '{view="TeamView",quantile="0.99"}', body)
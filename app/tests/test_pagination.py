@@ -0,0 +1,137 @@
+import base64
+import json
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Team, Player
+from rest_framework import status
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    Unit tests for cursor (keyset) pagination on the list endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up a team with signed players and free agents sharing salaries.
+        """
+        self.team = Team.objects.create(name="Team A", code="TMA", payroll=0)
+        for i in range(10):
+            # Salaries repeat so the id tie-breaker is exercised
+            Player.objects.create(name=f"Free Agent {i}", team=self.team,
+                                  salary=1000 * (i % 3), free_agent=True)
+            Player.objects.create(name=f"Signed {i}", team=self.team,
+                                  salary=1000 * (i % 4), free_agent=False)
+        self.client = APIClient()
+
+    def walk(self, url, params):
+        """
+        Follow "next" links from the first page and collect every page.
+        """
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code // 100, 2)
+            pages.append(response.data)
+            if not response.data['next']:
+                return pages
+            response = self.client.get(response.data['next'])
+
+    def test_free_agents_pages_by_salary(self):
+        """
+        Test that pages cover every free agent exactly once in (salary, id) order.
+        """
+        pages = self.walk(reverse('all-free-agents'), {'page_size': 3})
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 3, 1])
+
+        players = [player for page in pages for player in page['results']]
+        expected = list(Player.objects.filter(free_agent=True)
+                        .order_by('salary', 'id').values_list('id', flat=True))
+        self.assertEqual([player['id'] for player in players], expected)
+
+    def test_free_agents_descending_name(self):
+        """
+        Test descending ordering on (name, id).
+        """
+        pages = self.walk(reverse('all-free-agents'),
+                          {'page_size': 4, 'ordering': '-name'})
+        names = [player['name'] for page in pages for player in page['results']]
+        self.assertEqual(names, sorted(names, reverse=True))
+        self.assertEqual(len(names), 10)
+
+    def test_unpaginated_by_default(self):
+        """
+        Test that requests without pagination parameters keep the plain list.
+        """
+        response = self.client.get(reverse('all-free-agents'))
+        self.assertEqual(len(response.data), 10)
+
+    def test_team_roster_pages(self):
+        """
+        Test that the roster endpoint paginates players and keeps the team.
+        """
+        pages = self.walk(reverse('team-players', args=[self.team.code]),
+                          {'page_size': 4})
+        self.assertEqual(pages[0]['team']['code'], 'TMA')
+        players = [player for page in pages for player in page['players']]
+        self.assertEqual(len(players), 10)
+        self.assertTrue(all(not player['free_agent'] for player in players))
+
+    def test_teams_pages(self):
+        """
+        Test that the team list paginates by name.
+        """
+        Team.objects.create(name="Another Team", code="ANO", payroll=0)
+        pages = self.walk(reverse('teams'), {'page_size': 1})
+        self.assertEqual([page['results'][0]['name'] for page in pages],
+                         ["Another Team", "Team A"])
+
+    def test_deep_page_query_count(self):
+        """
+        Test that a page deep into the list costs a single query.
+        """
+        first = self.client.get(reverse('all-free-agents'), {'page_size': 8})
+        with self.assertNumQueries(1):
+            self.client.get(first.data['next'])
+
+    def test_invalid_parameters(self):
+        """
+        Test that malformed cursors, page sizes and orderings return 400.
+        """
+        url = reverse('all-free-agents')
+        for params in ({'cursor': 'not-a-cursor'},
+                       {'page_size': 0},
+                       {'page_size': 'ten'},
+                       {'page_size': 5, 'ordering': 'free_agent'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+
+        # A cursor issued for one ordering cannot be replayed with another
+        first = self.client.get(url, {'page_size': 2})
+        cursor = first.data['next'].split('cursor=')[1]
+        response = self.client.get(url, {'cursor': cursor, 'ordering': 'name'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tampered_cursor_values(self):
+        """
+        Test that cursor values of the wrong type return 400, not 500.
+        """
+        url = reverse('all-free-agents')
+        for ordering, values in (('salary', ["abc", 1]),
+                                 ('salary', [{"a": 1}, 1]),
+                                 ('salary', [1.5, 1]),
+                                 ('salary', [True, 1]),
+                                 ('name', [1, 1]),
+                                 ('name', ["Player", None])):
+            cursor = base64.urlsafe_b64encode(json.dumps(
+                {'o': ordering, 'v': values}).encode()).decode()
+            with self.subTest(values=values):
+                response = self.client.get(
+                    url, {'cursor': cursor, 'ordering': ordering})
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data, {'cursor': "Invalid cursor."})
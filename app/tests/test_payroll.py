@@ -0,0 +1,207 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Team, Player
+from ..payroll import apply_payroll_deltas, reconcile_payroll
+
+
+def team_salary_total(team):
+    """
+    Sum the salaries of a team's non-free-agent players.
+    """
+    return Player.objects.filter(team=team, free_agent=False).aggregate(
+        total=Sum('salary'))['total'] or 0
+
+
+class PayrollUpdateTests(TestCase):
+    """
+    Unit tests for atomic payroll updates in the write views.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.team = Team.objects.create(
+            name="Team A", code="TMA", payroll=50000)
+        self.player = Player.objects.create(
+            name="Player One", team=self.team, salary=50000, free_agent=False)
+        self.client = APIClient()
+
+    def test_apply_payroll_deltas_many_teams(self):
+        """
+        Test that several teams are updated with a single statement.
+        """
+        team_b = Team.objects.create(name="Team B", code="TMB", payroll=0)
+        with self.assertNumQueries(1):
+            apply_payroll_deltas({self.team.id: -100, team_b.id: 250},
+                                 version=1)
+
+        self.team.refresh_from_db()
+        team_b.refresh_from_db()
+        self.assertEqual(self.team.payroll, 49900)
+        self.assertEqual(team_b.payroll, 250)
+
+    def test_repeated_cut_subtracts_once(self):
+        """
+        Test that cutting a player who is already a free agent is a no-op.
+        """
+        url = reverse('players', args=[self.player.id])
+        for _ in range(3):
+            response = self.client.patch(
+                url, {'free_agent': "True"}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.payroll, 0)
+
+    def test_cut_player_query_count(self):
+        """
+        Test that a cut costs one read and two writes inside a transaction.
+        """
+        url = reverse('players', args=[self.player.id])
+        # Savepoint, player select, version increment and read, player
+        # update, team update, release
+        with self.assertNumQueries(7):
+            self.client.patch(url, {'free_agent': "True"}, format='json')
+
+    def test_invalid_cut_returns_400(self):
+        """
+        Test that invalid player data is rejected without touching payroll.
+        """
+        url = reverse('players', args=[self.player.id])
+        response = self.client.patch(
+            url, {'free_agent': "maybe"}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.payroll, 50000)
+
+
+class PayrollReconcileTests(TestCase):
+    """
+    Unit tests for the payroll reconciliation command and endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up one team in sync and one team whose payroll drifted.
+        """
+        self.synced = Team.objects.create(
+            name="Team A", code="TMA", payroll=100)
+        self.drifted = Team.objects.create(
+            name="Team B", code="TMB", payroll=999)
+        Player.objects.create(name="Player One", team=self.synced, salary=100)
+        Player.objects.create(name="Player Two", team=self.drifted, salary=300)
+        Player.objects.create(name="Free Agent", team=self.drifted,
+                              salary=500, free_agent=True)
+        self.client = APIClient()
+
+    def test_reconcile_report(self):
+        """
+        Test that drift is reported per team from a single query.
+        """
+        with self.assertNumQueries(1):
+            report = reconcile_payroll()
+
+        self.assertEqual(report['checked'], 2)
+        self.assertEqual(report['drifted'], 1)
+        self.assertEqual(report['teams'][0]['code'], 'TMB')
+        self.assertEqual(report['teams'][0]['actual_payroll'], 300)
+        self.assertEqual(report['teams'][0]['drift'], 699)
+
+        # Reporting alone leaves the payroll untouched
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.payroll, 999)
+
+    def test_reconcile_fix(self):
+        """
+        Test that fixing costs one UPDATE (plus its savepoint and change
+        version) and corrects the payroll.
+        """
+        with self.assertNumQueries(6):
+            report = reconcile_payroll(fix=True)
+
+        self.assertEqual(report['fixed'], 1)
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.payroll, 300)
+        self.assertEqual(reconcile_payroll()['drifted'], 0)
+
+    def test_reconcile_endpoint(self):
+        """
+        Test that GET reports drift and POST fixes it.
+        """
+        url = reverse('payroll-reconcile')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['drifted'], 1)
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['fixed'], 1)
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.payroll, 300)
+
+    def test_reconcile_command(self):
+        """
+        Test the reconcile_payroll management command.
+        """
+        out = StringIO()
+        call_command('reconcile_payroll', '--fix', stdout=out)
+
+        self.assertIn("TMB: stored 999, actual 300, drift +699", out.getvalue())
+        self.assertIn("1 of 2 teams drifted, 1 fixed", out.getvalue())
+
+
+class ConcurrentPayrollTests(TransactionTestCase):
+    """
+    Fire many simultaneous cut and sign requests and check payroll integrity.
+    """
+
+    def setUp(self):
+        """
+        Set up a team whose payroll matches its players' salaries.
+        """
+        self.team = Team.objects.create(name="Team A", code="TMA", payroll=0)
+        self.players = [
+            Player.objects.create(name=f"Player {i}", team=self.team,
+                                  salary=2300000 + i, free_agent=True)
+            for i in range(20)
+        ]
+
+    def _request(self, index):
+        """
+        Sign or cut one player, alternating by request index.
+        """
+        player = self.players[index % len(self.players)]
+        try:
+            client = APIClient()
+            if (index // len(self.players)) % 2 == 0:
+                return client.post(
+                    reverse('sign-player', args=[player.id]),
+                    {'team': self.team.id, 'salary': player.salary})
+            return client.patch(
+                reverse('players', args=[player.id]),
+                {'free_agent': "True"}, format='json')
+        finally:
+            connection.close()
+
+    def test_concurrent_cut_and_sign(self):
+        """
+        Test that final payroll equals the sum of the signed players' salaries.
+        """
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            responses = list(executor.map(self._request, range(300)))
+
+        self.assertTrue(all(response.status_code in (
+            status.HTTP_202_ACCEPTED, status.HTTP_302_FOUND)
+            for response in responses))
+
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.payroll, team_salary_total(self.team))
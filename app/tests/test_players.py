@@ -45,6 +45,30 @@ class PlayerTests(TestCase):
         # Ensure payroll is updated
         self.assertEqual(self.team.payroll, 950000)
 
+    def test_player_by_code_view(self):
+        """
+        Test that players are read and cut by their external code.
+        """
+        self.player1.code = 'onepl01'
+        self.player1.save()
+        url = reverse('player-by-code', args=['onepl01'])
+
+        response = self.client.get(url, {'expand': 'team'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.player1.id)
+        self.assertEqual(response.data['team']['code'], "TMA")
+
+        response = self.client.patch(url, {'free_agent': True, 'code': 'x'},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.player1.refresh_from_db()
+        self.assertTrue(self.player1.free_agent)
+        # The code itself cannot be edited through the API
+        self.assertEqual(self.player1.code, 'onepl01')
+
+        response = self.client.get(reverse('player-by-code', args=['nobody01']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_free_agent_view(self):
         """
         Test the endpoint that lists all free agents.
@@ -96,6 +120,15 @@ class PlayerTests(TestCase):
         # Team B's payroll should be updated
         self.assertEqual(team_b.payroll, 26000000)
 
+    def test_sign_unknown_player(self):
+        """
+        Test that signing a player that does not exist is not found.
+        """
+        url = reverse('sign-player', args=[999999])
+        response = self.client.post(url, {'team': self.team.id,
+                                          'salary': 6000000})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_create_player_view(self):
         """
         Test the endpoint that creates a new player and updates team payroll.
@@ -0,0 +1,241 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase, AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from ..models import Team, Player
+
+
+class QueryCountTests(TestCase):
+    """
+    Regression tests pinning the number of SQL queries for every route in
+    app/urls.py. Each endpoint is measured with a small and a large roster,
+    so an N+1 query shows up as a failure.
+    """
+
+    # Roster sizes each endpoint is measured with
+    ROSTER_SIZES = (2, 25)
+
+    def setUp(self):
+        """
+        Set up two teams and initialize the test client.
+        """
+        self.team = Team.objects.create(
+            name="Team A", code="TMA", payroll=1000000)
+        self.other_team = Team.objects.create(
+            name="Team B", code="TMB", payroll=1000000)
+        self.client = APIClient()
+
+    def grow_roster(self, size):
+        """
+        Make sure the team has `size` signed players and `size` free agents.
+        """
+        for free_agent in (False, True):
+            missing = size - Player.objects.filter(
+                free_agent=free_agent).count()
+            for _ in range(missing):
+                Player.objects.create(
+                    name=f"Player {Player.objects.count()}", team=self.team,
+                    salary=2300000, free_agent=free_agent)
+
+    def assertConstantQueries(self, expected, request):
+        """
+        Assert that `request()` runs `expected` queries at every roster size.
+        """
+        for size in self.ROSTER_SIZES:
+            self.grow_roster(size)
+            with self.subTest(roster_size=size):
+                with self.assertNumQueries(expected):
+                    request()
+
+    def test_home_page(self):
+        self.assertConstantQueries(0, lambda: self.client.get(reverse('home')))
+
+    def test_team_list_api(self):
+        self.assertConstantQueries(
+            1, lambda: self.client.get(reverse('teams')))
+
+    def test_team_list_html(self):
+        self.assertConstantQueries(
+            1, lambda: self.client.get(reverse('teams-html')))
+
+    def test_team_players_api(self):
+        url = reverse('team-players', args=[self.team.code])
+        self.assertConstantQueries(2, lambda: self.client.get(url))
+
+    def test_team_players_api_expanded(self):
+        url = reverse('team-players', args=[self.team.code])
+        self.assertConstantQueries(
+            2, lambda: self.client.get(url, {'expand': 'team'}))
+
+    def test_async_team_list(self):
+        url = reverse('async-teams')
+        self.assertConstantQueries(
+            1, lambda: async_to_sync(AsyncClient().get)(url))
+
+    def test_async_team_players(self):
+        url = reverse('async-team-players', args=[self.team.code])
+        # Team, then its roster
+        self.assertConstantQueries(
+            2, lambda: async_to_sync(AsyncClient().get)(url, {'expand': 'team'}))
+
+    def test_async_free_agents(self):
+        url = reverse('async-free-agents')
+        self.assertConstantQueries(
+            1, lambda: async_to_sync(AsyncClient().get)(url, {'expand': 'team'}))
+
+    def test_team_players_html(self):
+        url = reverse('teams-html-players', args=[self.team.code])
+        self.assertConstantQueries(2, lambda: self.client.get(url))
+
+    def test_free_agents_api(self):
+        self.assertConstantQueries(
+            1, lambda: self.client.get(reverse('all-free-agents')))
+
+    def test_free_agents_api_expanded(self):
+        url = reverse('all-free-agents')
+        self.assertConstantQueries(
+            1, lambda: self.client.get(url, {'expand': 'team'}))
+
+    def test_free_agents_html(self):
+        self.assertConstantQueries(
+            1, lambda: self.client.get('/free-agents'))
+
+    def test_sign_player_html(self):
+        self.grow_roster(1)
+        player = Player.objects.filter(free_agent=True).first()
+        url = reverse('sign-player-html', args=[player.id])
+        # Player lookup plus the team choices in the form
+        self.assertConstantQueries(2, lambda: self.client.get(url))
+
+    def test_create_player_html(self):
+        url = reverse('create-player-html')
+        self.assertConstantQueries(1, lambda: self.client.get(url))
+
+    def test_cut_player(self):
+        self.grow_roster(len(self.ROSTER_SIZES))
+        player_ids = iter(Player.objects.filter(
+            free_agent=False).values_list('id', flat=True))
+
+        def cut():
+            self.client.patch(reverse('players', args=[next(player_ids)]),
+                              {'free_agent': "True"}, format='json')
+        # Savepoint, player select, version increment and read, player
+        # update, team update, release
+        self.assertConstantQueries(7, cut)
+
+    def test_player_by_code(self):
+        self.grow_roster(1)
+        player = Player.objects.first()
+        player.code = 'playeon01'
+        player.save()
+        url = reverse('player-by-code', args=[player.code])
+        self.assertConstantQueries(
+            1, lambda: self.client.get(url, {'expand': 'team'}))
+
+    def test_sign_player(self):
+        self.grow_roster(len(self.ROSTER_SIZES))
+        player_ids = iter(Player.objects.filter(
+            free_agent=True).values_list('id', flat=True))
+
+        def sign():
+            self.client.post(reverse('sign-player', args=[next(player_ids)]),
+                             {'team': self.other_team.id, 'salary': 2300000})
+        # Team choice validation, then savepoint, player select, version
+        # increment and read, player update, team update and release
+        self.assertConstantQueries(8, sign)
+
+    def test_create_player(self):
+        names = iter(range(len(self.ROSTER_SIZES)))
+
+        def create():
+            self.client.post(reverse('create-player'), {
+                'name': f"New Player {next(names)}",
+                'team': self.team.id,
+                'salary': 2300000,
+            })
+        # Team choice validation, then savepoint, version increment and
+        # read, insert, team update and release
+        self.assertConstantQueries(7, create)
+
+    def test_payroll_reconcile(self):
+        url = reverse('payroll-reconcile')
+        self.assertConstantQueries(1, lambda: self.client.get(url))
+
+    def test_changes(self):
+        url = reverse('changes')
+        # Counter, players and teams
+        self.assertConstantQueries(
+            3, lambda: self.client.get(url, {'since': 0}))
+
+    def test_events(self):
+        url = reverse('events')
+
+        async def first_chunk():
+            response = await AsyncClient().get(url)
+            stream = aiter(response.streaming_content)
+            await anext(stream)
+            await stream.aclose()
+        # Events are built by the writers; the stream itself reads nothing
+        self.assertConstantQueries(0, async_to_sync(first_chunk))
+
+    def test_export(self):
+        def download():
+            response = self.client.get(reverse('export', args=['players', 'csv']))
+            b''.join(response.streaming_content)
+        # Counter, then every player with its team code in one cursor
+        self.assertConstantQueries(2, download)
+
+    def test_metrics(self):
+        url = reverse('metrics')
+        self.assertConstantQueries(0, lambda: self.client.get(url))
+
+    def test_cache_stats(self):
+        url = reverse('cache-stats')
+        self.assertConstantQueries(0, lambda: self.client.get(url))
+
+    def test_trade(self):
+        def trade():
+            # Send the whole roster, whatever its size, in one trade
+            self.client.post(reverse('trades'), {'moves': [
+                {'player': player_id, 'team': self.other_team.code}
+                for player_id in Player.objects.filter(
+                    team=self.team, free_agent=False).values_list('id', flat=True)
+            ]}, format='json')
+        # Roster lookup above, then savepoint, player select, team select,
+        # version increment and read, player update, payroll update and
+        # release
+        self.assertConstantQueries(9, trade)
+
+    def test_trade_simulation(self):
+        url = reverse('simulate-trades')
+
+        def simulate():
+            response = self.client.get(url)
+            b''.join(response.streaming_content)
+        # Teams and signed players, once, whatever the number of scenarios
+        self.assertConstantQueries(2, simulate)
+
+    def test_bulk_players(self):
+        names = iter(range(len(self.ROSTER_SIZES)))
+
+        def bulk():
+            # Cut the whole roster and sign every free agent, whatever
+            # the roster size, and create one player
+            operations = [{'op': 'cut', 'player': player_id}
+                          for player_id in Player.objects.filter(
+                              team=self.team, free_agent=False).values_list(
+                              'id', flat=True)]
+            operations += [{'op': 'sign', 'player': player_id,
+                            'team': self.other_team.id, 'salary': 2300000}
+                           for player_id in Player.objects.filter(
+                               free_agent=True).exclude(
+                               id__in=[op['player'] for op in operations])
+                           .values_list('id', flat=True)]
+            operations.append({'op': 'create', 'name': f"Bulk {next(names)}",
+                               'team': self.team.id, 'salary': 2300000})
+            self.client.post(reverse('bulk-players'),
+                             {'operations': operations}, format='json')
+        # Two roster lookups above, then savepoint, player select, team
+        # select, name select, version increment and read, bulk update,
+        # bulk insert, payroll update and release
+        self.assertConstantQueries(12, bulk)
@@ -0,0 +1,170 @@
+import json
+import random
+from io import StringIO
+from itertools import combinations
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Team, Player
+from ..simulator import load_snapshot, simulate, top_scenarios, two_for_one
+
+
+class TradeSimulatorTests(TestCase):
+    """
+    Unit tests for the in-memory 2-for-1 trade simulator.
+    """
+
+    # Payroll cap used by every test
+    CAP = 60000000
+
+    def setUp(self):
+        """
+        Set up a small random league with a free agent on every team.
+        """
+        rng = random.Random(7)
+        for code in ("AAA", "BBB", "CCC", "DDD"):
+            team = Team.objects.create(name=f"Team {code}", code=code,
+                                       payroll=0)
+            for i in range(6):
+                Player.objects.create(
+                    name=f"{code} Player {i}", team=team,
+                    salary=rng.randrange(1000000, 15000000, 50000),
+                    free_agent=False)
+            Player.objects.create(name=f"{code} Free Agent", team=team,
+                                  salary=1000000, free_agent=True)
+        for team in Team.objects.all():
+            team.payroll = sum(team.player_set.filter(
+                free_agent=False).values_list('salary', flat=True))
+            team.save()
+        self.client = APIClient()
+
+    def brute_force(self, snapshot, source):
+        """
+        Score every 2-for-1 trade of a source team by enumeration.
+        """
+        scenarios = []
+        start, end = snapshot.roster(source)
+        for target in range(len(snapshot)):
+            if target == source:
+                continue
+            for first, second in combinations(range(start, end), 2):
+                for incoming in range(*snapshot.roster(target)):
+                    sent = snapshot.salaries[first] + snapshot.salaries[second]
+                    received = snapshot.salaries[incoming]
+                    if (snapshot.payrolls[source] - sent + received <= self.CAP
+                            and snapshot.payrolls[target] + sent - received
+                            <= self.CAP):
+                        scenarios.append(abs(sent - received))
+        return sorted(scenarios)
+
+    def test_snapshot_skips_free_agents(self):
+        """
+        Test that the snapshot holds every signed player grouped by team.
+        """
+        with self.assertNumQueries(2):
+            snapshot = load_snapshot()
+        self.assertEqual(snapshot.team_codes, ["AAA", "BBB", "CCC", "DDD"])
+        self.assertEqual(list(snapshot.offsets), [0, 6, 12, 18, 24])
+        start, end = snapshot.roster(1)
+        self.assertEqual(sum(snapshot.salaries[start:end]),
+                         snapshot.payrolls[1])
+
+    def test_matches_brute_force(self):
+        """
+        Test that the pruned search finds the same best trades and counts
+        the same number of trades under the cap as full enumeration.
+        """
+        snapshot = load_snapshot()
+        for source in range(len(snapshot)):
+            with self.subTest(source=source):
+                expected = self.brute_force(snapshot, source)
+                evaluated, scenarios = two_for_one(
+                    snapshot, source, self.CAP, limit=10)
+                self.assertEqual(evaluated, len(expected))
+                self.assertEqual([scenario[0] for scenario in scenarios],
+                                 expected[:10])
+
+    def test_process_pool_matches_in_process(self):
+        """
+        Test that parallel workers return the same results.
+        """
+        snapshot = load_snapshot()
+        sequential = top_scenarios(
+            simulate(snapshot, cap=self.CAP, limit=5), 5)
+        parallel = top_scenarios(
+            simulate(snapshot, cap=self.CAP, limit=5, workers=2), 5)
+        self.assertEqual(parallel, sequential)
+
+    def test_api_streams_ndjson(self):
+        """
+        Test the streamed scenarios of one source team.
+        """
+        response = self.client.get(reverse('simulate-trades'), {
+            'team': 'AAA', 'cap': self.CAP, 'limit': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = [json.loads(line) for line in
+                 b''.join(response.streaming_content).splitlines()]
+        *scenarios, summary = lines
+        self.assertEqual(len(scenarios), 3)
+        self.assertTrue(all(scenario['teams'][0] == "AAA"
+                            for scenario in scenarios))
+        self.assertTrue(all(max(scenario['payroll_after']) <= self.CAP
+                            for scenario in scenarios))
+        balances = [scenario['balance'] for scenario in scenarios]
+        self.assertEqual(balances, sorted(balances))
+        self.assertGreaterEqual(summary['evaluated'], 3)
+
+    async def test_api_streams_under_asgi(self):
+        """
+        Test that under ASGI the scenarios are streamed by an async
+        iterator with the same lines.
+        """
+        url = reverse('simulate-trades')
+        params = {'team': 'AAA', 'cap': self.CAP, 'limit': 3}
+        response = await self.async_client.get(url, params)
+        self.assertTrue(response.is_async)
+        lines = [line async for line in response.streaming_content]
+        self.assertEqual(len(lines), 4)
+        self.assertIn(b'"evaluated"', lines[-1])
+
+    def test_api_rejects_bad_parameters(self):
+        """
+        Test invalid parameters and unknown teams.
+        """
+        url = reverse('simulate-trades')
+        response = self.client.get(url, {'limit': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'team': 'XYZ'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command_prints_league_ranking(self):
+        """
+        Test the simulate_trades management command with --top.
+        """
+        out = StringIO()
+        call_command('simulate_trades', cap=self.CAP, top=4, stdout=out,
+                     stderr=StringIO())
+        scenarios = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(scenarios), 4)
+        balances = [scenario['balance'] for scenario in scenarios]
+        self.assertEqual(balances, sorted(balances))
+
+    def test_zero_limit(self):
+        """
+        Test that the command rejects a limit below 1 and that the search
+        itself keeps nothing for a limit of 0.
+        """
+        for options in ({'limit': 0, 'top': 0}, {'top': -1}):
+            with self.subTest(options=options):
+                with self.assertRaises(CommandError):
+                    call_command('simulate_trades', cap=self.CAP,
+                                 stdout=StringIO(), stderr=StringIO(),
+                                 **options)
+
+        snapshot = load_snapshot()
+        self.assertEqual(two_for_one(snapshot, 0, self.CAP, limit=0)[1], [])
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from ..retry import retry_on_busy, is_busy_error
+
+
+@override_settings(SQLITE_BUSY_RETRIES=2, SQLITE_BUSY_BACKOFF=0)
+class RetryOnBusyTests(SimpleTestCase):
+    """
+    Unit tests for the retry_on_busy decorator.
+    """
+
+    def flaky(self, errors):
+        """
+        Return a decorated function raising `errors` in turn, then "ok",
+        and the mock counting its calls.
+        """
+        function = mock.Mock(side_effect=[*errors, "ok"])
+        return retry_on_busy(function), function
+
+    def test_retries_busy_errors(self):
+        """
+        A locked database is retried until the call succeeds.
+        """
+        wrapped, function = self.flaky([OperationalError("database is locked")] * 2)
+        self.assertEqual(wrapped(), "ok")
+        self.assertEqual(function.call_count, 3)
+
+    def test_gives_up_after_retries(self):
+        """
+        The error is raised once every retry failed.
+        """
+        wrapped, function = self.flaky([OperationalError("database is locked")] * 3)
+        with self.assertRaises(OperationalError):
+            wrapped()
+        self.assertEqual(function.call_count, 3)
+
+    def test_other_errors_are_not_retried(self):
+        """
+        Operational errors other than a lock are raised right away.
+        """
+        wrapped, function = self.flaky([OperationalError("no such table: x")])
+        with self.assertRaises(OperationalError):
+            wrapped()
+        self.assertEqual(function.call_count, 1)
+        self.assertFalse(is_busy_error(ValueError("database is locked")))
+
+
+class SqlitePragmaTests(TestCase):
+    """
+    Check that the connection PRAGMAs from settings are applied.
+    """
+
+    def test_pragmas(self):
+        """
+        Connections use WAL with synchronous=NORMAL.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute("PRAGMA synchronous")
+            # 1 is NORMAL
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_no_retry_inside_outer_transaction(self):
+        """
+        Inside a caller's transaction the error is left to the caller.
+        """
+        function = mock.Mock(side_effect=OperationalError("database is locked"))
+        with self.assertRaises(OperationalError):
+            retry_on_busy(function)()
+        self.assertEqual(function.call_count, 1)
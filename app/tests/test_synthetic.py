@@ -0,0 +1,146 @@
+import csv
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.test import TestCase, SimpleTestCase
+from ..models import Team, Player
+from .. import synthetic
+from ..versions import current_version
+
+
+class GeneratorTests(SimpleTestCase):
+    """
+    Unit tests for the deterministic player and team generators.
+    """
+
+    def test_same_seed_same_league(self):
+        """
+        Test that a seed always produces the same players, and another
+        seed a different league.
+        """
+        first = list(synthetic.generate_players(200, ['AAA', 'BBB'], seed=3))
+        again = list(synthetic.generate_players(200, ['AAA', 'BBB'], seed=3))
+        other = list(synthetic.generate_players(200, ['AAA', 'BBB'], seed=4))
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, other)
+
+    def test_unique_names_and_codes(self):
+        """
+        Test that names and codes stay unique once every first and last
+        name pair has been used and initials and suffixes kick in.
+        """
+        pairs = len(synthetic.FIRST_NAMES) * len(synthetic.LAST_NAMES)
+        players = list(synthetic.generate_players(pairs + 500, ['AAA']))
+        names = [player['name'] for player in players]
+        self.assertEqual(len(set(names)), len(names))
+        self.assertEqual(len({player['code'] for player in players}),
+                         len(players))
+        self.assertRegex(names[-1], r'^\S+ A\. \S+$')
+
+        # Past 26 initials, generational suffixes keep names unique
+        name = synthetic.player_name(28 * pairs, 1, 0)[2]
+        self.assertTrue(name.endswith(" B. Adams II"))
+
+    def test_salaries_within_contract_limits(self):
+        """
+        Test that salaries are skewed but never leave the contract range.
+        """
+        salaries = sorted(player['salary'] for player
+                          in synthetic.generate_players(5000, ['AAA']))
+        self.assertGreaterEqual(salaries[0], synthetic.SALARY_MIN)
+        self.assertLessEqual(salaries[-1], synthetic.SALARY_MAX)
+        # Most players earn well under the mean of the range
+        self.assertLess(salaries[len(salaries) // 2], 10000000)
+
+    def test_generate_teams(self):
+        """
+        Test that real teams come first and extra teams get unused codes.
+        """
+        teams = synthetic.generate_teams(40)
+        codes = [team['code'] for team in teams]
+        self.assertEqual(teams[:30], synthetic.read_csv_teams())
+        self.assertEqual(len(set(codes)), 40)
+
+    def test_rejects_bad_arguments(self):
+        """
+        Test that impossible sizes and empty leagues are refused.
+        """
+        with self.assertRaises(ValueError):
+            next(synthetic.generate_players(synthetic.MAX_PLAYERS + 1, ['AAA']))
+        with self.assertRaises(ValueError):
+            next(synthetic.generate_players(10, []))
+
+
+class GenerateLeagueTests(TestCase):
+    """
+    Unit tests for writing generated leagues to CSV and the database.
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary output directory.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def test_csv_round_trips_through_import(self):
+        """
+        Test that the CSV output imports with import_roster and matches
+        the payrolls written to teams.csv.
+        """
+        call_command('generate_league', 300, '--teams', 32, '--seed', 1,
+                     '--csv', self.tmp_dir, stdout=StringIO())
+        players_path = os.path.join(self.tmp_dir, 'players.csv')
+        teams_path = os.path.join(self.tmp_dir, 'teams.csv')
+        with open(teams_path, newline='', encoding='utf-8') as csvfile:
+            payrolls = {row['Code']: int(row['Payroll'])
+                        for row in csv.DictReader(csvfile)}
+
+        call_command('import_roster', teams_path, '--kind', 'teams',
+                     stdout=StringIO())
+        call_command('import_roster', players_path, stdout=StringIO())
+
+        self.assertEqual(Team.objects.count(), 32)
+        self.assertEqual(Player.objects.count(), 300)
+        salaries = dict(Player.objects.values_list('team__code').annotate(
+            total=Sum('salary')))
+        self.assertEqual(salaries, {code: payroll for code, payroll
+                                    in payrolls.items() if payroll})
+
+    def test_database_payrolls(self):
+        """
+        Test that database mode creates every player and payrolls that
+        add up the salaries of signed players only.
+        """
+        out = StringIO()
+        call_command('generate_league', 1000, '--teams', 5,
+                     '--batch-size', 300, stdout=out)
+
+        self.assertEqual(Player.objects.count(), 1000)
+        free_agents = Player.objects.filter(free_agent=True).count()
+        self.assertGreater(free_agents, 0)
+        self.assertIn(f"({free_agents} free agents)", out.getvalue())
+        for team in Team.objects.all():
+            signed = Player.objects.filter(
+                team=team, free_agent=False).aggregate(total=Sum('salary'))
+            self.assertEqual(team.payroll, signed['total'])
+
+        # Teams, players and payrolls are written under one change version
+        self.assertEqual(
+            set(Team.objects.values_list('version', flat=True))
+            | set(Player.objects.values_list('version', flat=True)),
+            {current_version()})
+
+    def test_refuses_populated_database(self):
+        """
+        Test that database mode never mixes generated and existing players.
+        """
+        team = Team.objects.create(name="Team A", code="TMA", payroll=0)
+        Player.objects.create(name="Player One", team=team, salary=1)
+        with self.assertRaises(CommandError):
+            call_command('generate_league', 10, stdout=StringIO())
+        self.assertEqual(Player.objects.count(), 1)
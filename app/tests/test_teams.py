@@ -123,3 +123,20 @@ class TeamViewTests(TestCase):
         # Only non-free agents
         self.assertEqual(len(response.data['players']), 1)
         self.assertEqual(response.data['players'][0]['name'], 'Player One')
+
+    def test_single_team_view_expand_team(self):
+        """
+        Test that ?expand=team nests the team object inside each player.
+        """
+        url = reverse('team-players', args=[self.team1.code])
+
+        # Send GET request asking for the expanded representation
+        response = self.client.get(url, {'expand': 'team'})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['players'][0]['team'], {
+            'id': self.team1.id,
+            'name': 'Team One',
+            'code': 'T01',
+            'payroll': 500000,
+        })
@@ -0,0 +1,145 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Team, Player
+from ..trades import check_salary_matching, salary_rules
+
+
+@override_settings(TRADE_SALARY_CAP=100000000, TRADE_SALARY_MATCH_RATIO=1.25,
+                   TRADE_SALARY_MATCH_BUFFER=100000)
+class TradeTests(TestCase):
+    """
+    Unit tests for the multi-team trade endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up three teams with a signed player each and a free agent.
+        """
+        self.gsw = Team.objects.create(name="Warriors", code="GSW", payroll=90000000)
+        self.lal = Team.objects.create(name="Lakers", code="LAL", payroll=95000000)
+        self.bos = Team.objects.create(name="Celtics", code="BOS", payroll=40000000)
+        self.curry = Player.objects.create(name="Stephen Curry", team=self.gsw,
+                                           salary=50000000, free_agent=False)
+        self.james = Player.objects.create(name="LeBron James", team=self.lal,
+                                           salary=45000000, free_agent=False)
+        self.tatum = Player.objects.create(name="Jayson Tatum", team=self.bos,
+                                           salary=30000000, free_agent=False)
+        self.free = Player.objects.create(name="Free Agent", team=self.bos,
+                                          salary=1000000, free_agent=True)
+        self.client = APIClient()
+
+    def trade(self, moves, **extra):
+        """
+        Post a trade proposal given as (player, team code) pairs.
+        """
+        return self.client.post(reverse('trades'), dict(extra, moves=[
+            {'player': player.id, 'team': code} for player, code in moves
+        ]), format='json')
+
+    def payrolls(self):
+        """
+        Current payroll of every team by code.
+        """
+        return dict(Team.objects.values_list('code', 'payroll'))
+
+    def test_salary_matching_rule(self):
+        """
+        Test the cap and the over-the-cap matching rule.
+        """
+        rules = salary_rules()
+        # Stays under the cap, so anything goes
+        self.assertTrue(check_salary_matching(10000000, 0, 5000000, rules))
+        # Over the cap: 125% of outgoing plus the buffer
+        self.assertTrue(check_salary_matching(99000000, 8000000, 10100000, rules))
+        self.assertFalse(check_salary_matching(99000000, 8000000, 10100001, rules))
+
+    def test_two_team_trade(self):
+        """
+        Test swapping two players moves them and both payrolls.
+        """
+        response = self.trade([(self.curry, 'LAL'), (self.james, 'GSW')])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['executed'])
+
+        self.curry.refresh_from_db()
+        self.james.refresh_from_db()
+        self.assertEqual(self.curry.team, self.lal)
+        self.assertEqual(self.james.team, self.gsw)
+        self.assertEqual(self.payrolls(), {
+            'GSW': 85000000, 'LAL': 100000000, 'BOS': 40000000})
+
+    def test_three_team_trade(self):
+        """
+        Test a rotation between three teams.
+        """
+        response = self.trade([(self.curry, 'BOS'), (self.tatum, 'LAL'),
+                               (self.james, 'GSW')])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['teams']), 3)
+        self.assertEqual(self.payrolls(), {
+            'GSW': 85000000, 'LAL': 80000000, 'BOS': 60000000})
+
+    def test_dry_run(self):
+        """
+        Test that a dry run reports the result without applying it.
+        """
+        response = self.trade([(self.curry, 'LAL'), (self.james, 'GSW')],
+                              dry_run=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['executed'])
+        after = {team['code']: team['payroll_after']
+                 for team in response.data['teams']}
+        self.assertEqual(after, {'GSW': 85000000, 'LAL': 100000000})
+
+        self.curry.refresh_from_db()
+        self.assertEqual(self.curry.team, self.gsw)
+        self.assertEqual(self.payrolls()['GSW'], 90000000)
+
+    def test_salary_rule_rejects_whole_trade(self):
+        """
+        Test that an over-the-cap team taking back too much salary makes
+        the trade fail without changing anything.
+        """
+        # LAL would go to 125M taking 30M back for nothing
+        response = self.trade([(self.tatum, 'LAL')])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("LAL", response.data['errors'][0])
+
+        self.tatum.refresh_from_db()
+        self.assertEqual(self.tatum.team, self.bos)
+        self.assertEqual(self.payrolls()['LAL'], 95000000)
+
+    def test_invalid_proposals(self):
+        """
+        Test the proposals rejected before anything is written.
+        """
+        for moves in ([(self.free, 'GSW')],
+                      [(self.curry, 'XYZ')],
+                      [(self.curry, 'GSW')],
+                      [(self.curry, 'BOS'), (self.curry, 'LAL')]):
+            with self.subTest(moves=moves):
+                response = self.trade(moves)
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+
+        for moves in ([], [{'player': 10 ** 30, 'team': 'GSW'}]):
+            with self.subTest(moves=moves):
+                response = self.client.post(reverse('trades'),
+                                            {'moves': moves}, format='json')
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.payrolls()['GSW'], 90000000)
+
+    def test_trade_invalidates_rosters(self):
+        """
+        Test that cached rosters reflect a trade immediately.
+        """
+        url = reverse('team-players', args=[self.gsw.code])
+        self.client.get(url)
+        self.trade([(self.curry, 'LAL'), (self.james, 'GSW')])
+
+        response = self.client.get(url)
+        self.assertEqual([player['name'] for player in response.data['players']],
+                         ["LeBron James"])
@@ -0,0 +1,194 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Case, When, Value, IntegerField
+
+from .models import Team, Player
+from .payroll import apply_payroll_deltas
+from .cache import invalidate_teams
+from .versions import next_version
+from .events import publish_on_commit
+
+# Defaults for the salary matching rules, overridable in settings.py
+DEFAULT_SALARY_CAP = 136021000
+DEFAULT_MATCH_RATIO = 1.25
+DEFAULT_MATCH_BUFFER = 100000
+
+
+class TradeError(Exception):
+    """
+    Raised when a trade proposal is invalid or breaks a salary rule.
+
+    Attributes:
+        errors: List of human readable reasons
+    """
+
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def salary_rules():
+    """
+    Read the salary matching rules from settings.
+
+    Returns:
+        dict with cap, ratio and buffer
+    """
+    return {
+        'cap': getattr(settings, 'TRADE_SALARY_CAP', DEFAULT_SALARY_CAP),
+        'ratio': getattr(settings, 'TRADE_SALARY_MATCH_RATIO', DEFAULT_MATCH_RATIO),
+        'buffer': getattr(settings, 'TRADE_SALARY_MATCH_BUFFER', DEFAULT_MATCH_BUFFER),
+    }
+
+
+def check_salary_matching(payroll, outgoing, incoming, rules):
+    """
+    Check one team's side of a trade against the salary matching rules.
+
+    A team may take on any salary as long as it stays under the cap.
+    Once over the cap, incoming salary is limited to ratio times the
+    outgoing salary plus a fixed buffer.
+
+    Args:
+        payroll: Current team payroll
+        outgoing: Total salary the team sends away
+        incoming: Total salary the team receives
+        rules: dict from salary_rules()
+
+    Returns:
+        True when the team's side is allowed
+    """
+    if payroll - outgoing + incoming <= rules['cap']:
+        return True
+    return incoming <= outgoing * rules['ratio'] + rules['buffer']
+
+
+def evaluate_trade(moves, players, teams, rules=None):
+    """
+    Validate a proposal and compute its effect on every team involved.
+
+    Works purely on already loaded rows, so it issues no queries.
+
+    Args:
+        moves: List of (player_id, team_code) pairs
+        players: dict of player id to Player
+        teams: dict of team id to Team, covering source and destination
+        rules: Optional rules dict, defaults to salary_rules()
+
+    Returns:
+        dict of team id to a summary with code, payroll_before,
+        payroll_after, outgoing and incoming
+
+    Raises:
+        TradeError: If the proposal is invalid
+    """
+    rules = rules or salary_rules()
+    team_ids = {team.code: team_id for team_id, team in teams.items()}
+    errors = []
+
+    outgoing = defaultdict(int)
+    incoming = defaultdict(int)
+    for player_id, code in moves:
+        player = players.get(player_id)
+        if player is None:
+            errors.append(f"Player {player_id} does not exist.")
+            continue
+        if player.free_agent:
+            errors.append(f"{player.name} is a free agent and cannot be traded.")
+            continue
+        if code not in team_ids:
+            errors.append(f"Team {code} does not exist.")
+            continue
+        if team_ids[code] == player.team_id:
+            errors.append(f"{player.name} already plays for {code}.")
+            continue
+        outgoing[player.team_id] += player.salary
+        incoming[team_ids[code]] += player.salary
+
+    involved = set(outgoing) | set(incoming)
+    if not errors and len(involved) < 2:
+        errors.append("A trade needs at least two teams.")
+
+    summary = {}
+    for team_id in sorted(involved):
+        team = teams[team_id]
+        summary[team_id] = {
+            'code': team.code,
+            'payroll_before': team.payroll,
+            'payroll_after': team.payroll - outgoing[team_id] + incoming[team_id],
+            'outgoing': outgoing[team_id],
+            'incoming': incoming[team_id],
+        }
+        if not check_salary_matching(team.payroll, outgoing[team_id],
+                                     incoming[team_id], rules):
+            errors.append(
+                f"{team.code} is over the cap and takes back "
+                f"{incoming[team_id]} for {outgoing[team_id]} outgoing.")
+
+    if errors:
+        raise TradeError(errors)
+    return summary
+
+
+def execute_trade(moves, dry_run=False):
+    """
+    Validate and apply a multi-team trade in one transaction.
+
+    The cost is a constant number of queries whatever the size of the
+    proposal: one locking SELECT for the players, one SELECT for the teams,
+    two to reserve a change version, one UPDATE of every Player.team and
+    one UPDATE of every payroll.
+
+    Args:
+        moves: List of (player_id, team_code) pairs
+        dry_run: Evaluate the trade without writing anything
+
+    Returns:
+        (players, summary) where players are the moved Player instances
+        and summary is the per-team result of evaluate_trade()
+
+    Raises:
+        TradeError: If the proposal is invalid
+    """
+    player_ids = [player_id for player_id, _ in moves]
+    if len(set(player_ids)) != len(player_ids):
+        raise TradeError(["A player can only be moved once per trade."])
+
+    with transaction.atomic():
+        players = Player.objects.select_for_update().in_bulk(player_ids)
+        teams = Team.objects.filter(
+            Q(code__in={code for _, code in moves})
+            | Q(id__in={player.team_id for player in players.values()})
+        ).in_bulk()
+
+        summary = evaluate_trade(moves, players, teams)
+        if dry_run:
+            return list(players.values()), summary
+
+        # Group the players by destination so one CASE covers every move
+        version = next_version()
+        team_ids = {team.code: team_id for team_id, team in teams.items()}
+        destinations = defaultdict(list)
+        for player_id, code in moves:
+            players[player_id].team_id = team_ids[code]
+            players[player_id].version = version
+            destinations[team_ids[code]].append(player_id)
+        Player.objects.filter(id__in=player_ids).update(team_id=Case(
+            *[When(id__in=ids, then=Value(team_id))
+              for team_id, ids in destinations.items()],
+            output_field=IntegerField(),
+        ), version=version)
+
+        deltas = {
+            team_id: result['payroll_after'] - result['payroll_before']
+            for team_id, result in summary.items()
+        }
+        apply_payroll_deltas(deltas, version)
+
+        # Salary neutral sides get no payroll delta but their rosters changed
+        invalidate_teams(summary)
+        publish_on_commit('trade', version, players.values(), deltas)
+
+    return list(players.values()), summary
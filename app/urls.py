@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import home_page, TeamView, team_list_view, single_team_view, CutPlayerView, free_agents_list_view, sign_player_view, FreeAgentView, SignPlayer, SingleTeamView, create_player_view, CreatePlayer
+from .views import home_page, TeamView, team_list_view, single_team_view, CutPlayerView, PlayerByCodeView, free_agents_list_view, sign_player_view, FreeAgentView, SignPlayer, SingleTeamView, create_player_view, CreatePlayer, PayrollReconcileView, CacheStatsView, TradeView, TradeSimulationView, BulkRosterView, async_team_list_view, async_free_agents_view, async_single_team_view, ChangesView, event_stream_view, metrics_view, ExportView
 
 urlpatterns = [
     path("", home_page, name="home"),
@@ -16,5 +16,24 @@ urlpatterns = [
     path("player/<int:player_id>", sign_player_view, name="sign-player-html"),
     path("api/player/<int:player_id>", SignPlayer.as_view(), name="sign-player"),
     path("player/create", create_player_view, name="create-player-html"),
-    path("api/player/create", CreatePlayer.as_view(), name="create-player")
+    path("api/player/create", CreatePlayer.as_view(), name="create-player"),
+    path("api/players/bulk", BulkRosterView.as_view(), name="bulk-players"),
+    path("api/players/code/<str:player_code>", PlayerByCodeView.as_view(),
+         name="player-by-code"),
+    path("api/payroll/reconcile", PayrollReconcileView.as_view(),
+         name="payroll-reconcile"),
+    path("api/changes", ChangesView.as_view(), name="changes"),
+    path("api/events", event_stream_view, name="events"),
+    path("api/export/<str:table>.<str:export_format>", ExportView.as_view(),
+         name="export"),
+    path("metrics", metrics_view, name="metrics"),
+    path("api/cache/stats", CacheStatsView.as_view(), name="cache-stats"),
+    path("api/async/teams", async_team_list_view, name="async-teams"),
+    path("api/async/teams/<str:team_code>/players", async_single_team_view,
+         name="async-team-players"),
+    path("api/async/free-agents", async_free_agents_view,
+         name="async-free-agents"),
+    path("api/trades", TradeView.as_view(), name="trades"),
+    path("api/simulations/two-for-one", TradeSimulationView.as_view(),
+         name="simulate-trades")
 ]
@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models import F
+
+from .models import ChangeCounter
+
+# Primary key of the single ChangeCounter row
+COUNTER_ID = 1
+
+
+def next_version():
+    """
+    Reserve a new change version for the current write transaction.
+
+    The counter row is incremented in the database, so the row stays
+    locked until the transaction commits: a concurrent writer waits and
+    receives a larger version, which means versions are handed out in
+    commit order and a client syncing from version N never misses a row
+    committed later with a smaller one. Call it once per transaction and
+    stamp that version on every team and player the transaction writes.
+
+    Returns:
+        The new version number
+
+    Raises:
+        TransactionManagementError: If called outside transaction.atomic()
+    """
+    if not transaction.get_connection().in_atomic_block:
+        raise transaction.TransactionManagementError(
+            "next_version() must be called inside transaction.atomic().")
+
+    counter = ChangeCounter.objects.filter(id=COUNTER_ID)
+    if not counter.update(value=F('value') + 1):
+        # The row is created by a migration; recreate it if it went away
+        ChangeCounter.objects.create(id=COUNTER_ID, value=1)
+        return 1
+    return counter.values_list('value', flat=True).get()
+
+
+def current_version():
+    """
+    Return the last version handed out, without reserving one.
+    """
+    return (ChangeCounter.objects.filter(id=COUNTER_ID)
+            .values_list('value', flat=True).first() or 0)
@@ -1,3 +1,12 @@
 from .team_view import TeamView, team_list_view, single_team_view, SingleTeamView
-from .player_view import CutPlayerView, free_agents_list_view, sign_player_view, FreeAgentView, SignPlayer, create_player_view, CreatePlayer
+from .player_view import CutPlayerView, PlayerByCodeView, free_agents_list_view, sign_player_view, FreeAgentView, SignPlayer, create_player_view, CreatePlayer, BulkRosterView
 from .main_view import home_page
+from .payroll_view import PayrollReconcileView
+from .cache_view import CacheStatsView
+from .trade_view import TradeView
+from .simulation_view import TradeSimulationView
+from .async_view import async_team_list_view, async_free_agents_view, async_single_team_view
+from .changes_view import ChangesView
+from .event_view import event_stream_view
+from .metrics_view import metrics_view
+from .export_view import ExportView
@@ -0,0 +1,106 @@
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework import status
+
+from ..models import Team, Player
+from ..serializers import TeamSerializer, PlayerSerializer, ExpandedPlayerSerializer, wants_expanded_team
+from ..metrics import span
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    """
+    Render data exactly like the DRF views do, so the sync and async
+    endpoints return byte-identical bodies.
+    """
+    with span('render'):
+        content = JSONRenderer().render(data)
+    return HttpResponse(content, status=status_code,
+                        content_type='application/json')
+
+
+async def async_team_list_view(request):
+    """
+    Async version of TeamView.
+
+    Runs natively under ASGI: the teams are read with the async ORM
+    instead of handing the whole view to a worker thread. Parameters for
+    pagination are not supported here; use /api/teams for those.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        JSON list of every team
+    """
+    # Retrieve all Team objects with the async ORM
+    teams = [team async for team in Team.objects.all()]
+
+    # Serialize in memory; no query is issued past this point
+    with span('serialize'):
+        data = TeamSerializer(teams, many=True).data
+    return json_response(data)
+
+
+async def async_free_agents_view(request):
+    """
+    Async version of FreeAgentView.
+
+    Supports ?expand=team; filters and pagination stay on
+    /api/free-agents.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        JSON list of every free agent
+    """
+    # Query only players marked as free agents, joining the team if nested
+    players = Player.objects.filter(free_agent=True)
+    if wants_expanded_team(request):
+        players = players.select_related('team')
+    players = [player async for player in players]
+
+    # Serialize the players, nesting the team when requested
+    serializer_class = (ExpandedPlayerSerializer
+                        if wants_expanded_team(request) else PlayerSerializer)
+    with span('serialize'):
+        data = serializer_class(players, many=True).data
+    return json_response(data)
+
+
+async def async_single_team_view(request, team_code):
+    """
+    Async version of SingleTeamView.
+
+    The team and its roster are read one after the other: the async ORM
+    runs every query on the same worker thread, so awaiting them together
+    would not overlap them. The roster is only read once the team exists.
+
+    Args:
+        request: HTTP request object
+        team_code: Unique identifier for the team
+
+    Returns:
+        JSON response with team and player information
+    """
+    try:
+        team = await Team.objects.aget(code=team_code)
+    except Team.DoesNotExist:
+        return json_response({"error": "Cannot find team"},
+                             status.HTTP_404_NOT_FOUND)
+
+    # Query only signed players, joining the team if nested
+    players = Player.objects.filter(team=team, free_agent=False)
+    if wants_expanded_team(request):
+        players = players.select_related('team')
+    roster = [player async for player in players]
+
+    # Serialize the players, nesting the team when requested
+    serializer_class = (ExpandedPlayerSerializer
+                        if wants_expanded_team(request) else PlayerSerializer)
+    with span('serialize'):
+        data = {
+            "team": TeamSerializer(team).data,
+            "players": serializer_class(roster, many=True).data,
+        }
+    return json_response(data, status.HTTP_202_ACCEPTED)
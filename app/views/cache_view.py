@@ -0,0 +1,16 @@
+from ..cache import cache_stats
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class CacheStatsView(APIView):
+    """
+    API view exposing the roster cache hit and miss counters.
+
+    Counters are per server process and cover every cached team, roster
+    and free agent payload since the process started.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return Response(cache_stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,71 @@
+from ..models import Team, Player
+from ..serializers import ChangesParamsSerializer
+from ..pagination import ChangeFeedPagination
+from ..fast import TEAM_FIELDS, PLAYER_FIELDS
+from ..versions import current_version
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ChangesView(APIView):
+    """
+    API view returning the teams and players changed since a version.
+
+    A client keeps the "version" of its last sync and asks for
+    /api/changes?since=<version>; only rows written after that version are
+    read, through the version indexes. Without ?since= every row is
+    returned (a full sync).
+
+    Players are paginated by (version, id): while "next" is set the client
+    follows it, then stores "version" for the next sync. Teams are small
+    and sent in full on the last page only, read after the version that
+    page returns, so a team changed while the client was paging is not
+    lost.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handle GET request for the change feed.
+
+        Args:
+            request: HTTP request object
+
+        Returns:
+            JSON response with the current version and the changed rows
+        """
+        params = ChangesParamsSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        since = params.validated_data.get('since')
+
+        # Read the version first: every version up to it is committed, so
+        # rows read below are at least this recent, and rows written in the
+        # meantime are simply sent again by the next sync
+        version = current_version()
+
+        teams = Team.objects.all()
+        players = Player.objects.all()
+        if since is not None:
+            teams = teams.filter(version__gt=since)
+            players = players.filter(version__gt=since)
+
+        paginator = ChangeFeedPagination()
+        players = paginator.paginate_queryset(
+            players.values(*PLAYER_FIELDS, 'version'), request, view=self)
+
+        # Teams only go out with the last page of players, the one whose
+        # version the client stores
+        next_link = paginator.get_next_link()
+        if next_link is not None:
+            teams = []
+        else:
+            teams = list(teams.order_by('version', 'id')
+                         .values(*TEAM_FIELDS, 'version'))
+
+        return Response({
+            "version": version,
+            "teams": teams,
+            "players": players,
+            "next": next_link,
+        })
@@ -0,0 +1,97 @@
+import asyncio
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from ..events import get_broker
+
+
+def last_event_id(request):
+    """
+    Read the id to resume from: the Last-Event-ID header sent by
+    EventSource on reconnect, or ?last_event_id= for the first connection.
+
+    Returns:
+        The id as an int, or None when absent or malformed
+    """
+    raw = (request.headers.get('Last-Event-ID')
+           or request.GET.get('last_event_id'))
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+async def event_stream(subscriber, replay, last_id):
+    """
+    Yield Server-Sent Events for one subscriber until it disconnects.
+
+    Args:
+        subscriber: Subscriber registered with the broker
+        replay: Buffered events to send first, or None when the client
+            is too far behind and has to resync
+        last_id: Id of the last event the client received, if any
+    """
+    broker = get_broker()
+    # Publish position of the last event sent
+    sent = 0
+    try:
+        yield f"retry: {settings.EVENT_STREAM_RETRY_MS}\n\n".encode()
+        if replay is None:
+            # Events were lost; the client resyncs with /api/changes
+            yield f"event: reset\ndata: {{\"since\": {last_id}}}\n\n".encode()
+            replay = []
+        for event in replay:
+            sent = event.sequence
+            yield event.encoded
+
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(), settings.EVENT_STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection
+                yield b": keep-alive\n\n"
+                continue
+            if event is None:
+                # Too slow to keep up: close, the client replays on reconnect
+                return
+            if event.sequence <= sent:
+                # Already sent by the replay; ids are not compared since
+                # a later event can carry a lower id
+                continue
+            yield event.encoded
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+async def event_stream_view(request):
+    """
+    Stream roster and payroll changes as Server-Sent Events.
+
+    Every cut, signing, player creation, bulk operation and trade is
+    pushed as one event whose id is the change version of the write and
+    whose data holds the written players and the payroll change of every
+    affected team. Reconnecting clients send Last-Event-ID and receive the
+    events they missed; when those are no longer buffered a "reset" event
+    asks them to resync from /api/changes?since=<id>.
+
+    Runs natively under ASGI (tradeMachine/asgi.py); every connection is
+    one coroutine waiting on its queue, not a thread.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        Streaming text/event-stream response
+    """
+    last_id = last_event_id(request)
+    subscriber, replay = get_broker().subscribe(last_id)
+
+    response = StreamingHttpResponse(
+        event_stream(subscriber, replay, last_id),
+        content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Disable response buffering in nginx
+    response['X-Accel-Buffering'] = 'no'
+    return response
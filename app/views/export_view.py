@@ -0,0 +1,54 @@
+from django.http import StreamingHttpResponse
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+
+from .. import export
+from ..streaming import streaming_content
+from ..versions import current_version
+
+
+class ExportView(APIView):
+    """
+    API view streaming a whole table for bulk analytics.
+
+    /api/export/<table>.<format> dumps every team or player in one
+    response instead of paging through the list endpoints: 'csv' in the
+    csv/ import layout, 'ndjson' with one object per row, or 'columnar'
+    with one line of column arrays per row group (see app.export). Rows
+    are read with a server-side cursor and encoded a chunk at a time, so
+    memory use stays flat whatever the size of the league, under WSGI
+    and ASGI alike.
+
+    The X-Change-Version header holds the change version read before the
+    rows; /api/changes?since=<version> brings the export up to date.
+    """
+
+    def get(self, request, table, export_format, *args, **kwargs):
+        """
+        Handle GET request for an export.
+
+        Args:
+            request: HTTP request object
+            table: 'teams' or 'players'
+            export_format: 'csv', 'ndjson' or 'columnar'
+
+        Returns:
+            Streaming download of the table
+        """
+        if table not in export.TABLES or export_format not in export.FORMATS:
+            return Response(
+                {"error": f"Cannot export {table} as {export_format}"},
+                status=status.HTTP_404_NOT_FOUND)
+
+        # Read the version first, as the change feed does
+        version = current_version()
+
+        _, content_type = export.FORMATS[export_format]
+        response = StreamingHttpResponse(
+            streaming_content(request, export.export(table, export_format)),
+            content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{table}.{export_format}"')
+        response['X-Change-Version'] = str(version)
+        return response
@@ -0,0 +1,21 @@
+from django.http import HttpResponse
+
+from .. import metrics
+
+
+def metrics_view(request):
+    """
+    Expose the per-view request histograms for Prometheus to scrape.
+
+    Covers the requests sampled by InstrumentationMiddleware in this
+    server process: request, DB, serialization and render time, query
+    counts, and their estimated p50/p95/p99.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    return HttpResponse(metrics.registry.render_prometheus(),
+                        content_type='text/plain; version=0.0.4; charset=utf-8')
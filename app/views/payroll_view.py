@@ -0,0 +1,25 @@
+from ..payroll import reconcile_payroll
+from ..retry import retry_on_busy
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class PayrollReconcileView(APIView):
+    """
+    API view to compare stored team payrolls with their actual rosters.
+
+    - GET reports every team whose payroll drifted from SUM(salary)
+    - POST reports the drift and rewrites the drifted payrolls
+
+    Both run in a constant number of queries regardless of league size.
+    """
+
+    def get(self, request, *args, **kwargs):
+        # Report drift without changing anything
+        return Response(reconcile_payroll(fix=False), status=status.HTTP_200_OK)
+
+    @retry_on_busy
+    def post(self, request, *args, **kwargs):
+        # Report drift and fix it with one bulk update
+        return Response(reconcile_payroll(fix=True), status=status.HTTP_200_OK)
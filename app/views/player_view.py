@@ -1,7 +1,19 @@
 from rest_framework.generics import ListAPIView
 from ..models import Team, Player
-from ..serializers import TeamSerializer, PlayerSerializer
-from django.shortcuts import render, redirect
+from ..serializers import PlayerSerializer, ExpandedPlayerSerializer, wants_expanded_team, BulkRosterSerializer, BulkOperationSerializer
+from ..pagination import KeysetPagination, PLAYER_ORDERINGS
+from ..filters import PlayerFilterBackend
+from .. import cache
+from ..conditional import ConditionalGetMixin
+from ..fast import FastListMixin, player_values, player_rows
+from django.http import HttpResponse
+from ..payroll import payroll_contribution, payroll_deltas, apply_payroll_deltas
+from ..bulk_ops import apply_operations, ATOMIC
+from ..versions import next_version
+from ..events import publish_on_commit
+from ..retry import retry_on_busy
+from django.db import transaction
+from django.shortcuts import render, redirect, get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
@@ -15,52 +27,124 @@ class CutPlayerView(APIView):
     Allows updating a player's free agent status and adjusting team payroll 
     accordingly when a player is cut or re-signed.
     """
+    # Player field matched against the URL keyword argument
+    lookup_field = 'id'
+    lookup_url_kwarg = 'player_id'
+
+    @retry_on_busy
+    def patch(self, request, *args, **kwargs):
+        with transaction.atomic():
+            # Retrieve and lock the specific player to be modified
+            player = get_object_or_404(
+                Player.objects.select_for_update(),
+                **{self.lookup_field: kwargs[self.lookup_url_kwarg]})
+
+            # Remember what the player counted toward payroll before the change
+            before = payroll_contribution(player)
+
+            # Validate and save player updates (e.g., free agent status)
+            serialized_player = PlayerSerializer(
+                player, request.data, partial=True)
+            if not serialized_player.is_valid():
+                return Response(serialized_player.errors,
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            # Stamp the player and any team payroll with one change version
+            version = next_version()
+            serialized_player.save(version=version)
+
+            # Move the salary between payrolls atomically in the database.
+            # Repeating a cut has no effect because nothing changed.
+            deltas = payroll_deltas(before, payroll_contribution(player))
+            apply_payroll_deltas(deltas, version)
+
+            # Tell the event stream once the change is committed
+            publish_on_commit('cut', version, [player], deltas)
 
-    def patch(self, request, player_id, *args, **kwargs):
-        # Retrieve the specific player to be modified
-        player = Player.objects.get(id=player_id)
+        # Return updated player data
+        return Response(serialized_player.data, status=status.HTTP_202_ACCEPTED)
 
-        # Validate and save player updates (e.g., free agent status)
-        serialized_player = PlayerSerializer(
-            player, request.data, partial=True)
-        if serialized_player.is_valid():
-            serialized_player.save()
 
-        # Retrieve the player's team and its current serialized data
-        team = Team.objects.get(id=serialized_player.data['team'])
-        serialized_team = TeamSerializer(team)
+class PlayerByCodeView(CutPlayerView):
+    """
+    API view to read, cut or re-sign a player by their external code.
 
-        # Calculate new team payroll based on player's free agent status
-        if request.data['free_agent'] == "True":
-            # If player is cut, subtract their salary from team payroll
-            print(request.data['free_agent'])
-            new_payroll = serialized_team.data['payroll'] - \
-                serialized_player.data['salary']
-        else:
-            # If player is re-signed, add their salary back to team payroll
-            new_payroll = serialized_team.data['payroll'] + \
-                serialized_player.data['salary']
+    Codes come from the unique-code column of the roster files (e.g.
+    'curryst01') and are looked up through a unique index. GET returns
+    the player, with a nested team for ?expand=team, and PATCH works like
+    /api/player/<player_id>/FA.
+    """
+    lookup_field = 'code'
+    lookup_url_kwarg = 'player_code'
 
-        # Update team payroll
-        new_serialized_team = TeamSerializer(
-            team, {"payroll": new_payroll}, partial=True)
-        if new_serialized_team.is_valid():
-            new_serialized_team.save()
+    def get(self, request, player_code, *args, **kwargs):
+        # Join the team in the same query when it will be nested
+        if wants_expanded_team(request):
+            player = get_object_or_404(
+                Player.objects.select_related('team'), code=player_code)
+            return Response(ExpandedPlayerSerializer(player).data)
 
-        # Return updated player data
-        return Response(serialized_player.data, status=status.HTTP_202_ACCEPTED)
+        player = get_object_or_404(Player, code=player_code)
+        return Response(PlayerSerializer(player).data)
 
 
-class FreeAgentView(ListAPIView):
+class FreeAgentView(ConditionalGetMixin, FastListMixin, ListAPIView):
     """
     API view to list all free agent players.
 
     Provides a filtered queryset of players who are currently free agents.
+    Pass ?expand=team to receive nested team objects instead of team ids,
+    and ?page_size= / ?cursor= for keyset pagination ordered by
+    (salary, id) or, with ?ordering=name, by (name, id). Results can be
+    narrowed with ?min_salary=, ?max_salary=, ?name= (prefix) and
+    ?team=GSW,LAL. Rows are read with .values() instead of going through
+    the serializer.
     """
     # Query only players marked as free agents
     queryset = Player.objects.filter(free_agent=True)
     serializer_class = PlayerSerializer
 
+    # Validated salary, name, team and ordering filters
+    filter_backends = [PlayerFilterBackend]
+
+    # Opt-in keyset pagination
+    pagination_class = KeysetPagination
+    keyset_orderings = PLAYER_ORDERINGS
+    default_keyset_ordering = 'salary'
+
+    def get_queryset(self):
+        # Join the team in the same query when it will be nested
+        if wants_expanded_team(self.request):
+            return self.queryset.select_related('team')
+        return self.queryset.all()
+
+    def get_serializer_class(self):
+        if wants_expanded_team(self.request):
+            return ExpandedPlayerSerializer
+        return self.serializer_class
+
+    def get_version_scopes(self, request, *args, **kwargs):
+        # Nested teams also change when any team's payroll does
+        if wants_expanded_team(request):
+            return ['free-agents', 'teams']
+        return ['free-agents']
+
+    def to_values(self, queryset):
+        return player_values(queryset, wants_expanded_team(self.request))
+
+    def to_data(self, rows):
+        return player_rows(rows, wants_expanded_team(self.request))
+
+    def list(self, request, *args, **kwargs):
+        # Filtered, expanded or paginated requests skip the cache
+        build = super().list
+        if request.query_params:
+            return build(request, *args, **kwargs)
+
+        data = cache.get_or_build(
+            ('free-agents', 'api'), lambda: build(request, *args, **kwargs).data)
+        return Response(data)
+
 
 class FreeAgentForm(forms.Form):
     """
@@ -87,11 +171,15 @@ def free_agents_list_view(request):
 
     Retrieves all free agent players and passes them to the template.
     """
-    # Fetch all players marked as free agents
-    players = Player.objects.filter(free_agent=True)
+    def build():
+        # Fetch all players marked as free agents
+        players = Player.objects.filter(free_agent=True)
+
+        # Render the free agents template with the player list
+        return render(request, '../templates/free_agents.html', {'players': players}).content
 
-    # Render the free agents template with the player list
-    return render(request, '../templates/free_agents.html', {'players': players})
+    # Serve the rendered page from the roster cache when possible
+    return HttpResponse(cache.get_or_build(('free-agents', 'html'), build))
 
 
 def sign_player_view(request, player_id):
@@ -117,10 +205,8 @@ class SignPlayer(APIView):
     Validates the form, updates player team and status, and adjusts team payroll.
     """
 
+    @retry_on_busy
     def post(self, request, player_id, *args, **kwargs):
-        # Retrieve the specific player to be signed
-        player = Player.objects.get(id=player_id)
-
         # Validate the form submission
         form = FreeAgentForm(request.POST)
         if form.is_valid():
@@ -128,15 +214,27 @@ class SignPlayer(APIView):
             team = form.cleaned_data['team']
             salary = form.cleaned_data['salary']
 
-            # Update player information
-            player.team = team
-            player.salary = salary
-            player.free_agent = False
-            player.save()
+            with transaction.atomic():
+                # Retrieve and lock the specific player to be signed
+                player = get_object_or_404(
+                    Player.objects.select_for_update(), id=player_id)
+                before = payroll_contribution(player)
+
+                # Update player information, stamping a new change version
+                version = next_version()
+                player.team = team
+                player.salary = salary
+                player.free_agent = False
+                player.version = version
+                player.save(update_fields=['team', 'salary', 'free_agent',
+                                           'version'])
 
-            # Update team payroll
-            team.payroll += salary
-            team.save()
+                # Update team payroll atomically in the database
+                deltas = payroll_deltas(before, payroll_contribution(player))
+                apply_payroll_deltas(deltas, version)
+
+                # Tell the event stream once the change is committed
+                publish_on_commit('sign', version, [player], deltas)
 
             # Redirect to teams page after successful signing
             return redirect("/teams")
@@ -174,6 +272,7 @@ class CreatePlayer(APIView):
     Validates the form, creates a new player, and updates team payroll.
     """
 
+    @retry_on_busy
     def post(self, request, *args, **kwargs):
         # Validate the form submission
         form = NewPlayerForm(request.POST)
@@ -183,21 +282,30 @@ class CreatePlayer(APIView):
             team = form.cleaned_data['team']
             salary = form.cleaned_data['salary']
 
-            # Create the new player
-            player = Player.objects.create(
-                name=name,
-                team=team,
-                salary=salary,
-                free_agent=False
-            )
+            with transaction.atomic():
+                # Create the new player, stamped with a new change version
+                version = next_version()
+                player = Player.objects.create(
+                    name=name,
+                    team=team,
+                    salary=salary,
+                    free_agent=False,
+                    version=version
+                )
+
+                # Update team payroll atomically in the database
+                deltas = payroll_deltas(None, payroll_contribution(player))
+                apply_payroll_deltas(deltas, version)
 
-            # Update team payroll
-            team.payroll += salary
-            team.save()
+                # Tell the event stream once the change is committed
+                publish_on_commit('create', version, [player], deltas)
 
             # Redirect to teams page after successful creation
             return redirect("/teams")
 
+        # Return error if form is invalid
+        return Response({"error": "error creating player!"}, status=status.HTTP_400_BAD_REQUEST)
+
 
 def create_player_view(request):
     """
@@ -210,3 +318,67 @@ def create_player_view(request):
 
     # Render the create player template
     return render(request, '../templates/create_player.html', {'form': form})
+
+
+class BulkRosterView(APIView):
+    """
+    API view to cut, sign and create many players in one request.
+
+    Expects {"mode": "atomic" | "best_effort", "operations": [...]} where
+    each operation is described by BulkOperationSerializer. Every
+    operation is validated up front, then the batch is applied in one
+    transaction with bulk queries and a single payroll update. In atomic
+    mode (the default) one failing operation cancels the batch and the
+    response is 400; in best-effort mode the valid operations are applied.
+    The response lists the result of every operation in request order.
+    """
+
+    @retry_on_busy
+    def post(self, request, *args, **kwargs):
+        # Validate the envelope
+        envelope = BulkRosterSerializer(data=request.data)
+        if not envelope.is_valid():
+            return Response(envelope.errors, status=status.HTTP_400_BAD_REQUEST)
+        items = envelope.validated_data['operations']
+        mode = envelope.validated_data['mode']
+
+        # Validate the shape of every operation up front
+        checked = BulkOperationSerializer(data=items, many=True)
+        if checked.is_valid():
+            operations = list(checked.validated_data)
+            item_errors = [None] * len(items)
+        else:
+            item_errors = [errors or None for errors in checked.errors]
+            operations = [None] * len(items)
+            if mode != ATOMIC:
+                # Keep going with the operations that passed
+                valid = [index for index, errors in enumerate(item_errors)
+                         if errors is None]
+                revalidated = BulkOperationSerializer(
+                    data=[items[index] for index in valid], many=True)
+                revalidated.is_valid()
+                for index, operation in zip(valid, revalidated.validated_data):
+                    operations[index] = operation
+
+        # Check the operations against the database and apply them
+        applied, outcomes = apply_operations(operations, mode)
+
+        results = []
+        for index, (errors, outcome) in enumerate(zip(item_errors, outcomes)):
+            if errors is None and isinstance(outcome, str):
+                errors = {"non_field_errors": [outcome]}
+            if errors is not None:
+                results.append({"index": index, "status": "error",
+                                "errors": errors})
+            elif outcome is None:
+                # Valid, but not applied because the batch failed
+                results.append({"index": index, "status": "skipped"})
+            else:
+                results.append({"index": index, "status": "ok",
+                                "player": PlayerSerializer(outcome).data})
+
+        failed = any(result["status"] == "error" for result in results)
+        return Response(
+            {"applied": applied, "results": results},
+            status=status.HTTP_400_BAD_REQUEST if failed and mode == ATOMIC
+            else status.HTTP_200_OK)
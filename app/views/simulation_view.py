@@ -0,0 +1,57 @@
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..serializers import SimulationParamsSerializer
+from ..simulator import load_snapshot, simulate, top_scenarios, describe
+from ..streaming import streaming_content
+
+
+class TradeSimulationView(APIView):
+    """
+    API view sweeping every 2-for-1 trade that keeps both teams under a cap.
+
+    The league is loaded once per request with two queries; every scenario
+    is then evaluated in memory (optionally on a process pool, see
+    settings.SIMULATOR_WORKERS). Results are streamed as newline
+    delimited JSON, one scenario per line, ranked by salary balance within
+    each source team, followed by a summary line with the number of
+    trades evaluated.
+    """
+
+    def get(self, request, *args, **kwargs):
+        # Validate the query parameters
+        params = SimulationParamsSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        options = params.validated_data
+
+        # Load the league once and resolve the source teams
+        snapshot = load_snapshot()
+        try:
+            sources = [snapshot.index_of(code)
+                       for code in options.get('team', [])] or None
+        except KeyError as error:
+            return Response({"error": f"Cannot find team {error.args[0]}"},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        results = simulate(snapshot, sources=sources, cap=options.get('cap'),
+                           limit=options['limit'],
+                           workers=getattr(settings, 'SIMULATOR_WORKERS', 0))
+        if options['ranked']:
+            results = [top_scenarios(results, options['limit'])]
+
+        def lines():
+            evaluated = 0
+            for team_evaluated, scenarios in results:
+                evaluated += team_evaluated
+                for scenario in scenarios:
+                    yield json.dumps(describe(snapshot, scenario)) + '\n'
+            yield json.dumps({'evaluated': evaluated}) + '\n'
+
+        return StreamingHttpResponse(streaming_content(request, lines()),
+                                     content_type='application/x-ndjson')
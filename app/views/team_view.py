@@ -1,13 +1,20 @@
 from rest_framework.generics import ListAPIView
 from ..models import Team, Player
-from ..serializers import TeamSerializer, PlayerSerializer
+from ..serializers import TeamSerializer, PlayerSerializer, ExpandedPlayerSerializer, wants_expanded_team
+from ..pagination import KeysetPagination, PLAYER_ORDERINGS, TEAM_ORDERINGS
+from ..filters import PlayerFilterBackend
+from .. import cache
+from ..metrics import span
+from ..conditional import ConditionalGetMixin
+from ..fast import FastListMixin, fast_serialization_enabled, team_values, player_values, player_rows
+from django.http import HttpResponse
 from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.response import Response
 
 
-class TeamView(ListAPIView):
+class TeamView(ConditionalGetMixin, FastListMixin, ListAPIView):
     """
     API view to retrieve and list all teams.
 
@@ -17,6 +24,10 @@ class TeamView(ListAPIView):
     - Uses ListAPIView for automatic list rendering
     - Retrieves all Team objects
     - Serializes teams using TeamSerializer
+    - Keyset pagination with ?page_size= / ?cursor=, ordered by name
+    - Plain (parameterless) responses are served from the roster cache
+    - ETag validators allow 304 Not Modified responses
+    - Rows are read with .values() instead of going through the serializer
     """
     # Retrieve all Team objects from the database
     queryset = Team.objects.all()
@@ -24,6 +35,28 @@ class TeamView(ListAPIView):
     # Use TeamSerializer to convert Team objects to JSON
     serializer_class = TeamSerializer
 
+    # Opt-in keyset pagination
+    pagination_class = KeysetPagination
+    keyset_orderings = TEAM_ORDERINGS
+    default_keyset_ordering = 'name'
+
+    def get_version_scopes(self, request, *args, **kwargs):
+        # Any roster or payroll change can alter the team list
+        return ['teams']
+
+    def to_values(self, queryset):
+        return team_values(queryset)
+
+    def list(self, request, *args, **kwargs):
+        # Paginated or otherwise customised requests skip the cache
+        build = super().list
+        if request.query_params:
+            return build(request, *args, **kwargs)
+
+        data = cache.get_or_build(
+            ('teams', 'api'), lambda: build(request, *args, **kwargs).data)
+        return Response(data)
+
 
 def team_list_view(request):
     """
@@ -38,14 +71,35 @@ def team_list_view(request):
     Returns:
         Rendered HTML template with team list
     """
+    # Serve the rendered page from the roster cache when possible
+    return HttpResponse(cache.get_or_build(
+        ('teams', 'html'), lambda: render_team_list(request)))
+
+
+def render_team_list(request):
+    """
+    Render the team list page.
+
+    Each team card is a cached template fragment keyed by the team's
+    version, so after a roster change only the affected cards are
+    rendered again.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        Rendered page as bytes
+    """
     # Retrieve all Team objects from the database
-    teams = Team.objects.all()
+    teams = list(Team.objects.all())
 
-    # Render the team list template with teams context
-    return render(request, '../templates/team_list.html', {'teams': teams})
+    # Render the team list template with teams and fragment cache context
+    with span('render'):
+        return render(request, '../templates/team_list.html',
+                      {'teams': teams, **cache.fragment_context(teams)}).content
 
 
-class SingleTeamView(APIView):
+class SingleTeamView(ConditionalGetMixin, APIView):
     """
     API view to retrieve detailed information about a specific team.
 
@@ -53,8 +107,28 @@ class SingleTeamView(APIView):
     - Detailed team information
     - List of non-free agent players on the team
 
-    Retrieves team by unique team code.
+    Retrieves team by unique team code. Pass ?expand=team to nest the
+    team object inside every player instead of its id. The player list
+    supports keyset pagination with ?page_size= / ?cursor=, in which case
+    the response also carries a "next" link, and the ?min_salary=,
+    ?max_salary=, ?name= and ?ordering= filters. Players are read with
+    .values() instead of going through the serializer.
     """
+    # Orderings allowed for the paginated player list
+    keyset_orderings = PLAYER_ORDERINGS
+    default_keyset_ordering = 'salary'
+
+    # The roster is already scoped to one team
+    allow_team_filter = False
+
+    def get_version_scopes(self, request, team_code, *args, **kwargs):
+        # Unknown teams get a plain 404 without validators
+        try:
+            self.resolved_team = cache.resolve_team(team_code)
+        except Team.DoesNotExist:
+            return None
+        team_id, _ = self.resolved_team
+        return [f'team:{team_id}']
 
     def get(self, request, team_code, *args, **kwargs):
         """
@@ -68,27 +142,63 @@ class SingleTeamView(APIView):
             JSON response with team and player information
         """
         try:
-            # Retrieve the team by its unique code
-            team = Team.objects.get(code=team_code)
-
-            # Serialize the team data
-            serialized_team = TeamSerializer(team)
-
-            # Retrieve non-free agent players for this team
-            players = Player.objects.filter(
-                team=serialized_team.data['id'], free_agent=False)
-
-            # Serialize the players
-            serialized_players = PlayerSerializer(players, many=True)
-
-            # Return team and players data in the response
-            return Response({
-                "team": serialized_team.data,
-                "players": serialized_players.data
-            }, status=status.HTTP_202_ACCEPTED)
-        except Exception as e:
+            # Resolve the team by its unique code, from the cache if possible,
+            # unless get_version_scopes already did
+            team_id, team = (getattr(self, 'resolved_team', None)
+                             or cache.resolve_team(team_code))
+        except Team.DoesNotExist:
             return Response({"error": "Cannot find team"}, status=status.HTTP_404_NOT_FOUND)
 
+        if request.query_params:
+            # Filtered, expanded or paginated requests are built every time
+            data = self.build_payload(request, team or Team.objects.get(id=team_id))
+        else:
+            data = cache.get_or_build(
+                ('team', team_id, 'api'),
+                lambda: self.build_payload(
+                    request, team or Team.objects.get(id=team_id)))
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+    def build_payload(self, request, team):
+        """
+        Serialize a team and its (filtered, optionally paginated) roster.
+        """
+        # Serialize the team data
+        serialized_team = TeamSerializer(team)
+
+        # Retrieve non-free agent players for this team, applying any filters
+        expand = wants_expanded_team(request)
+        players = PlayerFilterBackend().filter_queryset(
+            request, Player.objects.filter(team=team, free_agent=False), self)
+        if fast_serialization_enabled():
+            # Plain rows, with the team columns joined in when nested
+            players = player_values(players, expand)
+        elif expand:
+            players = players.select_related('team')
+
+        # Keep only one page of players when pagination was requested
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(players, request, view=self)
+        players = players if page is None else page
+
+        # Serialize the players, nesting the team when requested
+        with span('serialize'):
+            if fast_serialization_enabled():
+                serialized_players = player_rows(players, expand)
+            else:
+                serializer_class = (ExpandedPlayerSerializer
+                                    if expand else PlayerSerializer)
+                serialized_players = serializer_class(players, many=True).data
+
+        # Return team and players data in the response
+        data = {
+            "team": serialized_team.data,
+            "players": serialized_players
+        }
+        if page is not None:
+            data["next"] = paginator.get_next_link()
+        return data
+
 
 def single_team_view(request, team_code):
     """
@@ -103,15 +213,35 @@ def single_team_view(request, team_code):
     Returns:
         Rendered HTML template with team and player details
     """
-    # Retrieve the team by its unique code
-    team = Team.objects.get(code=team_code)
+    # Retrieve the team by its unique code, from the cache if possible
+    team_id, team = cache.resolve_team(team_code)
 
-    # Serialize the team data (optional in this view, but kept for consistency)
-    serialized_team = TeamSerializer(team)
+    # Serve the rendered page from the roster cache when possible
+    return HttpResponse(cache.get_or_build(
+        ('team', team_id, 'html'),
+        lambda: render_team_players(request, team or Team.objects.get(id=team_id))))
 
-    # Retrieve non-free agent players for this team
-    players = Player.objects.filter(
-        team=serialized_team.data['id'], free_agent=False)
 
-    # Render the team players template with team and players context
-    return render(request, 'team_players.html', {'team': team, 'players': players})
+def render_team_players(request, team):
+    """
+    Render the roster page of a team.
+
+    The roster table is a cached template fragment keyed by the team's
+    version; the player query is lazy and only runs when the fragment
+    has to be rendered again.
+
+    Args:
+        request: HTTP request object
+        team: Team instance
+
+    Returns:
+        Rendered page as bytes
+    """
+    # Retrieve non-free agent players for this team (evaluated lazily)
+    players = Player.objects.filter(team=team, free_agent=False)
+
+    # Render the team players template with team, players and fragment
+    # cache context
+    with span('render'):
+        return render(request, 'team_players.html', {
+            'team': team, 'players': players, **cache.fragment_context([team])}).content
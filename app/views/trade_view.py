@@ -0,0 +1,41 @@
+from ..serializers import PlayerSerializer, TradeProposalSerializer
+from ..trades import execute_trade, TradeError
+from ..retry import retry_on_busy
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class TradeView(APIView):
+    """
+    API view to evaluate and execute a trade between any number of teams.
+
+    Expects a body such as
+    {"moves": [{"player": 1, "team": "LAL"}, {"player": 2, "team": "GSW"}]}
+    and optionally "dry_run": true to only evaluate it. The trade is
+    checked against the salary matching rules and applied in a single
+    transaction with a constant number of queries.
+    """
+
+    @retry_on_busy
+    def post(self, request, *args, **kwargs):
+        # Validate the shape of the proposal
+        proposal = TradeProposalSerializer(data=request.data)
+        if not proposal.is_valid():
+            return Response(proposal.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = proposal.validated_data
+
+        # Validate the trade against the database and apply it
+        moves = [(move['player'], move['team']) for move in data['moves']]
+        try:
+            players, summary = execute_trade(moves, dry_run=data['dry_run'])
+        except TradeError as error:
+            return Response({"errors": error.errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Report the moved players and every team's payroll change
+        return Response({
+            "executed": not data['dry_run'],
+            "players": PlayerSerializer(players, many=True).data,
+            "teams": list(summary.values()),
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,130 @@
+"""
+Load benchmark comparing the sync (WSGI) and async (ASGI) read endpoints.
+
+The sync endpoints are driven through Django's WSGI handler from a pool
+of threads, as a threaded WSGI server would; the async endpoints through
+the ASGI handler from one event loop with the same number of requests in
+flight. Throughput and p50/p99 latency are printed for each route.
+
+The roster cache is disabled unless --cache is given, so both sides hit
+the database on every request.
+
+Usage:
+    python -m benchmarks.bench_async --concurrency 64 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import setup_django, benchmark_database
+
+# (label, sync path, async path) for every benchmarked route
+ROUTES = [
+    ('team list', '/api/teams', '/api/async/teams'),
+    ('team roster', '/api/teams/{code}/players',
+     '/api/async/teams/{code}/players'),
+    ('free agents', '/api/free-agents', '/api/async/free-agents'),
+]
+
+
+def summarize(latencies, elapsed):
+    """
+    Return (requests per second, p50 ms, p99 ms).
+    """
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (len(latencies) / elapsed, statistics.median(latencies) * 1000,
+            p99 * 1000)
+
+
+def run_sync(path, requests, concurrency):
+    """
+    Send `requests` GETs through the WSGI handler from `concurrency` threads.
+    """
+    from django.db import connections
+    from django.test import Client
+
+    def worker(count):
+        client = Client()
+        latencies = []
+        for _ in range(count):
+            start = time.perf_counter()
+            client.get(path)
+            latencies.append(time.perf_counter() - start)
+        connections.close_all()
+        return latencies
+
+    counts = [requests // concurrency] * concurrency
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = [latency for result in executor.map(worker, counts)
+                     for latency in result]
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_async(path, requests, concurrency):
+    """
+    Send `requests` GETs through the ASGI handler, `concurrency` at a time.
+    """
+    from django.test import AsyncClient
+
+    async def worker(count):
+        client = AsyncClient()
+        latencies = []
+        for _ in range(count):
+            start = time.perf_counter()
+            await client.get(path)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    async def main():
+        results = await asyncio.gather(
+            *[worker(requests // concurrency) for _ in range(concurrency)])
+        return [latency for result in results for latency in result]
+
+    start = time.perf_counter()
+    latencies = asyncio.run(main())
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--players', type=int, default=3000)
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--cache', action='store_true',
+                        help="Keep the roster cache enabled")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+    from .league import seed_league, team_codes
+
+    # Threads need their own connections, so use a file database
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_async.sqlite3')
+    caches = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'disabled': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    }
+    with benchmark_database(db_path), override_settings(
+            CACHES=caches,
+            ROSTER_CACHE_ALIAS='default' if args.cache else 'disabled'):
+        seed_league(teams=args.teams, players=args.players)
+        code = team_codes(1)[0]
+
+        print(f"{'route':<12} {'mode':<6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for label, sync_path, async_path in ROUTES:
+            for mode, path, runner in (('sync', sync_path, run_sync),
+                                       ('async', async_path, run_async)):
+                rate, p50, p99 = runner(path.format(code=code),
+                                        args.requests, args.concurrency)
+                print(f"{label:<12} {mode:<6} {rate:>9.1f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Throughput and memory benchmark for the streaming exports.
+
+Seeds a synthetic league and, for every export format, streams the whole
+players table through the /api/export view, printing rows per second,
+output size and the peak Python memory allocated while streaming. The
+last line does the same by paging through /api/teams/<code>/players
+once per team, the way clients pulled the league before the exports.
+
+Usage:
+    python -m benchmarks.bench_export --players 1000000 --chunk-size 2000
+"""
+import argparse
+import time
+import tracemalloc
+
+from .common import setup_django, benchmark_database
+
+
+def stream(client, path):
+    """
+    Read one streamed response to the end.
+
+    Returns:
+        (seconds, bytes, peak allocated bytes)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(path)
+    size = sum(len(chunk) for chunk in response.streaming_content)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, size, peak
+
+
+def page_teams(client, codes, page_size):
+    """
+    Pull every roster through the paginated team endpoint.
+
+    Returns:
+        (seconds, bytes, peak allocated bytes)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = 0
+    for code in codes:
+        path = f'/api/teams/{code}/players?page_size={page_size}'
+        while path:
+            response = client.get(path)
+            size += len(response.content)
+            path = response.json().get('next')
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--players', type=int, default=200000)
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--page-size', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from django.test.utils import override_settings
+    from app.models import Team
+    from .league import seed_league
+
+    with benchmark_database(), override_settings(
+            EXPORT_CHUNK_SIZE=args.chunk_size, METRICS_SAMPLE_RATE=0):
+        seed_league(teams=args.teams, players=args.players,
+                    free_agent_ratio=0)
+        client = Client()
+        codes = list(Team.objects.order_by('id').values_list('code', flat=True))
+
+        print(f"{'export':<10} {'seconds':>8} {'rows/sec':>11} {'MB':>8} "
+              f"{'peak MB':>8}")
+        results = [(export_format,
+                    stream(client, f'/api/export/players.{export_format}'))
+                   for export_format in ('csv', 'ndjson', 'columnar')]
+        results.append(('paging', page_teams(client, codes, args.page_size)))
+        for label, (seconds, size, peak) in results:
+            print(f"{label:<10} {seconds:>8.2f} {args.players / seconds:>11,.0f} "
+                  f"{size / 1e6:>8.1f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
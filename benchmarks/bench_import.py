@@ -0,0 +1,90 @@
+"""
+Import throughput benchmark for the import_roster pipeline.
+
+Generates synthetic players CSV files in the csv/players.csv layout and
+imports them sequentially and with a growing number of parsing workers,
+reporting rows/sec for each run.
+
+Usage:
+    python -m benchmarks.bench_import --rows 200000 --files 4 --workers 1 2 4 8
+"""
+import argparse
+import csv
+import os
+import shutil
+import tempfile
+from itertools import islice
+
+from .common import (BASE_DIR, setup_django, benchmark_database, timer,
+                     load_team_codes)
+
+
+def write_synthetic_files(directory, rows, files, team_codes):
+    """
+    Write `rows` generated players split evenly across `files` CSV files.
+
+    Returns:
+        List of file paths
+    """
+    from app.synthetic import generate_players
+
+    paths = []
+    per_file = rows // files
+    players = generate_players(per_file * files, team_codes, free_agent_ratio=0)
+    for index in range(files):
+        path = os.path.join(directory, f'players_{index}.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['Player', 'Team', 'salary', 'unique-code'])
+            for player in islice(players, per_file):
+                writer.writerow([player['name'], player['team'],
+                                 player['salary'], player['code']])
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--range-size', type=int, default=1024 * 1024)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+    from app import importer
+    from app.models import Player
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = write_synthetic_files(
+            directory, args.rows, args.files, load_team_codes())
+        total = (args.rows // args.files) * args.files
+
+        with benchmark_database():
+            importer.bulk_import_teams(importer.read_team_rows(
+                os.path.join(BASE_DIR, 'csv', 'teams.csv')))
+
+            results = {}
+            with timer(results, 'sequential'):
+                for path in paths:
+                    importer.stream_import(path, chunk_size=args.chunk_size)
+            Player.objects.all().delete()
+
+            for workers in args.workers:
+                with timer(results, f'{workers} workers'):
+                    importer.parallel_import(
+                        paths, workers=workers, chunk_size=args.chunk_size,
+                        range_size=args.range_size)
+                Player.objects.all().delete()
+
+        print(f"{'mode':<12} {'seconds':>10} {'rows/sec':>12}")
+        for mode, seconds in results.items():
+            print(f"{mode:<12} {seconds:>10.2f} {total / seconds:>12,.0f}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
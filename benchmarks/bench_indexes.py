@@ -0,0 +1,125 @@
+"""
+Query plan and latency benchmark for the roster and free agent indexes.
+
+Seeds a synthetic league, then measures the hot queries without the
+indexes added by migration 0003 (unique Team.code and the Player
+indexes) and with them, printing the EXPLAIN QUERY PLAN and median
+latency of each. Only those indexes are dropped and recreated, through
+the schema editor, so the rest of the schema stays current and the
+queries run against the current models.
+
+Usage:
+    python -m benchmarks.bench_indexes --players 100000 --teams 300
+"""
+import argparse
+import statistics
+import time
+
+from .common import setup_django, benchmark_database
+
+def hot_queries(code):
+    """
+    Build the queries issued by the roster and free agent views.
+    """
+    from app.models import Team, Player
+
+    team = Team.objects.get(code=code)
+    return {
+        'team by code': Team.objects.filter(code=code),
+        'team roster': Player.objects.filter(team=team, free_agent=False),
+        'free agents': Player.objects.filter(free_agent=True),
+    }
+
+
+def unique_code_fields():
+    """
+    Team.code with and without the unique constraint of migration 0003.
+
+    Returns:
+        (indexed field, plain field)
+    """
+    from django.db import models
+    from app.models import Team
+
+    indexed = Team._meta.get_field('code')
+    plain = models.CharField(max_length=indexed.max_length)
+    plain.set_attributes_from_name('code')
+    plain.model = Team
+    return indexed, plain
+
+
+def drop_indexes(connection):
+    """
+    Remove the indexes added by migration 0003.
+    """
+    from app.models import Team, Player
+
+    indexed, plain = unique_code_fields()
+    with connection.schema_editor() as schema_editor:
+        for index in Player._meta.indexes:
+            schema_editor.remove_index(Player, index)
+        schema_editor.alter_field(Team, indexed, plain)
+
+
+def create_indexes(connection):
+    """
+    Recreate the indexes added by migration 0003.
+    """
+    from app.models import Team, Player
+
+    indexed, plain = unique_code_fields()
+    with connection.schema_editor() as schema_editor:
+        for index in Player._meta.indexes:
+            schema_editor.add_index(Player, index)
+        schema_editor.alter_field(Team, plain, indexed)
+
+
+def measure(queries, repeat):
+    """
+    Return {name: (plan, median milliseconds)} for each query.
+    """
+    results = {}
+    for name, queryset in queries.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            # Tuples rather than model instances, to isolate database time
+            list(queryset.values_list())
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = (queryset.explain(), statistics.median(timings))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--teams', type=int, default=300)
+    parser.add_argument('--free-agent-ratio', type=float, default=0.02)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from .league import seed_league, team_codes
+
+    with benchmark_database() as connection:
+        seed_league(args.teams, args.players, args.free_agent_ratio)
+        code = team_codes(args.teams)[args.teams // 2]
+
+        report = {}
+        for label, change_indexes in (('before', drop_indexes),
+                                      ('after', create_indexes)):
+            change_indexes(connection)
+            # Refresh planner statistics for the current set of indexes
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            report[label] = measure(hot_queries(code), args.repeat)
+
+    for name in report['after']:
+        print(f"== {name}")
+        for label in ('before', 'after'):
+            plan, latency = report[label][name]
+            print(f"  {label:<7}{latency:>9.3f} ms  {plan}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Overhead benchmark for the request instrumentation.
+
+Sends the same requests through the WSGI handler without the
+InstrumentationMiddleware, with it but sampling off
+(METRICS_SAMPLE_RATE=0) and with every request sampled, and prints the
+median latency of each route.
+
+Usage:
+    python -m benchmarks.bench_metrics --requests 500
+"""
+import argparse
+import statistics
+import time
+
+from .common import setup_django, benchmark_database
+
+# Benchmarked routes, with parameters so the roster cache is bypassed
+ROUTES = [
+    ('team list', '/api/teams?page_size=30'),
+    ('team roster', '/api/teams/{code}/players?page_size=100'),
+    ('free agents', '/api/free-agents?page_size=100'),
+]
+
+
+def median_ms(client, path, requests):
+    """
+    Median milliseconds of `requests` GETs of path.
+    """
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--players', type=int, default=3000)
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+    from django.test.utils import override_settings
+    from .league import seed_league, team_codes
+
+    without = [name for name in settings.MIDDLEWARE
+               if name != 'app.middleware.InstrumentationMiddleware']
+    profiles = [
+        ('no middleware', dict(MIDDLEWARE=without)),
+        ('sampling off', dict(METRICS_SAMPLE_RATE=0)),
+        ('all sampled', dict(METRICS_SAMPLE_RATE=1)),
+    ]
+
+    with benchmark_database():
+        seed_league(teams=args.teams, players=args.players)
+        code = team_codes(1)[0]
+
+        print(f"{'route':<12} " + ' '.join(f"{name:>14}" for name, _ in profiles)
+              + "  (median ms)")
+        for label, path in ROUTES:
+            timings = []
+            for _, overrides in profiles:
+                with override_settings(**overrides):
+                    client = Client()
+                    # Warm up
+                    median_ms(client, path.format(code=code), 20)
+                    timings.append(median_ms(client, path.format(code=code),
+                                             args.requests))
+            print(f"{label:<12} " + ' '.join(f"{ms:>14.3f}" for ms in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Throughput benchmark for the serializer and .values() serialization paths.
+
+For each player count, fetches the players and encodes them to JSON both
+ways, exactly as the list endpoints do, and prints rows per second:
+
+- serializer: model instances, PlayerSerializer and DRF's JSONRenderer
+- fast: .values() rows and FastJSONRenderer (orjson when installed)
+
+Usage:
+    python -m benchmarks.bench_serialization --sizes 100,10000,100000
+"""
+import argparse
+import statistics
+import time
+
+from .common import setup_django, benchmark_database
+
+
+def best_rate(function, rows, repeat):
+    """
+    Rows per second of the median of `repeat` runs of function().
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return rows / statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='100,10000,100000')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--expand', action='store_true',
+                        help="Nest the team inside every player")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from app.fast import player_values, player_rows
+    from app.models import Player
+    from app.renderers import FastJSONRenderer, orjson
+    from app.serializers import PlayerSerializer, ExpandedPlayerSerializer
+    from .league import seed_league
+
+    serializer_class = (ExpandedPlayerSerializer if args.expand
+                        else PlayerSerializer)
+
+    with benchmark_database():
+        seed_league(teams=30, players=max(sizes))
+        print(f"JSON encoder: {'orjson' if orjson else 'json'}")
+        print(f"{'players':>8} {'serializer rows/s':>18} {'fast rows/s':>12} "
+              f"{'speedup':>8}")
+
+        for size in sizes:
+            queryset = Player.objects.filter(id__lte=size).order_by('id')
+            if args.expand:
+                queryset = queryset.select_related('team')
+
+            def slow():
+                return JSONRenderer().render(
+                    serializer_class(queryset, many=True).data)
+
+            def fast():
+                return FastJSONRenderer().render(player_rows(
+                    player_values(queryset, args.expand), args.expand))
+
+            # Both paths must produce the same bytes
+            assert slow() == fast()
+
+            slow_rate = best_rate(slow, size, args.repeat)
+            fast_rate = best_rate(fast, size, args.repeat)
+            print(f"{size:>8} {slow_rate:>18.0f} {fast_rate:>12.0f} "
+                  f"{fast_rate / slow_rate:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
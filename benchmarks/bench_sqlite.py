@@ -0,0 +1,158 @@
+"""
+Mixed read/write load benchmark for the SQLite connection profile.
+
+Reader threads request paginated roster and free agent pages while
+writer threads cut and re-sign players through the write views, all
+against one file database, for a fixed duration. This runs twice:
+
+- default: rollback journal, synchronous=FULL, a new connection per
+  request and no retries on "database is locked"
+- tuned: the DATABASES settings (WAL and the SQLITE_PRAGMAS) and
+  retry_on_busy, with persistent connections as a WSGI-only deployment
+  would enable them
+
+For each profile it prints read and write throughput, p99 latency and
+the number of failed requests.
+
+Usage:
+    python -m benchmarks.bench_sqlite --readers 8 --writers 4 --seconds 10
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import setup_django, benchmark_database
+
+
+def p99(latencies):
+    """
+    99th percentile of a list of seconds, in milliseconds.
+    """
+    if not latencies:
+        return 0.0
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+
+
+def run_load(paths, player_ids, team_id, readers, writers, seconds):
+    """
+    Run readers and writers for `seconds` and collect their results.
+
+    Args:
+        paths: GET paths the readers cycle through
+        player_ids: Signed players, split between the writers
+        team_id: Team the writers re-sign players to
+        readers: Number of reader threads
+        writers: Number of writer threads
+
+    Returns:
+        dict with 'read' and 'write' lists of latencies and an 'errors' count
+    """
+    from django.db import connections
+    from django.test import Client
+
+    deadline = time.perf_counter() + seconds
+    errors = []
+
+    def reader(index):
+        client = Client(raise_request_exception=False)
+        latencies = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = client.get(paths[(index + len(latencies)) % len(paths)])
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        connections.close_all()
+        return 'read', latencies
+
+    def writer(index):
+        client = Client(raise_request_exception=False)
+        mine = player_ids[index::writers]
+        latencies = []
+        while time.perf_counter() < deadline:
+            player_id = mine[len(latencies) // 2 % len(mine)]
+            start = time.perf_counter()
+            if len(latencies) % 2 == 0:
+                response = client.patch(
+                    f'/api/player/{player_id}/FA', {'free_agent': True},
+                    content_type='application/json')
+            else:
+                response = client.post(f'/api/player/{player_id}',
+                                       {'team': team_id, 'salary': 2300000})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        connections.close_all()
+        return 'write', latencies
+
+    results = {'read': [], 'write': []}
+    with ThreadPoolExecutor(max_workers=readers + writers) as executor:
+        futures = ([executor.submit(reader, index) for index in range(readers)]
+                   + [executor.submit(writer, index) for index in range(writers)])
+        for future in futures:
+            kind, latencies = future.result()
+            results[kind].extend(latencies)
+    results['errors'] = len(errors)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--players', type=int, default=3000)
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection, connections
+    from django.test.utils import override_settings
+    from app.models import Team, Player
+    from .league import seed_league
+
+    tuned = dict(connection.settings_dict, CONN_MAX_AGE=60)
+    tuned['OPTIONS'] = dict(tuned['OPTIONS'])
+    default = dict(tuned, CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False, OPTIONS={
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': 'PRAGMA journal_mode=DELETE;PRAGMA synchronous=FULL',
+    })
+    profiles = [('default', default, 0),
+                ('tuned', tuned, settings.SQLITE_BUSY_RETRIES)]
+
+    # Threads need their own connections, so use a file database
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_sqlite.sqlite3')
+    caches = {'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    with benchmark_database(db_path), override_settings(CACHES=caches):
+        seed_league(teams=args.teams, players=args.players)
+        team = Team.objects.order_by('id').first()
+        player_ids = list(Player.objects.filter(free_agent=False).order_by(
+            'id').values_list('id', flat=True)[:args.writers * 50])
+        paths = [f'/api/teams/{team.code}/players?page_size=50',
+                 '/api/free-agents?page_size=50',
+                 '/api/teams?page_size=30']
+
+        print(f"{'profile':<8} {'reads/s':>8} {'read p99 ms':>12} "
+              f"{'writes/s':>9} {'write p99 ms':>13} {'errors':>7}")
+        for name, settings_dict, retries in profiles:
+            # Every thread opens its connection from this shared dict
+            connections.close_all()
+            for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'OPTIONS'):
+                connection.settings_dict[key] = settings_dict[key]
+            with override_settings(SQLITE_BUSY_RETRIES=retries):
+                results = run_load(paths, player_ids, team.id, args.readers,
+                                   args.writers, args.seconds)
+            print(f"{name:<8} {len(results['read']) / args.seconds:>8.1f} "
+                  f"{p99(results['read']):>12.2f} "
+                  f"{len(results['write']) / args.seconds:>9.1f} "
+                  f"{p99(results['write']):>13.2f} {results['errors']:>7}")
+        connections.close_all()
+
+
+if __name__ == '__main__':
+    main()
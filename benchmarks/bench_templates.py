@@ -0,0 +1,84 @@
+"""
+Render time benchmark for the cached template fragments.
+
+For each roster size, renders the team roster page and the team list
+page with fragment caching effectively off (ROSTER_FRAGMENT_TIMEOUT=0)
+and with warm fragments, printing the median render time of each. For
+the team list the warm case changes one team before every render, as a
+roster move would, so one card out of all teams is rendered again.
+
+Usage:
+    python -m benchmarks.bench_templates --sizes 10,100,1000,5000
+"""
+import argparse
+import statistics
+import time
+
+from .common import setup_django, benchmark_database
+
+
+def median_ms(function, repeat, before=None):
+    """
+    Median milliseconds of `repeat` calls of function(), calling before()
+    (untimed) ahead of each one.
+    """
+    timings = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='10,100,1000,5000')
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import RequestFactory
+    from django.test.utils import override_settings
+    from app.cache import get_cache, invalidate_teams
+    from app.models import Team
+    from app.views.team_view import render_team_list, render_team_players
+    from .league import seed_league
+
+    request = RequestFactory().get('/')
+    print(f"{'roster':>7} {'page':<11} {'uncached ms':>12} {'fragments ms':>13}")
+
+    for size in [int(size) for size in args.sizes.split(',')]:
+        with benchmark_database():
+            # Team ids repeat across databases, so start from an empty cache
+            get_cache().clear()
+            seed_league(teams=args.teams, players=size * args.teams,
+                        free_agent_ratio=0)
+            team = Team.objects.order_by('id').first()
+            other = Team.objects.order_by('id').last()
+
+            def roster():
+                render_team_players(request, team)
+
+            def change_other():
+                invalidate_teams([other.id])
+
+            with override_settings(ROSTER_FRAGMENT_TIMEOUT=0):
+                cold_roster = median_ms(roster, args.repeat)
+                cold_list = median_ms(lambda: render_team_list(request),
+                                      args.repeat)
+
+            roster()
+            warm_roster = median_ms(roster, args.repeat)
+            render_team_list(request)
+            warm_list = median_ms(lambda: render_team_list(request),
+                                  args.repeat, before=change_other)
+
+            print(f"{size:>7} {'roster':<11} {cold_roster:>12.2f} {warm_roster:>13.2f}")
+            print(f"{size:>7} {'team list':<11} {cold_list:>12.2f} {warm_list:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Latency and query count benchmark for large multi-team trades.
+
+Seeds a synthetic league, then executes trades of growing size that rotate
+players around a ring of teams, printing the median latency and the number
+of queries of each. The query count should not grow with the trade size.
+
+Usage:
+    python -m benchmarks.bench_trades --teams 30 --sizes 2,10,100,500
+"""
+import argparse
+import statistics
+import time
+
+from .common import setup_django, benchmark_database
+
+
+def ring_proposal(rosters, size, teams):
+    """
+    Build a trade moving `size` players around a ring of `teams` teams.
+
+    Each team sends players to the next team in the ring, so every team
+    involved both sends and receives. Moved players are removed from
+    `rosters`, so every trade of a run moves players still on their
+    original team.
+
+    Args:
+        rosters: List of (team code, [player ids]) pairs
+        size: Number of players moved
+        teams: Number of teams involved
+
+    Returns:
+        List of (player_id, team_code) pairs
+    """
+    ring = rosters[:teams]
+    per_team = size // teams
+    moves = []
+    for i, (_, player_ids) in enumerate(ring):
+        destination = ring[(i + 1) % teams][0]
+        moves += [(player_id, destination)
+                  for player_id in player_ids[:per_team]]
+        del player_ids[:per_team]
+    return moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--players', type=int, default=30000)
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--sizes', default='2,10,100,500')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext, override_settings
+    from app.models import Player
+    from app.trades import execute_trade
+    from .league import seed_league
+
+    with benchmark_database(), override_settings(TRADE_SALARY_CAP=10 ** 12):
+        # Salary matching is disabled by the huge cap: random salaries
+        # rarely match, and the rules cost no queries anyway
+        seed_league(teams=args.teams, players=args.players,
+                    free_agent_ratio=0)
+        rosters = {}
+        for player_id, code in Player.objects.order_by('id').values_list(
+                'id', 'team__code'):
+            rosters.setdefault(code, []).append(player_id)
+        rosters = sorted(rosters.items())
+
+        print(f"{'players':>8} {'teams':>6} {'queries':>8} {'median ms':>10}")
+        for size in [int(size) for size in args.sizes.split(',')]:
+            teams = min(args.teams, size)
+            timings = []
+            queries = 0
+            for _ in range(args.repeat):
+                moves = ring_proposal(rosters, size, teams)
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    execute_trade(moves)
+                    timings.append((time.perf_counter() - start) * 1000)
+                queries = len(captured)
+            print(f"{len(moves):>8} {teams:>6} {queries:>8} "
+                  f"{statistics.median(timings):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks never touch db.sqlite3: they create a throwaway database the
+same way the Django test runner does and destroy it when they finish.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Repository root, so the scripts can be run as `python -m benchmarks.<name>`
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    """
+    Configure Django for a standalone benchmark script.
+    """
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tradeMachine.settings')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(db_path=None):
+    """
+    Create a migrated throwaway database for the duration of a benchmark.
+
+    By default this is the test database of settings.DATABASES, the
+    test_db.sqlite3 file in the repository root; it is deleted afterwards.
+    The connection settings are restored when the block exits.
+
+    Args:
+        db_path: Optional SQLite file to use instead of the test database
+    """
+    from django.db import connection
+
+    saved = {key: connection.settings_dict.get(key) for key in ('NAME', 'TEST')}
+    if db_path:
+        connection.settings_dict['TEST'] = dict(
+            connection.settings_dict.get('TEST') or {}, NAME=db_path)
+    try:
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        try:
+            yield connection
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    finally:
+        connection.settings_dict.update(saved)
+
+
+@contextmanager
+def timer(results, key):
+    """
+    Store the wall-clock seconds spent inside the block in results[key].
+    """
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def load_team_codes():
+    """
+    Read the team codes shipped in csv/teams.csv.
+
+    Returns:
+        List of three letter team codes
+    """
+    import csv
+    with open(os.path.join(BASE_DIR, 'csv', 'teams.csv'), newline='',
+              encoding='utf-8') as csvfile:
+        return [row['Code'] for row in csv.DictReader(csvfile)]
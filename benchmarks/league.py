@@ -0,0 +1,45 @@
+"""
+Synthetic league seeding for benchmarks that need far more rows than
+csv/players.csv provides.
+"""
+import string
+from itertools import product
+
+
+def team_codes(count):
+    """
+    Generate `count` distinct three letter team codes.
+    """
+    codes = (''.join(letters)
+             for letters in product(string.ascii_uppercase, repeat=3))
+    return [next(codes) for _ in range(count)]
+
+
+def seed_league(teams=30, players=100000, free_agent_ratio=0.1, seed=0,
+                batch_size=5000):
+    """
+    Bulk insert a deterministic synthetic league with app.synthetic.
+
+    Teams are named after their team_codes() code so benchmarks can look
+    them up without a query; players get unique names, realistic
+    salaries and matching team payrolls.
+
+    Args:
+        teams: Number of teams to create
+        players: Number of players to create
+        free_agent_ratio: Fraction of players that are free agents
+        seed: Random seed so repeated runs produce the same league
+        batch_size: Rows per bulk_create statement
+
+    Returns:
+        List of created Team instances
+    """
+    from app import synthetic
+    from app.models import Team
+
+    synthetic.write_database(
+        players,
+        teams=[{'name': f"Team {code}", 'code': code}
+               for code in team_codes(teams)],
+        seed=seed, free_agent_ratio=free_agent_ratio, batch_size=batch_size)
+    return list(Team.objects.order_by('id'))
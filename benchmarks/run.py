@@ -0,0 +1,529 @@
+"""
+Benchmark and load-test suite covering every route in app/urls.py.
+
+Drives each API and HTML route, write paths included (cut, sign, create,
+bulk, trades), from a pool of threads and reports, per route and
+concurrency level, the throughput, p50/p95/p99 latency, error count and
+SQL queries per request. Results are written as JSON, and can be
+compared with a stored baseline to flag regressions.
+
+By default a synthetic league (--teams, --players; from the 462 players
+of csv/ up to 1M) is generated in a throwaway database and requests go
+through Django's WSGI handler in this process. With --url the suite
+targets a running server instead (its league is used as is).
+
+Queries per request come from the Server-Timing header of the
+instrumentation middleware, so they are only reported for sampled
+requests: in-process every request is sampled; start a server with
+METRICS_SAMPLE_RATE = 1 to get them with --url.
+
+Usage:
+    python -m benchmarks.run --players 100000 --concurrency 1,8 \\
+        --output results.json
+    python -m benchmarks.run --baseline results.json --threshold 0.15
+    python -m benchmarks.run --url http://127.0.0.1:8000 --routes api/teams
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import BASE_DIR, setup_django, benchmark_database
+
+# Every route of app/urls.py, by URL pattern: (method, request builder).
+# A builder takes the League and the request number and returns
+# (path, body, body is JSON). Every pattern must be listed here.
+ROUTES = {
+    '': ('GET', lambda league, n: ('/', None, False)),
+    'api/teams': ('GET', lambda league, n: ('/api/teams', None, False)),
+    'teams': ('GET', lambda league, n: ('/teams', None, False)),
+    'teams/<str:team_code>/players': ('GET', lambda league, n: (
+        f'/teams/{league.code(n)}/players', None, False)),
+    'api/teams/<str:team_code>/players': ('GET', lambda league, n: (
+        f'/api/teams/{league.code(n)}/players', None, False)),
+    'api/player/<int:player_id>/FA': ('PATCH', lambda league, n: (
+        f'/api/player/{league.signed(n)}/FA', {'free_agent': True}, True)),
+    'free-agents': ('GET', lambda league, n: ('/free-agents', None, False)),
+    'api/free-agents': ('GET', lambda league, n: (
+        '/api/free-agents', None, False)),
+    'player/<int:player_id>': ('GET', lambda league, n: (
+        f'/player/{league.free_agent(n)}', None, False)),
+    'api/player/<int:player_id>': ('POST', lambda league, n: (
+        f'/api/player/{league.free_agent(n)}',
+        {'team': league.team_id(n), 'salary': 2300000}, False)),
+    'player/create': ('GET', lambda league, n: ('/player/create', None, False)),
+    'api/player/create': ('POST', lambda league, n: (
+        '/api/player/create', {'name': league.new_name(n),
+                               'team': league.team_id(n),
+                               'salary': 2300000}, False)),
+    'api/players/bulk': ('POST', lambda league, n: (
+        '/api/players/bulk', {'operations': [
+            {'op': 'cut', 'player': league.signed(n * 10 + i)}
+            for i in range(10)]}, True)),
+    'api/players/code/<str:player_code>': ('GET', lambda league, n: (
+        f'/api/players/code/{league.player_code(n)}', None, False)),
+    'api/payroll/reconcile': ('GET', lambda league, n: (
+        '/api/payroll/reconcile', None, False)),
+    'api/changes': ('GET', lambda league, n: (
+        '/api/changes?page_size=500', None, False)),
+    'api/events': ('STREAM', lambda league, n: ('/api/events', None, False)),
+    'api/export/<str:table>.<str:export_format>': ('GET', lambda league, n: (
+        '/api/export/players.ndjson', None, False)),
+    'metrics': ('GET', lambda league, n: ('/metrics', None, False)),
+    'api/cache/stats': ('GET', lambda league, n: (
+        '/api/cache/stats', None, False)),
+    'api/async/teams': ('GET', lambda league, n: (
+        '/api/async/teams', None, False)),
+    'api/async/teams/<str:team_code>/players': ('GET', lambda league, n: (
+        f'/api/async/teams/{league.code(n)}/players', None, False)),
+    'api/async/free-agents': ('GET', lambda league, n: (
+        '/api/async/free-agents', None, False)),
+    # Evaluated only, so the two rosters it swaps between stay intact
+    'api/trades': ('POST', lambda league, n: (
+        '/api/trades', {'dry_run': True, 'moves': league.trade(n)}, True)),
+    'api/simulations/two-for-one': ('GET', lambda league, n: (
+        f'/api/simulations/two-for-one?team={league.code(n)}&limit=20',
+        None, False)),
+}
+
+# Metrics compared against the baseline: (key, higher is better)
+COMPARED = (('throughput', True), ('p50_ms', False), ('p95_ms', False),
+            ('queries', False), ('errors', False))
+
+
+class League:
+    """
+    Ids the request builders pick from, cycling through each list.
+
+    Cuts and signings are repeated on the same players: cutting a free
+    agent or signing a signed player is still a full write transaction.
+    Trades swap salary-matched pairs of players between two other teams
+    (home and away), whose rosters no other route changes.
+    """
+
+    def __init__(self, teams, signed, free_agents, trade_pairs, codes):
+        self.teams = teams
+        self.signed_ids = signed
+        self.free_agent_ids = free_agents or signed
+        self.player_codes = codes
+        self.home, self.away = teams[1], teams[2]
+        self.trade_pairs = trade_pairs
+        self.prefix = uuid.uuid4().hex[:8]
+        self.counter = itertools.count()
+
+    @staticmethod
+    def pick(ids, n):
+        return ids[n % len(ids)]
+
+    def trade(self, n):
+        home_id, away_id = self.pick(self.trade_pairs, n)
+        return [{'player': home_id, 'team': self.away['code']},
+                {'player': away_id, 'team': self.home['code']}]
+
+    def code(self, n):
+        return self.teams[n % len(self.teams)]['code']
+
+    def team_id(self, n):
+        return self.teams[n % len(self.teams)]['id']
+
+    def signed(self, n):
+        return self.signed_ids[n % len(self.signed_ids)]
+
+    def free_agent(self, n):
+        return self.free_agent_ids[n % len(self.free_agent_ids)]
+
+    def player_code(self, n):
+        return self.player_codes[n % len(self.player_codes)]
+
+    def new_name(self, n):
+        # Unique across threads and runs
+        return f"Bench {self.prefix} {next(self.counter)}"
+
+
+def queries_from(server_timing):
+    """
+    Read the query count from a Server-Timing header, or None.
+    """
+    match = re.search(r'desc="(\d+) queries"', server_timing or '')
+    return int(match.group(1)) if match else None
+
+
+class InProcessTarget:
+    """
+    Sends requests through Django's handlers in this process, one test
+    client per thread.
+    """
+    name = 'in-process'
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def client(self):
+        from django.test import Client
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client(raise_request_exception=False)
+        return self.local.client
+
+    def send(self, method, path, body, is_json):
+        """
+        Send one request.
+
+        Returns:
+            (status code, number of queries or None)
+        """
+        if method == 'STREAM':
+            return asyncio.run(self.first_event(path))
+        client = self.client()
+        if is_json:
+            response = getattr(client, method.lower())(
+                path, json.dumps(body), content_type='application/json')
+        elif method == 'POST':
+            response = client.post(path, body)
+        else:
+            response = client.get(path)
+        if response.streaming:
+            # Read streamed bodies (the simulator) to the end
+            b''.join(response.streaming_content)
+        return response.status_code, queries_from(response.get('Server-Timing'))
+
+    async def first_event(self, path):
+        """
+        Open an event stream and read its first chunk.
+        """
+        from django.test import AsyncClient
+        response = await AsyncClient().get(path)
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        await stream.aclose()
+        return response.status_code, queries_from(response.get('Server-Timing'))
+
+    def get_json(self, path):
+        return json.loads(self.client().get(path).content)
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """
+    Report form redirects as responses instead of following them.
+    """
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HTTPTarget:
+    """
+    Sends requests to a running server over HTTP.
+    """
+
+    def __init__(self, url):
+        self.name = url
+        self.url = url.rstrip('/')
+        self.opener = urllib.request.build_opener(NoRedirect)
+
+    def send(self, method, path, body, is_json):
+        data, headers = None, {}
+        if is_json:
+            data, headers = json.dumps(body).encode(), {
+                'Content-Type': 'application/json'}
+        elif body is not None:
+            data = urllib.parse.urlencode(body).encode()
+        request = urllib.request.Request(
+            self.url + path, data=data, headers=headers,
+            method='GET' if method == 'STREAM' else method)
+        try:
+            with self.opener.open(request, timeout=60) as response:
+                # Only the first line of an event stream, all of the rest
+                if method == 'STREAM':
+                    response.readline()
+                else:
+                    response.read()
+                return response.status, queries_from(
+                    response.headers.get('Server-Timing'))
+        except urllib.error.HTTPError as error:
+            return error.code, queries_from(error.headers.get('Server-Timing'))
+
+    def get_json(self, path):
+        with self.opener.open(self.url + path, timeout=60) as response:
+            return json.loads(response.read())
+
+
+def load_league(target):
+    """
+    Collect team codes and player ids through the API of the target,
+    which needs at least three teams with players.
+    """
+    teams = target.get_json('/api/teams')
+
+    def roster(team):
+        return target.get_json(
+            f"/api/teams/{team['code']}/players?page_size=500")['players']
+
+    def ids(players):
+        return [player['id'] for player in players]
+
+    signed = roster(teams[0])
+    free_agents = target.get_json('/api/free-agents?page_size=500')['results']
+    codes = [player['code'] for player in signed + free_agents
+             if player['code']]
+    pairs = salary_matched_pairs(roster(teams[1]), roster(teams[2]))
+    if not pairs:
+        sys.exit("No salary-matched trade pairs between the second and "
+                 "third teams")
+    return League(teams, ids(signed), ids(free_agents), pairs, codes)
+
+
+def salary_matched_pairs(home, away):
+    """
+    Pair home and away players whose one-for-one swap passes salary
+    matching on both sides, so dry-run trades measure accepted trades
+    rather than the rejection path.
+
+    Both teams are assumed to be over the cap, where the ratio rule
+    applies whatever the payrolls, so the pairs stay valid while other
+    routes change payrolls.
+
+    Returns:
+        List of (home player id, away player id)
+    """
+    from app.trades import salary_rules, check_salary_matching
+
+    rules = salary_rules()
+    over_cap = float('inf')
+    salaries = sorted((player['salary'], player['id']) for player in away)
+    pairs = []
+    for player in home:
+        # Only the away salaries closest to this one can match
+        index = bisect.bisect_left(salaries, (player['salary'],))
+        for salary, away_id in salaries[max(0, index - 1):index + 1]:
+            if (check_salary_matching(over_cap, player['salary'], salary, rules)
+                    and check_salary_matching(
+                        over_cap, salary, player['salary'], rules)):
+                pairs.append((player['id'], away_id))
+                break
+    return pairs
+
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run_route(target, league, method, build, requests, concurrency):
+    """
+    Send `requests` requests of one route from `concurrency` threads.
+
+    Returns:
+        dict of the measured results
+    """
+    numbers = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker():
+        latencies, queries, errors = [], [], 0
+        while True:
+            with lock:
+                n = next(numbers, None)
+            if n is None:
+                break
+            path, body, is_json = build(league, n)
+            start = time.perf_counter()
+            status, count = target.send(method, path, body, is_json)
+            latencies.append(time.perf_counter() - start)
+            errors += status >= 400
+            if count is not None:
+                queries.append(count)
+        return latencies, queries, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            lambda _: worker(), range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    queries = [count for result in results for count in result[1]]
+    return {
+        'method': 'GET' if method == 'STREAM' else method,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': sum(result[2] for result in results),
+        'throughput': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'queries': statistics.median(queries) if queries else None,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline run.
+
+    Timing metrics regress when they are worse by more than `threshold`
+    (a fraction); the query and error counts regress on any increase,
+    since they are deterministic and a route failing fast would otherwise
+    look faster.
+
+    Returns:
+        List of (result key, metric, baseline value, new value)
+    """
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric, higher_is_better in COMPARED:
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if metric in ('queries', 'errors'):
+                worse = after > before
+            elif higher_is_better:
+                worse = after < before * (1 - threshold)
+            else:
+                worse = after > before * (1 + threshold)
+            if worse:
+                regressions.append((key, metric, before, after))
+    return regressions
+
+
+def git_revision():
+    """
+    Short hash of the checked out commit, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(target, league, patterns, args):
+    """
+    Run every selected route at every concurrency level.
+
+    Returns:
+        dict of result key ("<METHOD> /<pattern> @<concurrency>") to results
+    """
+    results = {}
+    print(f"{'route':<52} {'conc':>4} {'req/s':>9} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'queries':>7} {'errors':>6}")
+    for pattern in patterns:
+        method, build = ROUTES[pattern]
+        if args.warmup:
+            run_route(target, league, method, build, args.warmup, 1)
+        for concurrency in args.concurrency:
+            # Streams hold a connection each; keep them short
+            requests = args.requests if method != 'STREAM' else min(
+                args.requests, 50)
+            result = run_route(target, league, method, build, requests,
+                               concurrency)
+            key = f"{result['method']} /{pattern} @{concurrency}"
+            results[key] = result
+            queries = '-' if result['queries'] is None else result['queries']
+            print(f"{result['method'] + ' /' + pattern:<52} {concurrency:>4} "
+                  f"{result['throughput']:>9.1f} {result['p50_ms']:>8.2f} "
+                  f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                  f"{queries:>7} {result['errors']:>6}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--players', type=int, default=462,
+                        help="Players in the generated league (up to 1M)")
+    parser.add_argument('--requests', type=int, default=200,
+                        help="Requests per route and concurrency level")
+    parser.add_argument('--concurrency', default='1,8',
+                        help="Comma separated numbers of client threads")
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--routes', default='',
+                        help="Comma separated URL patterns to run (default: all)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Disable the roster cache (in-process only)")
+    parser.add_argument('--url', help="Benchmark a running server instead")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Compare with this results file")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Allowed slowdown before a regression, as a fraction")
+    args = parser.parse_args()
+    args.concurrency = [int(value) for value in args.concurrency.split(',')]
+
+    setup_django()
+    import logging
+    from django.test.utils import override_settings
+
+    # Failed requests are counted; do not log each one
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    from app.urls import urlpatterns
+    from .league import seed_league
+
+    # Fail early when a route was added without a benchmark
+    patterns = list(dict.fromkeys(str(pattern.pattern) for pattern in urlpatterns))
+    missing = [pattern for pattern in patterns if pattern not in ROUTES]
+    if missing:
+        sys.exit(f"No benchmark for route(s): {', '.join(missing)}")
+    if args.routes:
+        patterns = [pattern for pattern in patterns
+                    if pattern in args.routes.split(',')]
+
+    meta = {
+        'target': args.url or 'in-process',
+        'teams': args.teams, 'players': args.players,
+        'requests': args.requests, 'concurrency': args.concurrency,
+        'cache': not args.no_cache, 'revision': git_revision(),
+        'python': platform.python_version(), 'time': time.time(),
+    }
+
+    if args.url:
+        target = HTTPTarget(args.url)
+        results = run_suite(target, load_league(target), patterns, args)
+    else:
+        # Threads need their own connections, so use a file database
+        db_path = os.path.join(tempfile.mkdtemp(), 'bench_run.sqlite3')
+        caches = {'default': {'BACKEND': (
+            'django.core.cache.backends.dummy.DummyCache' if args.no_cache
+            else 'django.core.cache.backends.locmem.LocMemCache')}}
+        with benchmark_database(db_path), override_settings(
+                CACHES=caches, METRICS_SAMPLE_RATE=1):
+            seed_league(teams=args.teams, players=args.players)
+            target = InProcessTarget()
+            results = run_suite(target, load_league(target), patterns, args)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'meta': meta, 'results': results}, output, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for key, metric, before, after in regressions:
+            print(f"REGRESSION {key}: {metric} {before} -> {after}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import os
+import sys
 import django
 import csv  # noqa - suppress import unused warning
 
@@ -9,6 +10,22 @@ django.setup()
 
 # Import Django models for database operations
 from app.models import Player, Team  # noqa - suppress import unused warning
+from app import importer
+
+# Bulk mode: `python populate.py --bulk` diffs the CSVs against the database
+# and writes them with batched bulk_create/bulk_update in one transaction
+if '--bulk' in sys.argv:
+    from django.db import transaction
+
+    with transaction.atomic():
+        team_stats = importer.bulk_import_teams(
+            importer.read_team_rows('csv/teams.csv'))
+        player_stats = importer.bulk_import_players(
+            importer.read_player_rows('csv/players.csv'))
+
+    print(importer.format_stats("Teams", team_stats))
+    print(importer.format_stats("Players", player_stats))
+    sys.exit(0)
 
 # Specify the path to the CSV file containing team information
 csv_file_path = 'csv/teams.csv'
@@ -59,6 +76,8 @@ with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
         player_name = row['Player'].strip()
         team_name = row['Team'].strip()  # Team code for the player
         salary = int(row['salary'].strip())  # Convert salary to integer
+        # Stable external identifier of the player, e.g. 'curryst01'
+        player_code = row['unique-code'].strip()
 
         # Attempt to retrieve the corresponding team from the database
         try:
@@ -70,11 +89,17 @@ with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
                 f"Team '{team_name}' not found in the database. Skipping player '{player_name}'.")
             continue
 
+        # Players imported before codes were stored are matched on their
+        # name once and take the code of their row
+        Player.objects.filter(name=player_name, code__isnull=True).update(
+            code=player_code)
+
         # Use Django's update_or_create to handle both new and existing players
         # This method will create a new player or update an existing one if found
         player, created = Player.objects.update_or_create(
-            name=player_name,  # Use player name as the unique identifier
+            code=player_code,  # Use the unique code as the identifier
             defaults={
+                'name': player_name,  # Player's full name
                 'team': team,  # Associate player with their team
                 'salary': salary,  # Player's individual salary
             }
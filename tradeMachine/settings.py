@@ -44,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so it times everything below it
+    'app.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,13 +82,140 @@ WSGI_APPLICATION = 'tradeMachine.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# PRAGMAs run on every new SQLite connection:
+# - journal_mode=WAL lets readers keep reading while a write commits,
+#   instead of failing with "database is locked" (persisted in the file)
+# - synchronous=NORMAL only syncs at checkpoints, which is safe in WAL
+#   mode: a power loss can lose the last commits but not corrupt the file
+# - cache_size (negative means KiB) and mmap_size keep hot pages in memory
+# - temp_store=MEMORY keeps sort and index temporaries off disk
+# Run `python -m benchmarks.bench_sqlite` to compare against the defaults.
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # No persistent connections: the async views and the event stream
+        # run under ASGI, where every request may use a different thread
+        # and each thread would keep its own connection open. A WSGI-only
+        # deployment can raise this to reuse connections across requests;
+        # health checks then replace a broken connection transparently.
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # SQLite ignores select_for_update, so write transactions take the
+            # database write lock up front instead of failing on upgrade
+            'transaction_mode': 'IMMEDIATE',
+            # Seconds a writer waits for the write lock before SQLITE_BUSY
+            'timeout': 5,
+            'init_command': ';'.join(
+                f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+        },
+        'TEST': {
+            # File-backed test database so concurrent tests can use threads
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Roster and team payloads are cached in-process by default, which is
+# only correct with a single server process. Running several processes
+# requires pointing ROSTER_CACHE_ALIAS at a shared backend (Redis,
+# Memcached): the version stamps behind the ETags never expire, so a
+# process that never sees a write would keep answering 304 Not Modified
+# with stale data, and invalidations would not reach its payloads.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'trade-machine',
     }
 }
 
+ROSTER_CACHE_ALIAS = 'default'
+ROSTER_CACHE_TIMEOUT = 300
+
+# HTML fragments (team cards, roster tables) are keyed by per-team
+# versions, so they can live much longer than whole pages
+ROSTER_FRAGMENT_TIMEOUT = 3600
+
+
+# Django REST framework
+# FastJSONRenderer encodes with orjson when it is installed. List
+# endpoints read rows with .values() instead of ModelSerializers unless
+# FAST_SERIALIZATION is turned off; the output is the same either way.
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+FAST_SERIALIZATION = True
+
+
+# Trades
+# A team may take on salary freely while it stays under the cap. A team
+# over the cap after a trade may only take back TRADE_SALARY_MATCH_RATIO
+# times its outgoing salary plus TRADE_SALARY_MATCH_BUFFER.
+
+TRADE_SALARY_CAP = 136021000
+TRADE_SALARY_MATCH_RATIO = 1.25
+TRADE_SALARY_MATCH_BUFFER = 100000
+
+# Worker processes used by /api/simulations/two-for-one. 0 evaluates the
+# scenarios in the request thread.
+
+SIMULATOR_WORKERS = 0
+
+
+# Event stream (/api/events)
+# Roster and payroll changes are fanned out in-process to every connected
+# client. The last EVENT_STREAM_BUFFER events can be replayed after a
+# reconnect; a client more than EVENT_STREAM_QUEUE_SIZE events behind is
+# disconnected and replays on reconnect. A comment line is sent every
+# EVENT_STREAM_HEARTBEAT seconds so proxies keep idle streams open.
+
+EVENT_STREAM_BUFFER = 1000
+EVENT_STREAM_QUEUE_SIZE = 100
+EVENT_STREAM_HEARTBEAT = 15
+EVENT_STREAM_RETRY_MS = 3000
+
+
+# Write views retry a transaction that still fails with "database is
+# locked" after the busy timeout, up to SQLITE_BUSY_RETRIES more times
+# with exponential backoff starting at SQLITE_BUSY_BACKOFF seconds.
+
+SQLITE_BUSY_RETRIES = 3
+SQLITE_BUSY_BACKOFF = 0.05
+
+
+# Request instrumentation
+# Fraction of requests that get a Server-Timing header and are recorded
+# in the per-view histograms served at /metrics. 0 turns it off; the
+# remaining cost is one random() call per request and one context
+# variable lookup per query.
+
+METRICS_SAMPLE_RATE = 0.1
+
+
+# Exports (/api/export/..., export_league)
+# Rows read per database round trip and encoded per streamed chunk.
+
+EXPORT_CHUNK_SIZE = 2000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators